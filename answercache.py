@@ -0,0 +1,70 @@
+# =============================
+# FILE: answercache.py
+# =============================
+# Persistent LRU cache of raw AI answers, keyed by
+# (question_type, short_question, ollama_model).
+#
+# Lookups hit an in-memory OrderedDict. The file is one JSON array per
+# line, [qtype, short, model, raw_output]; new answers are appended as
+# they arrive and close() rewrites the file oldest-first, so the LRU
+# order survives restarts and the file never holds more than
+# max_entries lines after a clean exit. On load a later line wins.
+
+import json
+import os
+from collections import OrderedDict
+
+
+class AnswerCache:
+    def __init__(self, path, max_entries=20000):
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+        self.entries = OrderedDict()   # (qtype, short, model) -> raw output
+        self.hits = 0
+        self.misses = 0
+        self.load()
+        self.f = open(path, "a", encoding="utf-8")
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        qtype, short, model, raw = json.loads(line)
+                    except ValueError:
+                        continue       # torn last line after a crash
+                    key = (qtype, short, model)
+                    self.entries.pop(key, None)
+                    self.entries[key] = raw
+        except FileNotFoundError:
+            return
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get(self, qtype, short, model):
+        key = (qtype, short, model)
+        raw = self.entries.get(key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return raw
+
+    def put(self, qtype, short, model, raw):
+        key = (qtype, short, model)
+        self.entries.pop(key, None)
+        self.entries[key] = raw
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self.f.write(json.dumps([qtype, short, model, raw], ensure_ascii=False) + "\n")
+        self.f.flush()
+
+    def close(self):
+        """Rewrite the file in LRU order (least recently used first)."""
+        self.f.close()
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for (qtype, short, model), raw in self.entries.items():
+                f.write(json.dumps([qtype, short, model, raw], ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
@@ -0,0 +1,300 @@
+# =============================
+# FILE: benchmarks/bench.py
+# =============================
+# Microbenchmarks for the server's hot path.
+#
+#   python benchmarks/bench.py                     # run everything
+#   python benchmarks/bench.py --filter ranking    # names containing "ranking"
+#   python benchmarks/bench.py --save benchmarks/baseline.json
+#   python benchmarks/bench.py --compare benchmarks/baseline.json
+#
+# Each benchmark reports the best-of-N time per call in nanoseconds.
+# --compare exits with status 1 when any benchmark is slower than the
+# baseline by more than --threshold (default 25%). Baselines only mean
+# something on the machine that recorded them.
+
+import argparse
+import json
+import platform
+import random
+import socket
+import sys
+import threading
+import time
+import timeit
+from itertools import cycle
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+import questions
+import solvers
+from leaderboard import Leaderboard
+from protocol import get_wire
+from server import Player, TriviaServer, encode_frame, send_json
+
+BENCHMARKS = {}        # name -> setup() returning the function to time
+
+
+def bench(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def server_cfg():
+    with open(ROOT / "server_config.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# =============================
+# Solvers
+# =============================
+@bench("solvers.eval_math")
+def _():
+    exprs = [questions.generate_mathematics_question() for _ in range(256)]
+    it = cycle(exprs)
+    return lambda: solvers.eval_math(next(it))
+
+
+@bench("solvers.eval_math.uncached")
+def _():
+    exprs = [questions.generate_mathematics_question() for _ in range(256)]
+    it = cycle(exprs)
+
+    def run():
+        solvers.compile_math.cache_clear()
+        solvers.eval_math(next(it))
+    return run
+
+
+@bench("solvers.roman_to_int")
+def _():
+    numerals = [solvers.ROMAN[n] for n in random.Random(2).sample(range(1, 4000), 256)]
+    it = cycle(numerals)
+    return lambda: solvers.roman_to_int(next(it))
+
+
+@bench("solvers.network_and_broadcast")
+def _():
+    shorts = [questions.generate_network_broadcast_question() for _ in range(256)]
+    args = [(s.split("/")[0], int(s.split("/")[1])) for s in shorts]
+    it = cycle(args)
+
+    def run():
+        ip, p = next(it)
+        solvers.network_and_broadcast(ip, p)
+    return run
+
+
+# =============================
+# Question generators
+# =============================
+for _name, _fn in [
+    ("mathematics", questions.generate_mathematics_question),
+    ("roman_numerals", questions.generate_roman_numerals_question),
+    ("usable_ip", questions.generate_usable_ip_question),
+    ("network_broadcast", questions.generate_network_broadcast_question),
+]:
+    bench(f"questions.generate_{_name}")(lambda fn=_fn: fn)
+
+for _qtype in [solvers.MATHEMATICS, solvers.ROMAN_NUMERALS,
+               solvers.USABLE_IP, solvers.NETWORK_BROADCAST]:
+    def _pool(qtype=_qtype):
+        pool = questions.QuestionPool(batch_size=2048, seed=3)
+        return lambda: pool.next(qtype)
+    bench(f"questions.pool_next[{_qtype}]")(_pool)
+
+
+# =============================
+# Ranking
+# =============================
+def ranked_server(n_players):
+    server = TriviaServer(server_cfg())
+    rng = random.Random(4)
+    for i in range(n_players):
+        p = Player(None, None)
+        p.username = f"player{i:06d}"
+        p.points = rng.randint(0, 20)
+        server.add_player(p)
+    return server
+
+
+for _n in (10, 1000, 100000):
+    bench(f"ranking.final_ranking[{_n}]")(
+        lambda n=_n: ranked_server(n).final_ranking)
+
+
+def ranked_board(n_players):
+    board = Leaderboard()
+    rng = random.Random(5)
+    for i in range(n_players):
+        board.add(i, f"player{i:06d}", rng.randint(0, 20))
+    return board, rng
+
+
+@bench("leaderboard.add_points[100000]")
+def _():
+    board, rng = ranked_board(100000)
+    keys = cycle([rng.randrange(100000) for _ in range(4096)])
+
+    def run():
+        key = next(keys)
+        board.add_points(key, 1)
+        board.add_points(key, -1)
+    return run
+
+
+@bench("leaderboard.round_then_top10[100000]")
+def _():
+    # One question's worth of score changes, then the LEADERBOARD read
+    board, rng = ranked_board(100000)
+    keys = [rng.randrange(100000) for _ in range(1000)]
+
+    def run():
+        for key in keys:
+            board.add_points(key, 1)
+        board.top(10)
+    return run
+
+
+@bench("leaderboard.full_sort[100000]")
+def _():
+    # What every update would cost without the incremental board
+    board, _ = ranked_board(100000)
+    entries = list(board.entries.values())
+    return lambda: sorted(entries, key=lambda e: (-e[2], e[0]))
+
+
+# =============================
+# Encoding and sending
+# =============================
+QUESTION_MSG = {
+    "message_type": "QUESTION",
+    "question_type": solvers.MATHEMATICS,
+    "trivia_question": "Question 1 (Mathematics):\n12 + 7 * 3 - 40 / 5",
+    "short_question": "12 + 7 * 3 - 40 / 5",
+    "time_limit": 8,
+}
+RESULT_MSG = {
+    "message_type": "RESULT",
+    "correct": False,
+    "feedback": "❌ Incorrect. You answered (20), but the correct answer is 25.",
+}
+
+
+@bench("encode.json_dumps[QUESTION]")
+def _():
+    return lambda: json.dumps(QUESTION_MSG)
+
+
+@bench("encode.encode_frame[QUESTION]")
+def _():
+    return lambda: encode_frame(QUESTION_MSG)
+
+
+@bench("encode.binary_frame[QUESTION]")
+def _():
+    wire = get_wire("binary", "json")
+    return lambda: wire.encode(QUESTION_MSG)
+
+
+@bench("encode.result_frame[json]")
+def _():
+    wire = get_wire("json")
+    return lambda: wire.result_frame(False, RESULT_MSG["feedback"])
+
+
+@bench("send.send_json[RESULT]")
+def _():
+    a, b = socket.socketpair()
+
+    def drain():
+        try:
+            while b.recv(1 << 16):
+                pass
+        except OSError:
+            pass
+    threading.Thread(target=drain, daemon=True).start()
+    return lambda: send_json(a, RESULT_MSG)
+
+
+# =============================
+# Runner
+# =============================
+def measure(fn, budget):
+    """Best time per call (ns) over 5 repeats of about budget/5 seconds."""
+    timer = timeit.Timer(fn)
+    number, elapsed = timer.autorange()
+    per_repeat = max(1, int(number * (budget / 5) / max(elapsed, 1e-9)))
+    best = min(timer.repeat(repeat=5, number=per_repeat))
+    return best / per_repeat * 1e9
+
+
+def run(names, budget):
+    results = {}
+    for name in names:
+        fn = BENCHMARKS[name]()
+        results[name] = {"ns_per_op": round(measure(fn, budget), 1)}
+        print(f"{name:60s} {results[name]['ns_per_op']:>14,.1f} ns/op", flush=True)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "numpy": questions.np is not None,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Rows (name, old ns, new ns, ratio, regressed) for shared names."""
+    rows = []
+    for name, new in current["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if old is None:
+            continue
+        ratio = new["ns_per_op"] / old["ns_per_op"] if old["ns_per_op"] else 1.0
+        rows.append((name, old["ns_per_op"], new["ns_per_op"], ratio,
+                     ratio > 1.0 + threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hot-path microbenchmarks")
+    parser.add_argument("--filter", default="", help="only names containing this")
+    parser.add_argument("--save", help="write results JSON here")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before a regression is flagged")
+    parser.add_argument("--budget", type=float, default=1.0,
+                        help="seconds spent timing each benchmark")
+    args = parser.parse_args(argv)
+
+    names = [n for n in BENCHMARKS if args.filter in n]
+    current = run(names, args.budget)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(current, baseline, args.threshold)
+        print()
+        for name, old, new, ratio, bad in rows:
+            flag = "  REGRESSION" if bad else ""
+            print(f"{name:60s} {old:>12,.1f} -> {new:>12,.1f} ns/op  x{ratio:.2f}{flag}")
+        if any(r[4] for r in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# =============================
+# FILE: benchmarks/bench_ai.py
+# =============================
+# AI-mode latency benchmark: one full game with N AI-mode clients (one
+# process each, like real players) against a fake Ollama.
+#
+#   python benchmarks/bench_ai.py --clients 8 --time-limit 2 \
+#       --fake-config fake_ollama_config.json --save ai_run.json
+#
+# Reports how many answers missed the time_limit deadline (the server
+# never received them in time, or the client gave up on the model and
+# sent the empty fallback answer), the server's answer latency per round
+# and the clients' time to first token / total request time.
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from fake_ollama import FakeOllama
+from ports import wait_for_port
+from server import make_server
+from swarm import summarize
+
+TIMING_RE = re.compile(r"\[AI\] first token (?:(\d+) ms|-), total (\d+) ms")
+SOURCE_RE = re.compile(r"\[AI\] budget .* -> (\S+)")
+
+
+def server_cfg(port, clients, questions, time_limit):
+    with open(ROOT / "server_config.json", encoding="utf-8") as f:
+        cfg = json.load(f)
+    types = cfg["question_types"]
+    cfg.update({
+        "port": port,
+        "players": clients,
+        "question_seconds": time_limit,
+        "question_interval_seconds": 0.5,
+        "question_types": [types[i % len(types)] for i in range(questions)],
+        "workers": 0,
+        "multi_room": False,
+        "metrics_port": None,
+        "event_log": None,
+    })
+    return cfg
+
+
+def run(args):
+    fake_cfg = {}
+    if args.fake_config:
+        with open(args.fake_config, encoding="utf-8") as f:
+            fake_cfg = json.load(f)
+    fake_cfg["port"] = args.ollama_port
+    fake = FakeOllama(fake_cfg)
+    ollama_port = fake.start()
+
+    server = make_server(server_cfg(args.port, args.clients, args.questions, args.time_limit))
+    game = threading.Thread(target=server.start, daemon=True)
+    game.start()
+    if not wait_for_port("127.0.0.1", args.port):
+        print(f"bench_ai.py: server did not start on port {args.port}")
+        sys.exit(1)
+
+    tmp = tempfile.mkdtemp(prefix="bench_ai_")
+    procs = []
+    start = time.monotonic()
+    for i in range(args.clients):
+        cfg = {
+            "username": f"ai{i}",
+            "client_mode": "ai",
+            "auto_connect_port": args.port,
+            "ai_fallback": args.fallback,
+            "ollama_config": {"ollama_host": "127.0.0.1", "ollama_port": ollama_port,
+                              "ollama_model": args.model},
+        }
+        if args.cache_dir:
+            cfg["ai_cache_file"] = os.path.join(args.cache_dir, f"ai{i}.jsonl")
+        path = os.path.join(tmp, f"ai{i}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(cfg, f)
+        procs.append(subprocess.Popen(
+            [sys.executable, str(ROOT / "client.py"), "--config", path],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, encoding="utf-8", errors="ignore"))
+
+    first, total = [], []
+    late = 0
+    sources = {}
+    for p in procs:
+        out, _ = p.communicate(timeout=args.questions * (args.time_limit + 5) + 60)
+        for m in TIMING_RE.finditer(out):
+            if m.group(1) is not None:
+                first.append(int(m.group(1)) / 1000)
+            total.append(int(m.group(2)) / 1000)
+            late += int(m.group(2)) / 1000 > args.time_limit
+        for m in SOURCE_RE.finditer(out):
+            sources[m.group(1)] = sources.get(m.group(1), 0) + 1
+    game.join(timeout=10)
+    wall = time.monotonic() - start
+    fake.stop()
+
+    expected = args.clients * args.questions
+    answered = sum(r["answers"] for r in server.round_latency)
+    # An empty fallback arrives in time but is no answer at all
+    missed = expected - answered + sources.get("fallback-empty", 0)
+    return {
+        "clients": args.clients,
+        "questions": args.questions,
+        "time_limit": args.time_limit,
+        "expected_answers": expected,
+        "answers_in_time": answered,
+        "missed_deadline": missed,
+        "miss_rate": round(missed / expected, 4) if expected else 0.0,
+        "client_requests_over_limit": late,
+        "answer_sources": sources,
+        "client_first_token_ms": summarize(first),
+        "client_total_ms": summarize(total),
+        "server_rounds": server.round_latency,
+        "wall_seconds": round(wall, 3),
+        "fake_ollama": {k: v for k, v in fake_cfg.items() if k != "port"},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AI-mode deadline benchmark")
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--questions", type=int, default=4)
+    parser.add_argument("--time-limit", type=float, default=3.0)
+    parser.add_argument("--port", type=int, default=7792)
+    parser.add_argument("--ollama-port", type=int, default=0, help="0 = any free port")
+    parser.add_argument("--model", default="qwen2.5:0.5b")
+    parser.add_argument("--fake-config", help="fake_ollama.py config JSON")
+    parser.add_argument("--fallback", choices=["empty", "auto"], default="empty",
+                        help="client ai_fallback when the model misses the deadline")
+    parser.add_argument("--cache-dir", help="give every client an AI answer cache here")
+    parser.add_argument("--save", help="write the report JSON here")
+    args = parser.parse_args(argv)
+
+    try:
+        import requests  # noqa: F401  (client.py needs it for AI mode)
+    except ImportError:
+        print("bench_ai.py: AI mode needs the requests package")
+        sys.exit(1)
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
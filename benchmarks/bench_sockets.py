@@ -0,0 +1,106 @@
+# =============================
+# FILE: benchmarks/bench_sockets.py
+# =============================
+# Latency effect of the socket_options section (see sockopts.py): one
+# short game per profile, server in this process, players from swarm.py
+# with the same options on their side.
+#
+#   python benchmarks/bench_sockets.py --players 50 --questions 6
+#   python benchmarks/bench_sockets.py --engine asyncio --save sockets.json
+#
+# For each profile the report has swarm.py's answer_result_ms (ANSWER sent
+# -> RESULT received) and result_leaderboard_ms (RESULT -> LEADERBOARD,
+# the two-frame burst Nagle can hold back).
+
+import argparse
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from ports import wait_for_port
+from server import make_server
+from swarm import run_swarm
+
+PROFILES = {
+    "nagle": {"nodelay": False, "cork": False},
+    "nodelay": {"nodelay": True, "cork": False},
+    "nodelay+cork": {"nodelay": True, "cork": True},
+}
+
+
+def server_cfg(port, players, questions, engine, opts):
+    with open(ROOT / "server_config.json", encoding="utf-8") as f:
+        cfg = json.load(f)
+    types = cfg["question_types"]
+    cfg.update({
+        "port": port,
+        "players": players,
+        "server_engine": engine,
+        "question_seconds": 2,
+        "question_interval_seconds": 0.2,
+        "question_types": [types[i % len(types)] for i in range(questions)],
+        "workers": 0,
+        "multi_room": False,
+        "metrics_port": None,
+        "event_log": None,
+        "socket_options": opts,
+    })
+    return cfg
+
+
+def run_profile(name, opts, args, port):
+    server = make_server(server_cfg(port, args.players, args.questions, args.engine, opts))
+    game = threading.Thread(target=server.start, daemon=True)
+    game.start()
+    if not wait_for_port("127.0.0.1", port):
+        raise OSError(f"server did not start on port {port}")
+
+    report = run_swarm({
+        "port": port, "players": args.players, "seed": 1,
+        "answer_delay": {"distribution": "uniform", "min": 0, "max": 0.05},
+        "timeout_seconds": args.questions * 5 + 30,
+        "socket_options": opts,
+    })
+    game.join(timeout=10)
+    return {
+        "socket_options": opts,
+        "finished": report["finished"],
+        "answer_result_ms": report["answer_result_ms"],
+        "result_leaderboard_ms": report["result_leaderboard_ms"],
+        "wall_seconds": report["wall_seconds"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Socket options latency benchmark")
+    parser.add_argument("--players", type=int, default=20)
+    parser.add_argument("--questions", type=int, default=4)
+    parser.add_argument("--engine", choices=["threaded", "asyncio"], default="threaded")
+    parser.add_argument("--port", type=int, default=7793,
+                        help="first port; each profile uses the next one")
+    parser.add_argument("--profile", action="append", choices=sorted(PROFILES),
+                        help="run only these profiles (repeatable)")
+    parser.add_argument("--save", help="write the report JSON here")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for i, name in enumerate(args.profile or PROFILES):
+        results[name] = run_profile(name, PROFILES[name], args, args.port + i)
+        time.sleep(0.2)
+
+    report = {"engine": args.engine, "players": args.players,
+              "questions": args.questions, "profiles": results}
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
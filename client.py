@@ -1,14 +1,19 @@
-import socket
-import threading
+import asyncio
+import inspect
 import json
+import socket
 import sys
-import queue
+import threading
 import time
 from pathlib import Path
-import sys
 
-# ✅ 强制 stdout 用 utf-8（Windows 防报错）
-sys.stdout.reconfigure(encoding="utf-8", errors="ignore")
+from protocol import JSON_LINES, FrameDecoder, get_wire
+from sockopts import socket_options, tune
+# Solver names stay importable from client for older scripts and test_utils
+from solvers import eval_math, roman_to_int, network_and_broadcast, solve
+
+# ✅ 强制 stdout 用 utf-8（Windows 防报错）; line-buffered so pipes see each line
+sys.stdout.reconfigure(encoding="utf-8", errors="ignore", line_buffering=True)
 
 
 ENC = "utf-8"
@@ -37,185 +42,269 @@ def load_config(path):
             sys.exit(1)
 
 
-# ============================
-# Math evaluator (safe)
-# ============================
-def eval_math(expr):
-    tokens = expr.split()
-    prec = {"+":1, "-":1, "*":2, "/":2}
-    out = []
-    st = []
-
-    # infix → postfix
-    for t in tokens:
-        if t.isdigit():
-            out.append(int(t))
-        elif t in prec:
-            while st and st[-1] in prec and prec[st[-1]] >= prec[t]:
-                out.append(st.pop())
-            st.append(t)
-    while st:
-        out.append(st.pop())
-
-    # evaluate postfix
-    s = []
-    for t in out:
-        if isinstance(t, int):
-            s.append(t)
-        else:
-            b = s.pop(); a = s.pop()
-            if t == "+": s.append(a + b)
-            elif t == "-": s.append(a - b)
-            elif t == "*": s.append(a * b)
-            else:
-                if b == 0: s.append(0)
-                else: s.append(a // b)
-    return s[-1]
-
-
-def roman_to_int(s):
-    vals = {"I":1,"V":5,"X":10,"L":50,"C":100,"D":500,"M":1000}
-    total = 0; prev = 0
-    for ch in reversed(s.strip().upper()):
-        v = vals[ch]
-        if v < prev: total -= v
-        else: total += v
-        prev = v
-    return total
-
-
-# ============================
-# IP helpers
-# ============================
-def ip_to_int(ip):
-    a,b,c,d = map(int, ip.split("."))
-    return (a<<24)|(b<<16)|(c<<8)|d
-
-def int_to_ip(x):
-    return ".".join(str((x>>s) & 255) for s in (24,16,8,0))
-
-def network_and_broadcast(ip, prefix):
-    base = ip_to_int(ip)
-    mask = (0xffffffff << (32-prefix)) & 0xffffffff
-    net = base & mask
-    broad = net | (~mask & 0xffffffff)
-    return int_to_ip(net), int_to_ip(broad)
-
-
 # ============================
 # Client Class
 # ============================
 class Client:
+    """Event-driven client: one asyncio loop reads the socket and runs the
+    handlers registered with on() for each message type. In auto mode the
+    ANSWER is written from inside the QUESTION handler; AI requests run in
+    a worker thread so the loop keeps reading."""
+
     def __init__(self, cfg):
         self.cfg = cfg
         self.username = cfg["username"]
         self.mode = cfg["client_mode"]  # you / auto / ai
-        self.sock = None
+        self.reader = None
+        self.writer = None
         self.stop = False
-        self.waiting_for_answer = False   #  关键修复点：标记是否在等待手动输入
-        self.current_qmsg = None          # store current QUESTION
+        self.done = None                  # asyncio.Event: game over or disconnected
+        self.current_qmsg = None          # QUESTION still waiting for an answer
+        self.question_at = None
+        self.answer_latency = []          # QUESTION received -> ANSWER written (s)
+        self.tasks = set()
 
         if self.mode == "ai" and "ollama_config" not in cfg:
             print("client.py: Missing values for Ollama configuration")
             sys.exit(1)
 
         self.ollama = cfg.get("ollama_config", None)
+        self.session = None               # keep-alive HTTP session to Ollama
+        self.ai_timings = []              # per question: first token / total (s)
+
+        # Deadline scheduling: the answer must reach the server before the
+        # round closes, so the model only gets time_limit minus the measured
+        # round trip minus a margin; after that the fallback answer is sent
+        self.rtt = 0.0                    # measured round trip to the server (s)
+        self.hi_sent = None
+        self.ai_fallback = cfg.get("ai_fallback", "empty")    # empty / auto
+        self.ai_margin = float(cfg.get("ai_deadline_margin_ms", 50)) / 1000
+        self.ai_budget = []               # per question: where the time went
+        if self.ai_fallback not in ("empty", "auto"):
+            print("client.py: ai_fallback must be \"empty\" or \"auto\"")
+            sys.exit(1)
+
+        # Optional on-disk cache of raw model output (see answercache.py)
+        self.ai_cache = None
+        if self.mode == "ai" and cfg.get("ai_cache_file"):
+            from answercache import AnswerCache
+            self.ai_cache = AnswerCache(cfg["ai_cache_file"],
+                                        cfg.get("ai_cache_max_entries", 20000))
+
+        # Optional binary framing, used once the server answers in it
+        self.wire_request = cfg.get("wire", "json")
+        self.codec = cfg.get("codec", "json")
+        self.wire = JSON_LINES
+
+        # Default handlers (print what the server says)
+        self.handlers = {}
+        self.on("READY", self.on_ready)
+        self.on("QUESTION", self.on_question)
+        self.on("RESULT", lambda m: print(m["feedback"]))
+        self.on("LEADERBOARD", lambda m: print(m["state"]))
+        self.on("STANDINGS", self.on_standings)
+        self.on("FINISHED", self.on_finished)
+
+    # ============================
+    # Handler API
+    # ============================
+    def on(self, mtype, handler):
+        """Call handler(msg) for every message of this type, in the order
+        registered. A coroutine handler is run as a task."""
+        self.handlers.setdefault(mtype, []).append(handler)
+
+    def dispatch(self, msg):
+        for handler in self.handlers.get(msg.get("message_type"), ()):
+            result = handler(msg)
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
 
     # ============================
     # Send JSON with newline
     # ============================
     def send_json(self, obj):
-        data = (json.dumps(obj) + "\n").encode(ENC)
-        try:
-            self.sock.sendall(data)
-        except:
-            pass
+        if self.writer is None or self.writer.is_closing():
+            return
+        self.writer.write(self.wire.encode(obj))
+
+    def answer(self, ans):
+        self.send_json({"message_type": "ANSWER", "answer": ans})
+        if self.question_at is not None:
+            self.answer_latency.append(time.perf_counter() - self.question_at)
+        self.current_qmsg = None
 
     # ============================
     # Background receiver
     # ============================
-    def recv_loop(self):
-        f = self.sock.makefile("r", encoding=ENC)
-        for line in f:
-            if self.stop:
-                break
-
-            line = line.strip()
-            if not line:
-                continue
-
-            try:
-                msg = json.loads(line)
-            except:
-                continue
-
-            self.handle_msg(msg)
+    async def recv_loop(self):
+        binary = get_wire(self.wire_request, self.codec)
+        decoder = FrameDecoder(binary.codec if binary and binary.binary else None,
+                               strict=False)
+        try:
+            while not self.stop:
+                data = await self.reader.read(65536)
+                if not data:
+                    break
+
+                for msg in decoder.feed(data):
+                    if decoder.saw_binary and binary is not None:
+                        self.wire = binary     # server accepted binary framing
+                    self.dispatch(msg)
+        except OSError:
+            pass
+        except ValueError as e:
+            print(f"client.py: Bad message from server: {e}")
 
         self.stop = True
+        self.done.set()
 
     # ============================
     # Incoming server messages
     # ============================
-    def handle_msg(self, msg):
-        mtype = msg["message_type"]
-
-        if mtype == "READY":
-            print(msg["info"])
-
-        elif mtype == "QUESTION":
-            print(msg["trivia_question"])
-            self.current_qmsg = msg
-            self.waiting_for_answer = True   #  主线程会检测到
-
-        elif mtype == "RESULT":
-            print(msg["feedback"])
+    def on_ready(self, msg):
+        print(msg["info"])
+        # READY answers HI straight away: one more round-trip sample
+        if self.hi_sent is not None:
+            self.rtt = max(self.rtt, time.perf_counter() - self.hi_sent)
+            self.hi_sent = None
+
+    def on_question(self, msg):
+        self.question_at = time.perf_counter()
+        print(msg["trivia_question"])
+        self.current_qmsg = msg
+
+        if self.mode == "auto":
+            self.answer(self.solve_auto(msg))
+        elif self.mode == "ai":
+            raw = self.cached_ai(msg)
+            if raw is not None:
+                self.answer(raw.strip())     # same as solve_ai on that output
+                self.report_budget(msg, "cache", cache=time.perf_counter() - self.question_at)
+                return None
+            return self.answer_ai(msg)
+        else:
+            print("Your answer: ", end="", flush=True)
 
-        elif mtype == "LEADERBOARD":
-            print(msg["state"])
+    def on_standings(self, msg):
+        print(msg["state"])
+        print(f"(page {msg['page']}/{msg['pages']})")
 
-        elif mtype == "FINISHED":
-            print(msg["final_standings"])
-            print("FINISHED")   # ✅ integration test 必须依赖的关键语句
-            self.waiting_for_answer = False
-            self.stop = True    # ✅ 自动退出循环
+    def on_finished(self, msg):
+        print(msg["final_standings"])
+        print("FINISHED")   # ✅ integration test 必须依赖的关键语句
+        self.current_qmsg = None
+        self.stop = True    # ✅ 自动退出循环
+        self.done.set()
 
     # ============================
     # Solve automatically
     # ============================
     def solve_auto(self, qmsg):
-        qt = qmsg["question_type"]
-        short = qmsg["short_question"]
+        return solve(qmsg["question_type"], qmsg["short_question"])
 
-        if qt == "Mathematics":
-            return str(eval_math(short))
+    def cached_ai(self, qmsg):
+        if self.ai_cache is None:
+            return None
+        return self.ai_cache.get(qmsg["question_type"], qmsg["short_question"],
+                                 self.ollama["ollama_model"])
 
-        if qt == "Roman Numerals":
-            return str(roman_to_int(short))
+    def ai_deadline(self, qmsg):
+        """Seconds after QUESTION arrival by which the ANSWER must be sent."""
+        return max(0.0, float(qmsg.get("time_limit", 5)) - self.rtt - self.ai_margin)
 
-        if qt == "Usable IP Addresses of a Subnet":
-            _, prefix = short.split("/")
-            return str(max(0, (2**(32-int(prefix))) - 2))
+    def fallback_answer(self, qmsg):
+        if self.ai_fallback == "auto":
+            return self.solve_auto(qmsg)
+        return ""
 
-        if qt == "Network and Broadcast Address of a Subnet":
-            ip, prefix = short.split("/")
-            n, b = network_and_broadcast(ip, int(prefix))
-            return f"{n} and {b}"
+    def store_ai(self, qmsg, task):
+        # Also runs for answers that came too late: the next time is a hit
+        if task.cancelled() or self.ai_cache is None:
+            return
+        raw = task.result()
+        if raw is not None and raw.strip():
+            self.ai_cache.put(qmsg["question_type"], qmsg["short_question"],
+                              self.ollama["ollama_model"], raw)
+
+    async def answer_ai(self, qmsg):
+        asked = self.question_at
+        budget = self.ai_deadline(qmsg)
+        t0 = time.perf_counter()
+
+        # requests is blocking: keep the loop reading meanwhile
+        ask = asyncio.ensure_future(asyncio.to_thread(self.ask_ollama, qmsg, budget))
+        ask.add_done_callback(lambda task: self.store_ai(qmsg, task))
+        try:
+            raw = await asyncio.wait_for(asyncio.shield(ask), max(0.0, asked + budget - t0))
+        except asyncio.TimeoutError:
+            raw = None                       # the model is still going; stop waiting
+        t1 = time.perf_counter()
 
-        return ""
+        if raw is not None and raw.strip():
+            ans, source, fallback = raw.strip(), "model", 0.0
+        else:
+            ans = self.fallback_answer(qmsg)
+            source, fallback = "fallback-" + self.ai_fallback, time.perf_counter() - t1
+        if self.current_qmsg is qmsg:
+            self.answer(ans)
+        self.report_budget(qmsg, source, cache=t0 - asked, model=t1 - t0, fallback=fallback)
+
+    def report_budget(self, qmsg, source, cache=0.0, model=0.0, fallback=0.0):
+        limit = float(qmsg.get("time_limit", 5))
+        sent = cache + model + fallback
+        self.ai_budget.append({
+            "time_limit": limit, "rtt": self.rtt, "cache": cache, "model": model,
+            "fallback": fallback, "sent": sent, "slack": limit - self.rtt - sent,
+            "source": source,
+        })
+        print(f"[AI] budget {limit * 1000:.0f} ms: rtt {self.rtt * 1000:.0f} ms, "
+              f"cache {cache * 1000:.0f} ms, model {model * 1000:.0f} ms, "
+              f"fallback {fallback * 1000:.0f} ms, slack {(limit - self.rtt - sent) * 1000:.0f} ms "
+              f"-> {source}")
 
     # ============================
     # AI mode via Ollama
     # ============================
+    def ollama_url(self, path):
+        return f"http://{self.ollama['ollama_host']}:{self.ollama['ollama_port']}{path}"
+
+    def ai_session(self):
+        # One pooled keep-alive connection instead of a new TCP per question
+        if self.session is None:
+            self.session = requests.Session()
+        return self.session
+
+    def prewarm_ai(self):
+        """Load the model now and keep it loaded, so the first question
+        does not pay the cold start inside its time limit."""
+        if requests is None:
+            return
+        body = {
+            "model": self.ollama["ollama_model"],
+            "messages": [],
+            "keep_alive": self.ollama.get("ollama_keep_alive", "30m"),
+        }
+        try:
+            r = self.ai_session().post(self.ollama_url("/api/chat"), json=body,
+                                       timeout=float(self.ollama.get("ollama_prewarm_timeout", 120)))
+            r.raise_for_status()
+        except Exception:
+            print("[AI] model prewarm failed")
+
     def solve_ai(self, qmsg):
+        raw = self.ask_ollama(qmsg)
+        return raw.strip() if raw is not None else ""
+
+    def ask_ollama(self, qmsg, timeout_s=None):
+        """The model's raw answer text, or None if the request failed or
+        took longer than timeout_s (default: the question's time_limit)."""
         if requests is None:
-            return ""
+            return None
 
-        host = self.ollama["ollama_host"]
-        port = self.ollama["ollama_port"]
         model = self.ollama["ollama_model"]
 
-        url = f"http://{host}:{port}/api/chat"
-
         #  合规：只通过 prompt 约束格式，不允许程序做后处理
         prompt = (
             "You are a trivia solver.\n"
@@ -234,65 +323,155 @@ class Client:
         body = {
             "model": model,
             "messages": [{"role": "user", "content": prompt}],
-            "stream": False   #  合规：可以关闭流式，直接取最终回答
+            "stream": True,   # 读取流式输出：生成结束即可作答
+            "keep_alive": self.ollama.get("ollama_keep_alive", "30m"),
         }
 
-        #  使用 time_limit 作为网络超时（规则要求）
-        timeout_s = float(qmsg.get("time_limit", 5))
+        #  使用 time_limit 作为网络超时（规则要求）; the scheduler passes less
+        if timeout_s is None:
+            timeout_s = float(qmsg.get("time_limit", 5))
 
+        t0 = time.perf_counter()
+        first = None
+        parts = []
         try:
-            r = requests.post(url, json=body, timeout=timeout_s)
-            r.raise_for_status()
-            data = r.json()
-
-            #  合规：不修改大模型输出
-            msg = data.get("message", {}).get("content", "")
-
-            return msg.strip()   #  允许 strip()（去前后空白不属于修改输出）
-        except:
-            return ""
-
+            with self.ai_session().post(self.ollama_url("/api/chat"), json=body,
+                                        stream=True, timeout=timeout_s) as r:
+                r.raise_for_status()
+                for line in r.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    piece = chunk.get("message", {}).get("content", "")
+                    if piece and first is None:
+                        first = time.perf_counter() - t0
+                    parts.append(piece)
+                    # "done" is the last chunk; reading on to the end of the
+                    # body lets the connection go back to the pool
+                    if not chunk.get("done") and time.perf_counter() - t0 > timeout_s:
+                        raise TimeoutError("answer not finished within time_limit")
+
+            #  合规：不修改大模型输出（只拼接流式片段）
+            raw = "".join(parts)
+        except Exception:
+            raw = None
+
+        total = time.perf_counter() - t0
+        self.ai_timings.append({"first_token": first, "total": total})
+        ttft = "-" if first is None else f"{first * 1000:.0f} ms"
+        print(f"[AI] first token {ttft}, total {total * 1000:.0f} ms")
+        return raw
 
     # ============================
     # Connect
     # ============================
-    def connect(self, host, port):
-        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-
+    async def connect(self, host, port):
+        if self.done is None:
+            self.done = asyncio.Event()
+        # Tuned before connect() so the buffer sizes shape the handshake
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        tune(sock, socket_options(self.cfg))
+        sock.setblocking(False)
+        t0 = time.perf_counter()
         try:
-            self.sock.connect((host, port))
-        except:
+            await asyncio.get_running_loop().sock_connect(sock, (host, port))
+            self.rtt = time.perf_counter() - t0      # TCP handshake: one round trip
+            self.reader, self.writer = await asyncio.open_connection(sock=sock)
+        except OSError:
+            sock.close()
             print("Connection failed")
             sys.exit(0)
 
         print(f" Connected to {host}:{port}")
+        self.stop = False
+        self.done.clear()
 
         # Send HI
-        self.send_json({"message_type":"HI","username":self.username})
+        hi = {"message_type":"HI","username":self.username}
+        if self.wire_request != "json":
+            hi["wire"] = self.wire_request
+            hi["codec"] = self.codec
+        self.send_json(hi)
+        self.hi_sent = time.perf_counter()
 
-        threading.Thread(target=self.recv_loop, daemon=True).start()
+        task = asyncio.create_task(self.recv_loop())
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
 
     # ============================
     # Disconnect
     # ============================
     def disconnect(self):
-        if self.sock:
-            try:
-                self.send_json({"message_type":"BYE"})
-            except:
-                pass
-            try:
-                self.sock.close()
-            except:
-                pass
+        if self.writer:
+            self.send_json({"message_type":"BYE"})
+            self.writer.close()
         self.stop = True
+        if self.done is not None:
+            self.done.set()
+
+    # ============================
+    # Modes
+    # ============================
+    async def run_auto(self):
+        host = "127.0.0.1"
+        port = self.cfg.get("auto_connect_port", 7777)
+
+        print(f"[CLIENT] Auto/AI mode connecting to {host}:{port}")
+        if self.mode == "ai":
+            # Load the model while the game is still waiting for players
+            prewarm = asyncio.create_task(asyncio.to_thread(self.prewarm_ai))
+            self.tasks.add(prewarm)
+            prewarm.add_done_callback(self.tasks.discard)
+        await self.connect(host, port)
+        await self.done.wait()
+        self.writer.close()
+        if self.ai_cache is not None:
+            self.ai_cache.close()
+
+    async def run_you(self):
+        # stdin is read by a thread and handed to the loop line by line
+        loop = asyncio.get_running_loop()
+        lines = asyncio.Queue()
+
+        def read_stdin():
+            for line in sys.stdin:
+                loop.call_soon_threadsafe(lines.put_nowait, line.strip())
+            loop.call_soon_threadsafe(lines.put_nowait, None)
+
+        threading.Thread(target=read_stdin, daemon=True).start()
+        print("[CLIENT] Client ready. Please type CONNECT 127.0.0.1:7777")
+
+        while True:
+            cmd = await lines.get()
+            if cmd is None:
+                self.disconnect()
+                return
+
+            if self.current_qmsg is not None:
+                self.answer(cmd)
+                continue
+
+            if cmd.upper().startswith("CONNECT "):
+                addr = cmd.split()[1]
+                host, port = addr.split(":")
+                await self.connect(host, int(port))
+            elif cmd.upper().startswith("STANDINGS"):
+                parts = cmd.split()
+                page = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 1
+                self.send_json({"message_type": "STANDINGS", "page": page})
+            elif cmd.upper() in ("DISCONNECT", "EXIT"):
+                self.disconnect()
+                return
+
+    async def run(self):
+        if self.mode in ("auto", "ai"):
+            await self.run_auto()
+        else:
+            await self.run_you()
 
 
 # ============================
-# MAIN LOOP (fixed for input)
-# ============================
-# ============================
-# MAIN LOOP (non-blocking for auto/ai)
+# MAIN
 # ============================
 def main():
 
@@ -304,54 +483,8 @@ def main():
     cfg_path = sys.argv[idx + 1]
     cfg = load_config(cfg_path)
 
-    client = Client(cfg)
-
-    # ✅ AUTO / AI 模式：自动连接，不进入 input()
-    if client.mode in ("auto", "ai"):
-        host = "127.0.0.1"
-        port = cfg.get("auto_connect_port", 7777)
-
-        print(f"[CLIENT] Auto/AI mode connecting to {host}:{port}")
-        client.connect(host, port)
-
-        # ✅ 自动答题循环
-        while not client.stop:
-            if client.waiting_for_answer:
-                if client.mode == "auto":
-                    ans = client.solve_auto(client.current_qmsg)
-                else:
-                    ans = client.solve_ai(client.current_qmsg)
-
-                client.send_json({"message_type": "ANSWER", "answer": ans})
-                client.waiting_for_answer = False
-
-            time.sleep(0.05)
-
-        return  # ✅ 不进入 YOU 模式
-
-    # ✅ YOU 模式 — 手动
-    print("[CLIENT] Client ready. Please type CONNECT 127.0.0.1:7777")
-
-    while True:
-        if client.waiting_for_answer:
-            ans = input("Your answer: ").strip()
-            client.send_json({"message_type": "ANSWER", "answer": ans})
-            client.waiting_for_answer = False
-            continue
-
-        cmd = input().strip()
-        if cmd.upper().startswith("CONNECT "):
-            addr = cmd.split()[1]
-            host, port = addr.split(":")
-            client.connect(host, int(port))
-        elif cmd.upper() == "DISCONNECT":
-            client.disconnect()
-            break
-        elif cmd.upper() == "EXIT":
-            client.disconnect()
-            break
+    asyncio.run(Client(cfg).run())
 
 
 if __name__ == "__main__":
     main()
-
@@ -2,6 +2,8 @@ import socket
 import json
 import time
 
+from solvers import solve
+
 ENC = "utf-8"
 
 def send_json(sock, obj):
@@ -15,52 +17,9 @@ def recv_json_lines(sock):
         if line:
             yield json.loads(line) 
 
-# Automatically solve Roman Numerals
-def roman_to_int(s):
-    vals = {"I":1,"V":5,"X":10,"L":50,"C":100,"D":500,"M":1000}
-    total = 0
-    prev = 0
-    for ch in reversed(s.strip().upper()):
-        v = vals[ch]
-        if v < prev:
-            total -= v
-        else:
-            total += v
-        prev = v
-    return total
-
-# Automatically solve IP address questions
-def ip_to_int(ip):
-    a,b,c,d = map(int, ip.split("."))
-    return (a<<24)|(b<<16)|(c<<8)|d
-
-def int_to_ip(x):
-    return ".".join(str((x>>s)&255) for s in (24,16,8,0))
-
-def network_and_broadcast(ip, prefix):
-    mask = (0xffffffff << (32-prefix)) & 0xffffffff
-    ipi = ip_to_int(ip)
-    net = ipi & mask
-    bcast = net | (~mask & 0xffffffff)
-    return int_to_ip(net), int_to_ip(bcast)
-
+# Automatically solve questions (shared solver tables, no eval)
 def auto_answer(qtype, short):
-    if qtype == "Mathematics":
-        return str(eval(short))
-
-    if qtype == "Roman Numerals":
-        return str(roman_to_int(short))
-
-    if qtype == "Usable IP Addresses of a Subnet":
-        _, prefix = short.split("/")
-        return str(max(0, 2**(32-int(prefix)) - 2))
-
-    if qtype == "Network and Broadcast Address of a Subnet":
-        ip, prefix = short.split("/")
-        n, b = network_and_broadcast(ip, int(prefix))
-        return f"{n} and {b}"
-
-    return "0"
+    return solve(qtype, short) or "0"
 
 def main():
     print("🤖 Auto client starting...")
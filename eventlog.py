@@ -0,0 +1,111 @@
+# =============================
+# FILE: eventlog.py
+# =============================
+# Append-only binary log of a game's protocol events, for replay.py.
+#
+# File: magic "TQLOG2\n", then records
+#   [u32 payload length][f64 seconds since the log opened][u32 room]
+#   [u32 conn][u8 direction][u8 message type code][payload]
+# room is the lobby room id (0 for a single-game server; every room of a
+# lobby writes its own META), conn is Player.id (0 = sent to every
+# player of the room), direction 0 = from the
+# client, 1 = to the client, the type code comes from protocol.TYPE_CODES
+# (0 for log-only events such as META and CLOSE) and the payload is the
+# message as compact JSON. "TQLOG1" files (no room field) still read,
+# as room 0.
+#
+# log() only appends to a deque; a writer thread encodes and writes in
+# batches, so the round loop never waits for the disk.
+
+import json
+import struct
+import threading
+import time
+from collections import deque, namedtuple
+
+from protocol import TYPE_CODES, TYPE_NAMES
+
+MAGIC = b"TQLOG2\n"
+RECORD = struct.Struct("<IdIIBB")
+MAGIC_V1 = b"TQLOG1\n"
+RECORD_V1 = struct.Struct("<IdIBB")
+IN, OUT = 0, 1
+BROADCAST = 0
+
+Event = namedtuple("Event", "t conn direction msg room", defaults=(0,))
+
+
+class EventLog:
+    def __init__(self, path, flush_seconds=0.2, max_pending=1_000_000):
+        self.f = open(path, "ab")
+        if self.f.tell() == 0:
+            self.f.write(MAGIC)
+        self.t0 = time.monotonic()
+        self.flush_seconds = flush_seconds
+        self.max_pending = max_pending
+        self.pending = deque()     # (t, room, conn, direction, msg); append is thread-safe
+        self.dropped = 0
+        self.closed = threading.Event()
+        self.writer = threading.Thread(target=self.run, daemon=True)
+        self.writer.start()
+
+    def log(self, conn, direction, msg, room=0):
+        if len(self.pending) >= self.max_pending:
+            self.dropped += 1      # the writer fell behind; never block the game
+            return
+        self.pending.append((time.monotonic() - self.t0, room, conn, direction, msg))
+
+    def meta(self, room=0, **info):
+        """Start of a game in this room."""
+        self.log(BROADCAST, OUT, dict(info, message_type="META", wall=time.time()), room)
+
+    def write_pending(self):
+        buf = bytearray()
+        pending = self.pending
+        while pending:
+            t, room, conn, direction, msg = pending.popleft()
+            payload = json.dumps(msg, separators=(",", ":")).encode("utf-8")
+            code = TYPE_CODES.get(msg.get("message_type"), 0)
+            buf += RECORD.pack(len(payload), t, room, conn, direction, code)
+            buf += payload
+        if buf:
+            self.f.write(buf)
+            self.f.flush()
+
+    def run(self):
+        while not self.closed.wait(self.flush_seconds):
+            self.write_pending()
+        self.write_pending()
+        self.f.close()
+
+    def close(self, timeout=5.0):
+        self.closed.set()
+        self.writer.join(timeout)
+
+
+def read_events(path):
+    """Yield Events from a log file (a torn last record is ignored)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data.startswith(MAGIC):
+        record = RECORD
+    elif data.startswith(MAGIC_V1):
+        record = RECORD_V1
+    else:
+        raise ValueError(f"{path} is not a game event log")
+
+    pos = len(MAGIC)
+    while pos + record.size <= len(data):
+        fields = record.unpack_from(data, pos)
+        if record is RECORD:
+            length, t, room, conn, direction, code = fields
+        else:
+            (length, t, conn, direction, code), room = fields, 0
+        start = pos + record.size
+        if start + length > len(data):
+            break
+        msg = json.loads(data[start:start + length].decode("utf-8"))
+        if code:
+            msg["message_type"] = TYPE_NAMES[code]
+        yield Event(t, conn, direction, msg, room)
+        pos = start + length
@@ -0,0 +1,206 @@
+# =============================
+# FILE: fake_ollama.py
+# =============================
+# Local stand-in for Ollama's /api/chat, for testing and benchmarking AI
+# mode without a model.
+#
+#   python fake_ollama.py --config fake_ollama_config.json
+#
+# Config keys (all optional):
+#   port                 11434
+#   answers              "correct" (solve the question in the prompt),
+#                        "canned" (always canned_answer) or "script"
+#                        (script_answers in order, then "correct")
+#   first_token_delay    delay spec before the first token (see swarm.make_delay)
+#   token_delay          delay spec between tokens
+#   cold_start_seconds   extra delay on the first request for each model
+#   error_rate           fraction of requests answered with HTTP 500
+#   disconnect_rate      fraction of streams cut off after the first token
+#   seed                 random seed
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from solvers import solve
+from swarm import make_delay
+
+QUESTION_RE = re.compile(r"Question type: (.*)\nQuestion: (.*)")
+
+
+class FakeOllama:
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.rng = random.Random(cfg.get("seed"))
+        self.rng_lock = threading.Lock()
+        self.first_token_delay = make_delay(cfg.get("first_token_delay", {}), self.rng)
+        self.token_delay = make_delay(cfg.get("token_delay", {}), self.rng)
+        self.script = list(cfg.get("script_answers", []))
+        self.warm = set()
+        self.lock = threading.Lock()
+        self.requests = []         # (client port, request body), for tests
+        self.httpd = None
+
+    def draw(self, fn):
+        with self.rng_lock:
+            return fn()
+
+    def answer_for(self, messages):
+        mode = self.cfg.get("answers", "correct")
+        if mode == "canned":
+            return self.cfg.get("canned_answer", "42")
+        if mode == "script":
+            with self.lock:
+                if self.script:
+                    return self.script.pop(0)
+        text = messages[-1].get("content", "") if messages else ""
+        m = QUESTION_RE.search(text)
+        return solve(m.group(1), m.group(2)) if m else ""
+
+    def cold_start(self, model):
+        with self.lock:
+            if model in self.warm:
+                return 0.0
+            self.warm.add(model)
+        return float(self.cfg.get("cold_start_seconds", 0))
+
+    def tokens(self, text):
+        """Split an answer into 1-3 character pieces, like a tokenizer."""
+        out = []
+        i = 0
+        while i < len(text):
+            n = self.draw(lambda: self.rng.randint(1, 3))
+            out.append(text[i:i + n])
+            i += n
+        return out
+
+    # =============================
+    # HTTP
+    # =============================
+    def handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"      # keep-alive, like Ollama
+
+            def do_POST(self):
+                if self.path != "/api/chat":
+                    self.send_error(404)
+                    return
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                with fake.lock:
+                    fake.requests.append((self.client_address[1], body))
+                try:
+                    fake.chat(self, body)
+                except (BrokenPipeError, ConnectionResetError):
+                    self.close_connection = True    # client gave up (timeout)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def chat(self, h, body):
+        model = body.get("model", "")
+        messages = body.get("messages", [])
+        time.sleep(self.cold_start(model))
+
+        if self.draw(self.rng.random) < float(self.cfg.get("error_rate", 0)):
+            h.send_error(500, "injected error")
+            return
+
+        if not messages:                        # prewarm / load request
+            self.send_json(h, {"model": model, "message": {"role": "assistant", "content": ""},
+                               "done": True, "done_reason": "load"})
+            return
+
+        answer = self.answer_for(messages)
+        time.sleep(self.draw(self.first_token_delay))
+
+        if not body.get("stream", True):
+            for _ in self.tokens(answer)[1:]:
+                time.sleep(self.draw(self.token_delay))
+            self.send_json(h, {"model": model, "message": {"role": "assistant", "content": answer},
+                               "done": True})
+            return
+
+        h.send_response(200)
+        h.send_header("Content-Type", "application/x-ndjson")
+        h.send_header("Transfer-Encoding", "chunked")
+        h.end_headers()
+        drop = self.draw(self.rng.random) < float(self.cfg.get("disconnect_rate", 0))
+        for i, piece in enumerate(self.tokens(answer)):
+            if i:
+                time.sleep(self.draw(self.token_delay))
+            self.write_chunk(h, {"model": model, "message": {"role": "assistant", "content": piece},
+                                 "done": False})
+            if drop:
+                h.close_connection = True
+                return
+        self.write_chunk(h, {"model": model, "message": {"role": "assistant", "content": ""},
+                             "done": True, "done_reason": "stop"})
+        h.wfile.write(b"0\r\n\r\n")
+
+    def send_json(self, h, obj):
+        data = json.dumps(obj).encode("utf-8")
+        h.send_response(200)
+        h.send_header("Content-Type", "application/json")
+        h.send_header("Content-Length", str(len(data)))
+        h.end_headers()
+        h.wfile.write(data)
+
+    def write_chunk(self, h, obj):
+        line = json.dumps(obj).encode("utf-8") + b"\n"
+        h.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+        h.wfile.flush()
+
+    def start(self, host="127.0.0.1"):
+        """Serve from a daemon thread; returns the bound port."""
+        self.httpd = ThreadingHTTPServer((host, int(self.cfg.get("port", 11434))), self.handler())
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self.httpd.server_address[1]
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake Ollama /api/chat server")
+    parser.add_argument("--config", help="JSON config (see the top of this file)")
+    parser.add_argument("--port", type=int)
+    args = parser.parse_args(argv)
+
+    cfg = {}
+    if args.config:
+        try:
+            with open(args.config, "r", encoding="utf-8") as f:
+                cfg = json.load(f)
+        except FileNotFoundError:
+            print(f"fake_ollama.py: File {args.config} does not exist")
+            sys.exit(1)
+    if args.port is not None:
+        cfg["port"] = args.port
+
+    fake = FakeOllama(cfg)
+    try:
+        port = fake.start()
+    except OSError:
+        print(f"fake_ollama.py: Binding to port {cfg.get('port', 11434)} was unsuccessful")
+        sys.exit(1)
+    print(f"fake_ollama.py: listening on 127.0.0.1:{port}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+# =============================
+# FILE: gateway.py
+# =============================
+# Front door for several game nodes.
+#
+#   python gateway.py --config gateway_config.json
+#
+# Clients connect here exactly as they would to server.py. The gateway
+# reads the HI line itself, picks a node and from then on relays the
+# connection's bytes both ways over that node's link: one persistent TCP
+# connection per node carrying every player routed there (muxlink.py).
+# Nodes are server.py processes with "link_port" set.
+#
+# Routing uses the LOAD records the nodes send: a node whose open room
+# already has players waiting gets the next player (fullest first, so
+# rooms start), otherwise the node with the fewest players opens a new
+# room. Between reports the gateway counts its own assignments.
+#
+# A node whose link drops is skipped by routing, and the gateway keeps
+# reconnecting to it with exponential backoff (reconnect_min_seconds,
+# doubling up to reconnect_max_seconds) until it is back.
+
+import asyncio
+import json
+import sys
+from itertools import count
+
+from muxlink import CLOSE, DATA, LOAD, OPEN, LinkDecoder, encode_record
+from server import SEND_QUEUE_MAX_BYTES
+from server_async import raise_fd_limit
+from sockopts import socket_options, tune
+
+
+# =============================
+# One game node
+# =============================
+class Node:
+    def __init__(self, index, host, port):
+        self.index = index
+        self.host, self.port = host, port
+        self.writer = None
+        self.reader_task = None
+        self.clients = {}          # channel -> client StreamWriter
+        self.players = 0
+        self.waiting = 0
+        self.room_size = 0         # 0 until the first LOAD
+        self.assigned = 0          # players ever routed here
+
+    @property
+    def up(self):
+        return self.writer is not None and not self.writer.is_closing()
+
+    def send(self, cid, kind, payload=b""):
+        if self.up:
+            self.writer.write(encode_record(cid, kind, payload))
+
+    def took_player(self):
+        self.players += 1
+        self.assigned += 1
+        if self.room_size:
+            self.waiting = (self.waiting + 1) % self.room_size
+
+    def on_load(self, load):
+        self.players = int(load.get("players", 0))
+        self.waiting = int(load.get("waiting", 0))
+        self.room_size = int(load.get("room_size", 0))
+
+    def lost(self):
+        self.writer.close()
+        for client in self.clients.values():
+            client.close()
+        self.clients.clear()
+        self.players = self.waiting = 0
+
+
+# =============================
+# The gateway
+# =============================
+class Gateway:
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.nodes = [Node(i, n.get("host", "127.0.0.1"), int(n["link_port"]))
+                      for i, n in enumerate(cfg["nodes"])]
+        self.sockopts = socket_options(cfg)
+        self.max_bytes = int(cfg.get("send_queue_max_bytes", SEND_QUEUE_MAX_BYTES))
+        self.hi_timeout = float(cfg.get("hi_timeout_seconds", 30))
+        self.reconnect_min = float(cfg.get("reconnect_min_seconds", 0.5))
+        self.reconnect_max = float(cfg.get("reconnect_max_seconds", 10))
+        self.channel_ids = count(1)
+        self.server = None
+
+    def pick(self):
+        up = [n for n in self.nodes if n.up]
+        if not up:
+            return None
+        filling = [n for n in up if 0 < n.waiting < n.room_size]
+        if filling:
+            return max(filling, key=lambda n: (n.waiting, -n.players))
+        return min(up, key=lambda n: (n.players, n.index))
+
+    # =============================
+    # Node links
+    # =============================
+    async def connect_node(self, node):
+        reader, node.writer = await asyncio.open_connection(node.host, node.port)
+        tune(node.writer.get_extra_info("socket"), self.sockopts)
+        return reader
+
+    async def keep_linked(self, node, reader):
+        """Relay the node's records; reconnect with backoff when the link drops."""
+        while True:
+            await self.read_node(node, reader)
+            delay = self.reconnect_min
+            while True:
+                await asyncio.sleep(delay)
+                try:
+                    reader = await self.connect_node(node)
+                    break
+                except OSError:
+                    delay = min(delay * 2, self.reconnect_max)
+            print(f"gateway.py: relinked to node {node.index} "
+                  f"({node.host}:{node.port})", flush=True)
+
+    async def read_node(self, node, reader):
+        decoder = LinkDecoder()
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                for cid, kind, payload in decoder.feed(data):
+                    if kind == DATA:
+                        self.to_client(node, cid, payload)
+                    elif kind == CLOSE:
+                        client = node.clients.pop(cid, None)
+                        if client is not None:
+                            client.close()
+                    elif kind == LOAD:
+                        node.on_load(json.loads(payload))
+        except OSError:
+            pass
+
+        print(f"gateway.py: lost the link to node {node.index} "
+              f"({node.host}:{node.port})", flush=True)
+        node.lost()
+
+    def to_client(self, node, cid, payload):
+        client = node.clients.get(cid)
+        if client is None or client.is_closing():
+            return
+        if client.transport.get_write_buffer_size() + len(payload) > self.max_bytes:
+            # Slow consumer: drop it here instead of buffering for ever
+            client.transport.abort()
+            node.clients.pop(cid, None)
+            node.send(cid, CLOSE)
+            return
+        client.write(payload)
+
+    # =============================
+    # Client connections
+    # =============================
+    async def handle_client(self, reader, writer):
+        tune(writer.get_extra_info("socket"), self.sockopts)
+        try:
+            hi = await asyncio.wait_for(reader.readline(), self.hi_timeout)
+            msg = json.loads(hi)
+        except (asyncio.TimeoutError, ValueError, OSError):
+            writer.close()
+            return
+        if not isinstance(msg, dict) or msg.get("message_type") != "HI" or not any(
+                c.isalnum() for c in str(msg.get("username", ""))):
+            writer.close()         # the node would drop it too
+            return
+
+        node = self.pick()
+        if node is None:
+            writer.close()
+            return
+        cid = next(self.channel_ids)
+        node.clients[cid] = writer
+        node.took_player()
+        peer = writer.get_extra_info("peername")
+        node.send(cid, OPEN, f"{peer[0]}:{peer[1]}".encode("utf-8") if peer else b"")
+        node.send(cid, DATA, hi)
+
+        link = node.writer         # a relinked node does not know this channel
+        try:
+            while not link.is_closing():
+                data = await reader.read(65536)
+                if not data:
+                    break
+                link.write(encode_record(cid, DATA, data))
+                await link.drain()
+        except OSError:
+            pass
+        if node.clients.pop(cid, None) is not None and not link.is_closing():
+            link.write(encode_record(cid, CLOSE))
+        writer.close()
+
+    # =============================
+    # Start
+    # =============================
+    async def serve(self):
+        for node in self.nodes:
+            try:
+                reader = await self.connect_node(node)
+            except OSError:
+                print(f"gateway.py: Connecting to node {node.host}:{node.port} was unsuccessful")
+                sys.exit(1)
+            node.reader_task = asyncio.create_task(self.keep_linked(node, reader))
+
+        try:
+            self.server = await asyncio.start_server(
+                self.handle_client, self.cfg.get("host", "0.0.0.0"), self.cfg["port"],
+                backlog=int(self.sockopts["backlog"]))
+        except OSError:
+            print(f"gateway.py: Binding to port {self.cfg['port']} was unsuccessful")
+            sys.exit(1)
+        await self.server.serve_forever()
+
+    def start(self):
+        raise_fd_limit()
+        asyncio.run(self.serve())
+
+
+def main():
+    if "--config" not in sys.argv:
+        print("gateway.py: Configuration not provided")
+        sys.exit(1)
+
+    idx = sys.argv.index("--config")
+    if idx + 1 >= len(sys.argv):
+        print("gateway.py: Configuration not provided")
+        sys.exit(1)
+
+    path = sys.argv[idx + 1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cfg = json.load(f)
+    except FileNotFoundError:
+        print(f"gateway.py: File {path} does not exist")
+        sys.exit(1)
+
+    if not cfg.get("nodes"):
+        print("gateway.py: No game nodes configured")
+        sys.exit(1)
+
+    try:
+        Gateway(cfg).start()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+# =============================
+# FILE: globalboard.py
+# =============================
+# Global score table in shared memory: every game in every worker adds
+# its final scores, and any process on the host can read the top K by
+# attaching to the segment by name.
+#
+# Layout (all integers little-endian):
+#   header   : magic "TQBOARD1", u32 capacity, u32 stripes
+#   seqs     : u64 per stripe, odd while a writer is inside the stripe
+#   records  : capacity x [u64 key hash][i64 points][u32 games][u32 wins]
+#              [32 bytes username, utf-8, NUL padded]
+#
+# The table is split into stripes of capacity / stripes slots. A username
+# hashes (blake2b, the same in every process) to one stripe and probes
+# linearly inside it, so one lock per stripe is enough for writers.
+# Readers take no lock: they copy a stripe and retry if its sequence
+# number moved (a seqlock).
+#
+# Writers lock a stripe with fcntl.lockf on its byte of a lock file next
+# to the segment (<name>.lock), plus a thread lock inside the process. Any
+# process that opens the board by name takes part, and the kernel drops a
+# process's locks when it dies, so a worker killed mid-write cannot block
+# the others (its stripe's sequence number stays odd until the next write).
+# Without fcntl (Windows) only threads of one process are excluded.
+#
+# Game loops do not write themselves: post() queues a finished game for a
+# writer thread, and drain() waits for it at shutdown. The segment
+# outlives the server, so the board keeps counting across games until
+# "reset".
+#
+#   python globalboard.py top --name trivia_global -k 10
+#   python globalboard.py reset --name trivia_global
+
+import argparse
+import hashlib
+import heapq
+import os
+import queue
+import struct
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+try:
+    import fcntl
+except ImportError:            # Windows: in-process locking only
+    fcntl = None
+
+MAGIC = b"TQBOARD1"
+HEADER = struct.Struct("<8sII")
+SEQ = struct.Struct("<Q")
+RECORD = struct.Struct("<QqII32s")
+NAME_BYTES = 32
+LOCK_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+def key_hash(username):
+    h = int.from_bytes(hashlib.blake2b(username.encode("utf-8"), digest_size=8).digest(),
+                       "little")
+    return h or 1                  # 0 marks an empty slot
+
+
+def name_bytes(username):
+    # Cut on a character boundary
+    return username.encode("utf-8")[:NAME_BYTES].decode("utf-8", "ignore").encode("utf-8")
+
+
+class GlobalBoard:
+    def __init__(self, shm, create=False, capacity=0, stripes=0):
+        self.shm = shm
+        self.buf = shm.buf
+        if create:
+            HEADER.pack_into(self.buf, 0, MAGIC, capacity, stripes)
+        magic, self.capacity, self.stripes = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"shared memory {shm.name} is not a global board")
+        self.per_stripe = self.capacity // self.stripes
+        self.seq_at = HEADER.size
+        self.data_at = self.seq_at + SEQ.size * self.stripes
+        self.locks = None          # set by open(); attach() is read-only
+        self.lock_fd = None
+        self.writer = None         # (pid, thread, queue) of the post() writer
+
+    @classmethod
+    def open(cls, name, capacity=65536, stripes=16):
+        """Create the segment, or reuse one left by an earlier server."""
+        stripes = max(1, int(stripes))
+        capacity = max(stripes, int(capacity) // stripes * stripes)
+        size = HEADER.size + SEQ.size * stripes + RECORD.size * capacity
+        try:
+            shm = shared_memory.SharedMemory(name, create=True, size=size)
+            board = cls(shm, True, capacity, stripes)
+        except FileExistsError:
+            shm = shared_memory.SharedMemory(name)
+            board = cls(shm)
+        # The table is meant to outlive this process: only "reset" unlinks it
+        resource_tracker.unregister(shm._name, "shared_memory")
+        board.locks = [threading.Lock() for _ in range(board.stripes)]
+        if fcntl is not None:
+            board.lock_fd = os.open(lock_path(name), os.O_RDWR | os.O_CREAT, 0o600)
+        return board
+
+    @classmethod
+    def attach(cls, name):
+        """Read-only view from any process (top, len)."""
+        shm = shared_memory.SharedMemory(name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm)
+
+    # =============================
+    # Writes
+    # =============================
+    def add_result(self, username, points, won=False):
+        """Add one finished game. Returns False if the user's stripe is full."""
+        if self.locks is None:
+            raise RuntimeError("global board was attached read-only")
+        h = key_hash(username)
+        stripe = h % self.stripes
+        home = (h // self.stripes) % self.per_stripe
+        base = self.data_at + RECORD.size * self.per_stripe * stripe
+        name = name_bytes(username)
+        seq_at = self.seq_at + SEQ.size * stripe
+        buf = self.buf
+
+        with self.locks[stripe]:
+            if self.lock_fd is not None:
+                fcntl.lockf(self.lock_fd, fcntl.LOCK_EX, 1, stripe)
+            try:
+                # A writer that died mid-update left the sequence odd
+                seq = SEQ.unpack_from(buf, seq_at)[0] | 1
+                SEQ.pack_into(buf, seq_at, seq)
+                try:
+                    for i in range(self.per_stripe):
+                        at = base + RECORD.size * ((home + i) % self.per_stripe)
+                        rh, pts, games, wins, rname = RECORD.unpack_from(buf, at)
+                        if rh == 0:
+                            RECORD.pack_into(buf, at, h, points, 1, int(won), name)
+                            return True
+                        if rh == h and rname.rstrip(b"\0") == name:
+                            RECORD.pack_into(buf, at, h, pts + points, games + 1,
+                                             wins + int(won), rname)
+                            return True
+                    return False
+                finally:
+                    SEQ.pack_into(buf, seq_at, seq + 1)
+            finally:
+                if self.lock_fd is not None:
+                    fcntl.lockf(self.lock_fd, fcntl.LOCK_UN, 1, stripe)
+
+    # =============================
+    # Background writes
+    # =============================
+    def post(self, results, on_full=None):
+        """Queue one game's [(username, points, won)] for the writer thread;
+        on_full() is called for each row whose stripe was full."""
+        if self.writer is None or self.writer[0] != os.getpid():
+            q = queue.SimpleQueue()    # a forked child starts its own writer
+            t = threading.Thread(target=self.write_posted, args=(q,), daemon=True)
+            self.writer = (os.getpid(), t, q)
+            t.start()
+        self.writer[2].put((results, on_full))
+
+    def write_posted(self, q):
+        while True:
+            item = q.get()
+            if item is None:
+                return
+            results, on_full = item
+            for username, points, won in results:
+                if not self.add_result(username, points, won) and on_full:
+                    on_full()
+
+    def drain(self, timeout=5.0):
+        """Wait for posted games to be written."""
+        if self.writer is None or self.writer[0] != os.getpid():
+            return
+        _, t, q = self.writer
+        self.writer = None
+        q.put(None)
+        t.join(timeout)
+
+    # =============================
+    # Lock-free reads
+    # =============================
+    def stripe_snapshot(self, stripe, retries=100):
+        seq_at = self.seq_at + SEQ.size * stripe
+        start = self.data_at + RECORD.size * self.per_stripe * stripe
+        end = start + RECORD.size * self.per_stripe
+        for _ in range(retries):
+            before = SEQ.unpack_from(self.buf, seq_at)[0]
+            if before % 2 == 0:
+                chunk = bytes(self.buf[start:end])
+                if SEQ.unpack_from(self.buf, seq_at)[0] == before:
+                    return chunk
+            time.sleep(0)
+        # A writer died inside the stripe: take it as it is
+        return bytes(self.buf[start:end])
+
+    def entries(self):
+        """(username, points, games, wins) for every player on the board."""
+        for stripe in range(self.stripes):
+            for h, points, games, wins, name in RECORD.iter_unpack(self.stripe_snapshot(stripe)):
+                if h:
+                    yield name.rstrip(b"\0").decode("utf-8", "replace"), points, games, wins
+
+    def top(self, k=10):
+        """Top k by points, ties by name."""
+        return heapq.nsmallest(k, self.entries(), key=lambda e: (-e[1], e[0]))
+
+    def __len__(self):
+        return sum(1 for _ in self.entries())
+
+    def close(self):
+        self.drain()
+        self.buf = None
+        self.shm.close()
+        if self.lock_fd is not None:
+            os.close(self.lock_fd)
+            self.lock_fd = None
+
+    def unlink(self):
+        """Remove the segment for every process."""
+        # unlink() unregisters from the resource tracker, open/attach already did
+        resource_tracker.register(self.shm._name, "shared_memory")
+        self.shm.unlink()
+        try:
+            os.unlink(lock_path(self.shm.name))
+        except FileNotFoundError:
+            pass
+
+
+def lock_path(name):
+    return os.path.join(LOCK_DIR, f"{name.lstrip('/')}.lock")
+
+
+# =============================
+# One board per name and process (forked workers inherit it)
+# =============================
+_BOARDS = {}
+
+
+def open_board(cfg):
+    name = cfg.get("global_board")
+    if not name:
+        return None
+    board = _BOARDS.get(name)
+    if board is None:
+        board = _BOARDS[name] = GlobalBoard.open(
+            name, int(cfg.get("global_board_capacity", 65536)),
+            int(cfg.get("global_board_stripes", 16)))
+    return board
+
+
+def drain_boards(timeout=5.0):
+    """Wait for every board's posted games (before a process exits)."""
+    for board in list(_BOARDS.values()):
+        board.drain(timeout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Read or reset the global leaderboard")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    t = sub.add_parser("top", help="print the top players")
+    t.add_argument("--name", default="trivia_global")
+    t.add_argument("-k", type=int, default=10)
+
+    r = sub.add_parser("reset", help="remove the shared memory segment")
+    r.add_argument("--name", default="trivia_global")
+
+    args = parser.parse_args(argv)
+    try:
+        board = GlobalBoard.attach(args.name)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"globalboard.py: {e}")
+        sys.exit(1)
+
+    if args.cmd == "reset":
+        board.unlink()
+        board.close()
+        print(f"globalboard.py: removed {args.name}")
+        return
+
+    for place, (name, points, games, wins) in enumerate(board.top(args.k), 1):
+        print(f"{place}. {name}: {points} points, {games} games, {wins} wins")
+    board.close()
+
+
+if __name__ == "__main__":
+    main()
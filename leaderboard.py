@@ -0,0 +1,167 @@
+# =============================
+# FILE: leaderboard.py
+# =============================
+# Incremental standings for TriviaServer.
+#
+# Players live in score buckets (dicts, so moving a player is O(1)) and a
+# Fenwick tree counts players per score, so a score change, "rank of X"
+# and "how many players are ahead" cost O(log n) instead of a full sort.
+# A bucket is sorted by username only when a read walks it (top, slice,
+# standings), and that order is kept until the bucket changes again.
+# Ordering and tie numbering match the original final_ranking(): points
+# descending, then username; equal points share a place.
+
+class Fenwick:
+    """Counts per non-negative integer score; grows on demand."""
+
+    def __init__(self, size=64):
+        self.tree = [0] * (size + 1)
+
+    def _grow(self, score):
+        size = len(self.tree) - 1
+        if score < size:
+            return
+        while size <= score:
+            size *= 2
+        counts = [self.count_at(i) for i in range(len(self.tree) - 1)]
+        self.tree = [0] * (size + 1)
+        for i, c in enumerate(counts):
+            if c:
+                self.add(i, c)
+
+    def add(self, score, delta):
+        self._grow(score)
+        i = score + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, score):
+        """Number of players with points <= score."""
+        i = min(score + 1, len(self.tree) - 1)
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def count_at(self, score):
+        return self.prefix(score) - (self.prefix(score - 1) if score > 0 else 0)
+
+
+class Leaderboard:
+    def __init__(self):
+        self.entries = {}      # key -> [username, seq, points]
+        self.buckets = {}      # points -> {key: (username, seq)}
+        self.ordered = {}      # points -> sorted [(username, seq)], built on read
+        self._scores = []      # distinct scores, descending; None when stale
+        self.counts = Fenwick()
+        self.seq = 0           # tie-breaker for equal usernames
+
+    def __len__(self):
+        return len(self.entries)
+
+    # =============================
+    # Updates
+    # =============================
+    def add(self, key, username, points=0):
+        self.seq += 1
+        self.entries[key] = [username, self.seq, points]
+        self._insert(key, username, self.seq, points)
+
+    def add_points(self, key, delta=1):
+        entry = self.entries[key]
+        username, seq, old = entry
+        self._remove(key, old)
+        entry[2] = old + delta
+        self._insert(key, username, seq, old + delta)
+
+    def remove(self, key):
+        _, _, points = self.entries.pop(key)
+        self._remove(key, points)
+
+    def _insert(self, key, username, seq, points):
+        bucket = self.buckets.get(points)
+        if bucket is None:
+            bucket = self.buckets[points] = {}
+            self._scores = None
+        bucket[key] = (username, seq)
+        self.ordered.pop(points, None)
+        self.counts.add(points, 1)
+
+    def _remove(self, key, points):
+        bucket = self.buckets[points]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[points]
+            self._scores = None
+        self.ordered.pop(points, None)
+        self.counts.add(points, -1)
+
+    def _names(self, points):
+        ordered = self.ordered.get(points)
+        if ordered is None:
+            ordered = self.ordered[points] = sorted(self.buckets[points].values())
+        return ordered
+
+    @property
+    def scores(self):
+        """Distinct scores present, highest first."""
+        if self._scores is None:
+            self._scores = sorted(self.buckets, reverse=True)
+        return self._scores
+
+    # =============================
+    # Queries
+    # =============================
+    def points(self, key):
+        return self.entries[key][2]
+
+    def ahead_of(self, points):
+        """Number of players with strictly more points."""
+        return len(self.entries) - self.counts.prefix(points)
+
+    def rank(self, key):
+        """Place of one player (ties share a place)."""
+        return self.ahead_of(self.entries[key][2]) + 1
+
+    def tie_groups(self):
+        """Yield (place, points, [usernames]) from first place down."""
+        place = 1
+        for points in self.scores:
+            names = [name for name, _ in self._names(points)]
+            yield place, points, names
+            place += len(names)
+
+    def top(self, k):
+        """First k standings as (place, username, points)."""
+        return self.slice(0, k)
+
+    def slice(self, start, stop):
+        """Standings start..stop-1 (0-based); whole tie groups outside the
+        range are skipped without being read."""
+        out = []
+        before = 0             # players in higher buckets
+        for points in self.scores:
+            if before >= stop:
+                break
+            size = len(self.buckets[points])
+            if before + size > start:
+                lo = max(start - before, 0)
+                hi = min(stop - before, size)
+                for name, _ in self._names(points)[lo:hi]:
+                    out.append((before + 1, name, points))
+            before += size
+        return out
+
+    def standings(self):
+        """Every player as (place, username, points), in order."""
+        for place, points, names in self.tie_groups():
+            for name in names:
+                yield place, name, points
+
+    def leaders(self):
+        """Usernames sharing first place, sorted."""
+        if not self.scores:
+            return []
+        return [name for name, _ in self._names(self.scores[0])]
@@ -0,0 +1,191 @@
+# =============================
+# FILE: metrics.py
+# =============================
+# Counters and histograms for a running server, served in the Prometheus
+# text format on an optional local HTTP port ("metrics_port").
+#
+# Updates never take a shared lock: every thread writes into its own
+# shard (a plain dict) and a scrape adds the shards up. When a thread
+# ends its shard is folded into one "retired" dict, so per-connection
+# threads do not leave a shard each behind. Gauges are callables
+# evaluated at scrape time.
+
+import threading
+import weakref
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32)
+DURATION_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+def _value(v):
+    return repr(float(v)) if isinstance(v, float) else str(v)
+
+
+def _add_into(total, items):
+    for key, v in items:
+        if isinstance(v, list):
+            acc = total.setdefault(key, [0] * (len(v) - 1) + [0.0])
+            for i, x in enumerate(v):
+                acc[i] += x
+        else:
+            total[key] = total.get(key, 0) + v
+
+
+class _ThreadAlive:
+    """Kept in a thread's locals; freed (and finalized) when the thread ends."""
+
+
+class Metrics:
+    def __init__(self):
+        self.local = threading.local()
+        self.shards = []
+        self.shards_lock = threading.Lock()    # only when a thread starts or ends
+        self.retired = {}      # totals of threads that have ended
+        self.meta = {}         # name -> (kind, help, buckets)
+        self.gauges = {}       # name -> callable returning a number
+
+    # =============================
+    # Registration
+    # =============================
+    def counter(self, name, help_text):
+        self.meta[name] = ("counter", help_text, None)
+
+    def histogram(self, name, help_text, buckets):
+        self.meta[name] = ("histogram", help_text, tuple(buckets))
+
+    def gauge(self, name, help_text, fn):
+        self.meta[name] = ("gauge", help_text, None)
+        self.gauges[name] = fn
+
+    # =============================
+    # Hot path
+    # =============================
+    def _shard(self):
+        shard = getattr(self.local, "shard", None)
+        if shard is None:
+            shard = self.local.shard = {}
+            self.local.alive = alive = _ThreadAlive()
+            weakref.finalize(alive, self._retire, shard)
+            with self.shards_lock:
+                self.shards.append(shard)
+        return shard
+
+    def _retire(self, shard):
+        # Runs as the thread's locals are cleared: its shard takes no more writes
+        with self.shards_lock:
+            self.shards.remove(shard)
+            _add_into(self.retired, shard.items())
+
+    def inc(self, name, n=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        shard = self._shard()
+        shard[key] = shard.get(key, 0) + n
+
+    def observe(self, name, value, **labels):
+        buckets = self.meta[name][2]
+        key = (name, tuple(sorted(labels.items())))
+        shard = self._shard()
+        counts = shard.get(key)
+        if counts is None:
+            counts = shard[key] = [0] * (len(buckets) + 1) + [0.0]
+        counts[bisect_left(buckets, value)] += 1
+        counts[-1] += value
+
+    # =============================
+    # Scrape
+    # =============================
+    def collect(self):
+        """{(name, labels): int or [bucket counts..., sum]} over all shards."""
+        total = {}
+        with self.shards_lock:
+            shards = list(self.shards)
+            _add_into(total, self.retired.items())
+        for shard in shards:
+            while True:
+                try:
+                    items = list(shard.items())
+                    break
+                except RuntimeError:   # a writer added a key meanwhile
+                    continue
+            _add_into(total, items)
+        return total
+
+    def value(self, name, **labels):
+        return self.collect().get((name, tuple(sorted(labels.items()))), 0)
+
+    def render(self):
+        values = self.collect()
+        out = []
+        for name, (kind, help_text, buckets) in self.meta.items():
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            if kind == "gauge":
+                try:
+                    out.append(f"{name} {_value(self.gauges[name]())}")
+                except Exception:
+                    pass
+                continue
+            rows = sorted((k[1], v) for k, v in values.items() if k[0] == name)
+            for labels, v in rows:
+                if kind == "counter":
+                    out.append(f"{name}{_labels(labels)} {_value(v)}")
+                    continue
+                cumulative = 0
+                for le, c in zip(list(buckets) + ["+Inf"], v):
+                    cumulative += c
+                    out.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+                out.append(f"{name}_sum{_labels(labels)} {_value(v[-1])}")
+                out.append(f"{name}_count{_labels(labels)} {cumulative}")
+        return "\n".join(out) + "\n"
+
+    # =============================
+    # HTTP endpoint
+    # =============================
+    def serve(self, port, host="127.0.0.1"):
+        """Serve GET /metrics from a daemon thread; returns the HTTP server."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        httpd = ThreadingHTTPServer((host, port), Handler)
+        httpd.daemon_threads = True
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        return httpd
+
+
+# One registry per process, like Stats is one per lobby
+METRICS = Metrics()
+METRICS.counter("trivia_connections_total", "Connections accepted")
+METRICS.counter("trivia_disconnections_total", "Connections closed")
+METRICS.counter("trivia_messages_in_total", "Messages received by type")
+METRICS.counter("trivia_messages_out_total", "Messages queued to players by type")
+METRICS.counter("trivia_bytes_sent_total", "Bytes handed to sockets")
+METRICS.counter("trivia_evictions_total", "Players dropped for a full send queue")
+METRICS.histogram("trivia_broadcast_seconds",
+                  "Time to encode and queue one message for every player",
+                  DURATION_BUCKETS)
+METRICS.histogram("trivia_answer_latency_seconds",
+                  "Time from QUESTION to each ANSWER", LATENCY_BUCKETS)
+METRICS.histogram("trivia_final_ranking_seconds",
+                  "Time spent building the full standings text", DURATION_BUCKETS)
@@ -0,0 +1,165 @@
+# =============================
+# FILE: muxlink.py
+# =============================
+# The gateway <-> game node link: many player connections over one TCP
+# connection (see gateway.py).
+#
+# Record: [u32 payload length][u32 channel][u8 kind][payload]
+#   OPEN   gateway -> node   a player connected (payload: peer address)
+#   DATA   both ways         raw protocol bytes of that player's connection
+#   CLOSE  both ways         the player's connection is gone
+#   LOAD   node -> gateway   JSON {"players", "waiting", "room_size"}
+#
+# On the node every channel looks like a socket (Channel), so the normal
+# per-connection path (Outbox, handle_client) serves it unchanged.
+
+import json
+import queue
+import socket
+import struct
+import threading
+
+LINK_RECORD = struct.Struct("<IIB")
+OPEN, DATA, CLOSE, LOAD = 1, 2, 3, 4
+LOAD_CHANNEL = 0           # channel ids start at 1
+
+
+def encode_record(cid, kind, payload=b""):
+    return LINK_RECORD.pack(len(payload), cid, kind) + payload
+
+
+class LinkDecoder:
+    """Incremental decoder: feed() bytes, get (channel, kind, payload)s."""
+
+    def __init__(self):
+        self.buf = bytearray()
+
+    def feed(self, data):
+        buf = self.buf
+        buf += data
+        out = []
+        pos = 0
+        while len(buf) - pos >= LINK_RECORD.size:
+            length, cid, kind = LINK_RECORD.unpack_from(buf, pos)
+            end = pos + LINK_RECORD.size + length
+            if end > len(buf):
+                break
+            out.append((cid, kind, bytes(buf[pos + LINK_RECORD.size:end])))
+            pos = end
+        del buf[:pos]
+        return out
+
+
+# =============================
+# Node side
+# =============================
+class Channel:
+    """Socket-like end of one player connection carried by a Link."""
+
+    def __init__(self, link, cid):
+        self.link = link
+        self.cid = cid
+        self.inbox = queue.SimpleQueue()   # bytes from the player, b"" = closed
+        self.closed = False
+
+    def feed(self, data):
+        self.inbox.put(data)
+
+    def recv(self, bufsize):
+        return self.inbox.get()
+
+    def sendall(self, data):
+        if self.closed:
+            raise OSError("channel closed")
+        self.link.send(self.cid, DATA, data)
+
+    def shutdown(self, how):
+        self.close()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.inbox.put(b"")
+        self.link.forget(self.cid)
+        try:
+            self.link.send(self.cid, CLOSE)
+        except OSError:
+            pass
+
+
+class Link:
+    """One gateway connection on a game node. on_open(channel, addr) is
+    called for every new player, from the link's reader thread."""
+
+    def __init__(self, sock, on_open, load=None, load_seconds=1.0):
+        self.sock = sock
+        self.on_open = on_open
+        self.load = load               # () -> dict for LOAD records
+        self.load_seconds = load_seconds
+        self.send_lock = threading.Lock()
+        self.channels = {}
+        self.closed = threading.Event()
+
+    def send(self, cid, kind, payload=b""):
+        record = encode_record(cid, kind, payload)
+        with self.send_lock:
+            self.sock.sendall(record)
+
+    def forget(self, cid):
+        self.channels.pop(cid, None)
+
+    def report_load(self):
+        while not self.closed.wait(self.load_seconds):
+            try:
+                self.send(LOAD_CHANNEL, LOAD, json.dumps(self.load()).encode("utf-8"))
+            except OSError:
+                break
+
+    def run(self):
+        decoder = LinkDecoder()
+        try:
+            if self.load is not None:
+                self.send(LOAD_CHANNEL, LOAD, json.dumps(self.load()).encode("utf-8"))
+                threading.Thread(target=self.report_load, daemon=True).start()
+            while True:
+                data = self.sock.recv(65536)
+                if not data:
+                    break
+                for cid, kind, payload in decoder.feed(data):
+                    if kind == OPEN:
+                        ch = self.channels[cid] = Channel(self, cid)
+                        self.on_open(ch, (payload.decode("utf-8", "replace"), cid))
+                    elif kind == DATA:
+                        ch = self.channels.get(cid)
+                        if ch is not None and payload:
+                            ch.feed(payload)
+                    elif kind == CLOSE:
+                        ch = self.channels.pop(cid, None)
+                        if ch is not None:
+                            ch.feed(b"")
+        except OSError:
+            pass
+
+        # Gateway gone: every player on this link disconnects
+        self.closed.set()
+        for ch in list(self.channels.values()):
+            ch.closed = True
+            ch.feed(b"")
+        self.channels.clear()
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+def serve_links(listener, on_open, load=None, load_seconds=1.0):
+    """Accept gateway links forever (run in a thread)."""
+    while True:
+        try:
+            sock, _ = listener.accept()
+        except OSError:
+            break
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        link = Link(sock, on_open, load, load_seconds)
+        threading.Thread(target=link.run, daemon=True).start()
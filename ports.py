@@ -0,0 +1,20 @@
+# =============================
+# FILE: ports.py
+# =============================
+# Wait for a server's TCP port, for tools, benchmarks and tests that
+# start a server and then connect to it.
+
+import socket
+import time
+
+
+def wait_for_port(host, port, timeout=10.0):
+    """True once (host, port) accepts a connection, False after timeout."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            return True
+        except OSError:
+            time.sleep(0.05)
+    return False
@@ -0,0 +1,205 @@
+# =============================
+# FILE: protocol.py
+# =============================
+# Wire formats shared by server, clients and tools.
+#
+# "json"   : one JSON object per line (the original protocol, works over nc)
+# "binary" : [4-byte big-endian length][1-byte message type][payload]
+#            where length counts the type byte plus payload and the payload
+#            is the message without "message_type", encoded by a codec.
+#
+# A client asks for binary by adding "wire": "binary" (and optionally
+# "codec") to its HI, which is always sent as a JSON line. The server
+# answers READY in the negotiated format. Frames are capped below 16 MiB,
+# so the first byte of a binary frame is always NUL and can never start a
+# JSON line; FrameDecoder uses that to read either format on one stream.
+
+import json
+import struct
+
+ENC = "utf-8"
+
+MAX_FRAME = (1 << 24) - 1
+HEADER = struct.Struct("!IB")
+
+MESSAGE_TYPES = [
+    "HI", "READY", "QUESTION", "ANSWER", "RESULT",
+    "LEADERBOARD", "FINISHED", "BYE", "STANDINGS",
+]
+TYPE_CODES = {name: i for i, name in enumerate(MESSAGE_TYPES, 1)}
+TYPE_NAMES = {i: name for name, i in TYPE_CODES.items()}
+
+
+# =============================
+# Payload codecs
+# =============================
+class JsonCodec:
+    name = "json"
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(",", ":")).encode(ENC)
+
+    def loads(self, data):
+        return json.loads(data.decode(ENC)) if data else {}
+
+
+class MsgpackCodec:
+    name = "msgpack"
+
+    def __init__(self, msgpack):
+        self.msgpack = msgpack
+
+    def dumps(self, obj):
+        return self.msgpack.packb(obj, use_bin_type=True)
+
+    def loads(self, data):
+        return self.msgpack.unpackb(data, raw=False) if data else {}
+
+
+CODECS = {"json": JsonCodec()}
+
+try:
+    import msgpack
+    CODECS["msgpack"] = MsgpackCodec(msgpack)
+except ImportError:
+    msgpack = None
+
+
+def register_codec(codec):
+    """Make a codec (name/dumps/loads) available for binary framing."""
+    CODECS[codec.name] = codec
+    _WIRES.pop(("binary", codec.name), None)
+
+
+# =============================
+# Wire formats (encoders)
+# =============================
+class JsonLines:
+    name = "json"
+    binary = False
+
+    def encode(self, obj):
+        return (json.dumps(obj) + "\n").encode(ENC)
+
+    def result_frame(self, correct, feedback):
+        """RESULT as shared head/tail pieces around the feedback, for
+        vectored sends. Same bytes as encode()."""
+        return [RESULT_HEAD[correct], json.dumps(feedback).encode(ENC), FRAME_TAIL]
+
+    def text_head(self, mtype, key, shared):
+        """Shared opening of a message whose obj[key] starts with `shared`."""
+        return json.dumps({"message_type": mtype, key: shared})[:-2].encode(ENC)
+
+    def text_frame(self, head, obj, key, shared, personal):
+        """Finish a text_head() frame: obj[key] is shared + personal, the
+        other fields of obj follow. Same bytes as encode() on the full obj."""
+        tail = json.dumps(personal)[1:]
+        rest = {k: v for k, v in obj.items() if k not in ("message_type", key)}
+        tail += ", " + json.dumps(rest)[1:] if rest else "}"
+        return [head, (tail + "\n").encode(ENC)]
+
+
+class BinaryFrames:
+    binary = True
+
+    def __init__(self, codec):
+        self.codec = codec
+        self.name = "binary/" + codec.name
+
+    def encode(self, obj):
+        body = {k: v for k, v in obj.items() if k != "message_type"}
+        payload = self.codec.dumps(body)
+        if len(payload) + 1 > MAX_FRAME:
+            raise ValueError("frame too large")
+        return HEADER.pack(len(payload) + 1, TYPE_CODES[obj["message_type"]]) + payload
+
+    def result_frame(self, correct, feedback):
+        return [self.encode({"message_type": "RESULT", "correct": correct,
+                             "feedback": feedback})]
+
+    def text_head(self, mtype, key, shared):
+        return None
+
+    def text_frame(self, head, obj, key, shared, personal):
+        full = dict(obj)
+        full[key] = shared + personal
+        return [self.encode(full)]
+
+
+# RESULT pieces for the JSON-lines wire, byte-for-byte json.dumps output
+RESULT_HEAD = {
+    True: b'{"message_type": "RESULT", "correct": true, "feedback": ',
+    False: b'{"message_type": "RESULT", "correct": false, "feedback": ',
+}
+FRAME_TAIL = b"}\n"
+
+JSON_LINES = JsonLines()
+_WIRES = {}
+
+
+def get_wire(name="json", codec="json"):
+    """Shared wire instance, or None if the combination is unsupported."""
+    if name in (None, "json"):
+        return JSON_LINES
+    if name != "binary" or codec not in CODECS:
+        return None
+    key = (name, codec)
+    if key not in _WIRES:
+        _WIRES[key] = BinaryFrames(CODECS[codec])
+    return _WIRES[key]
+
+
+# =============================
+# Push-style decoder for either format
+# =============================
+class FrameDecoder:
+    def __init__(self, codec=None, strict=True):
+        self.buf = bytearray()
+        self.codec = codec or CODECS["json"]
+        self.strict = strict       # False: skip malformed JSON lines
+        self.saw_binary = False
+
+    def feed(self, data):
+        """Add received bytes; return the list of complete messages."""
+        self.buf += data
+        out = []
+        buf = self.buf
+        pos = 0
+        n = len(buf)
+
+        while pos < n:
+            if buf[pos] == 0:
+                if n - pos < HEADER.size:
+                    break
+                length, code = HEADER.unpack_from(buf, pos)
+                end = pos + 4 + length
+                if end > n:
+                    break
+                msg = self.codec.loads(bytes(buf[pos + HEADER.size:end]))
+                if not isinstance(msg, dict):
+                    del buf[:end]
+                    raise ValueError("binary frame payload is not an object")
+                msg["message_type"] = TYPE_NAMES.get(code, code)
+                out.append(msg)
+                self.saw_binary = True
+                pos = end
+            else:
+                nl = buf.find(b"\n", pos)
+                if nl < 0:
+                    break
+                line = bytes(buf[pos:nl]).strip()
+                pos = nl + 1
+                if not line:
+                    continue
+                try:
+                    msg = json.loads(line.decode(ENC))
+                    if not isinstance(msg, dict):
+                        raise ValueError("JSON line is not an object")
+                    out.append(msg)
+                except ValueError:
+                    if self.strict:
+                        del buf[:pos]
+                        raise
+
+        del buf[:pos]
+        return out
@@ -0,0 +1,231 @@
+# =============================
+# FILE: questionbank.py
+# =============================
+# Pre-generated question bank on disk, read through mmap.
+#
+# Layout (all integers little-endian):
+#   header   : magic "TQBANK1\0", u64 offset of the type table
+#   data     : records "short\tanswer", back to back, per type
+#   indexes  : per type, count + 1 u64 absolute offsets into data
+#   types    : u32 count, then per type u16 name length, name (utf-8),
+#              u64 record count, u64 index offset
+#
+# Question i of a type is two index reads and one slice, so a server only
+# touches the pages it deals from, and every process that opens the same
+# file shares them through the page cache.
+#
+# Build a bank:
+#   python questionbank.py build bank.qbank --count 1000000 --seed 7
+
+import argparse
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+import threading
+from array import array
+
+from questions import Question, generate_batch
+from solvers import MATHEMATICS, NETWORK_BROADCAST, ROMAN_NUMERALS, USABLE_IP
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None   # Windows: the cursor file is not locked
+
+MAGIC = b"TQBANK1\0"
+HEADER = struct.Struct("<8sQ")
+OFFSETS = struct.Struct("<QQ")
+ALL_TYPES = [MATHEMATICS, ROMAN_NUMERALS, USABLE_IP, NETWORK_BROADCAST]
+BUILD_CHUNK = 65536
+
+
+# =============================
+# Builder
+# =============================
+def build_bank(path, count, qtypes=ALL_TYPES, seed=None):
+    """Write `count` questions of each type to `path`."""
+    try:
+        import numpy as np
+        rng = np.random.default_rng(seed)
+    except ImportError:
+        rng = random.Random(seed)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, 0))
+        offsets = {}
+        for qtype in qtypes:
+            index = offsets[qtype] = array("Q", [f.tell()])
+            done = 0
+            while done < count:
+                n = min(BUILD_CHUNK, count - done)
+                base = f.tell()
+                data = bytearray()
+                for q in generate_batch(qtype, n, rng):
+                    data += f"{q.short}\t{q.answer}".encode("utf-8")
+                    index.append(base + len(data))
+                f.write(data)
+                done += n
+
+        index_at = {}
+        for qtype in qtypes:
+            index_at[qtype] = f.tell()
+            index = offsets[qtype]
+            if sys.byteorder != "little":
+                index.byteswap()
+            index.tofile(f)
+
+        table_at = f.tell()
+        f.write(struct.pack("<I", len(qtypes)))
+        for qtype in qtypes:
+            name = qtype.encode("utf-8")
+            f.write(struct.pack("<H", len(name)) + name)
+            f.write(struct.pack("<QQ", count, index_at[qtype]))
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, table_at))
+    os.replace(tmp, path)
+
+
+# =============================
+# Reader
+# =============================
+class QuestionBank:
+    """Random access to a bank file: bank.get(qtype, i) -> Question."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, table_at = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or not HEADER.size <= table_at < len(self.mm):
+            self.mm.close()
+            raise ValueError(f"{path} is not a question bank")
+
+        self.types = {}        # qtype -> (count, index offset)
+        pos = table_at
+        (n_types,) = struct.unpack_from("<I", self.mm, pos)
+        pos += 4
+        for _ in range(n_types):
+            (n,) = struct.unpack_from("<H", self.mm, pos)
+            name = self.mm[pos + 2:pos + 2 + n].decode("utf-8")
+            pos += 2 + n
+            self.types[name] = struct.unpack_from("<QQ", self.mm, pos)
+            pos += 16
+
+    def count(self, qtype):
+        return self.types[qtype][0] if qtype in self.types else 0
+
+    def get(self, qtype, i):
+        n, index_at = self.types[qtype]
+        if not 0 <= i < n:
+            raise IndexError(i)
+        start, end = OFFSETS.unpack_from(self.mm, index_at + 8 * i)
+        short, answer = self.mm[start:end].decode("utf-8").split("\t")
+        return Question(short, answer)
+
+    def close(self):
+        self.mm.close()
+
+
+# =============================
+# Dealing without repeats
+# =============================
+class BankPool:
+    """QuestionPool-compatible dealer over a QuestionBank.
+
+    The next unused index per type lives in a small JSON cursor file, so
+    later games (and other server processes) continue where the last one
+    stopped. Indexes are reserved `block` at a time under a file lock.
+    When a type runs out the cursor wraps to 0 and questions repeat.
+    A known type missing from the bank is generated by `fallback` (a
+    QuestionPool); an unknown type is dealt as network/broadcast, like
+    generate_batch does, from the bank if it has those.
+    """
+
+    def __init__(self, bank, cursor_path, block=64, fallback=None):
+        self.bank = bank
+        self.cursor_path = cursor_path
+        self.block = max(1, int(block))
+        self.lock = threading.Lock()
+        self.reserved = {}     # qtype -> [next, stop)
+        self.fallback = fallback
+
+    def reserve(self, qtype):
+        n = self.bank.count(qtype)
+        fd = os.open(self.cursor_path, os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(fd, "r+", encoding="utf-8") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            text = f.read()
+            cursors = json.loads(text) if text.strip() else {}
+            start = cursors.get(qtype, 0)
+            if start >= n:
+                print(f"server.py: question bank exhausted for {qtype}, starting over")
+                start = 0
+            stop = min(start + self.block, n)
+            cursors[qtype] = stop
+            f.seek(0)
+            f.truncate()
+            json.dump(cursors, f)
+            f.flush()
+        return [start, stop]
+
+    def next(self, qtype):
+        if self.bank.count(qtype) == 0:
+            # A known type must keep its own questions: its label and
+            # solver would not match a network/broadcast question
+            if qtype in ALL_TYPES or self.bank.count(NETWORK_BROADCAST) == 0:
+                if self.fallback is None:
+                    from questions import QuestionPool
+                    self.fallback = QuestionPool()
+                return self.fallback.next(qtype)
+            qtype = NETWORK_BROADCAST   # same fallback as generate_batch
+        with self.lock:
+            r = self.reserved.get(qtype)
+            if r is None or r[0] >= r[1]:
+                r = self.reserved[qtype] = self.reserve(qtype)
+            i = r[0]
+            r[0] += 1
+        return self.bank.get(qtype, i)
+
+
+# =============================
+# CLI
+# =============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect a question bank")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    b = sub.add_parser("build", help="generate a bank file")
+    b.add_argument("path")
+    b.add_argument("--count", type=int, default=100000, help="questions per type")
+    b.add_argument("--seed", type=int, default=None)
+    b.add_argument("--types", nargs="+", default=ALL_TYPES)
+
+    i = sub.add_parser("info", help="show question counts and a sample")
+    i.add_argument("path")
+
+    args = parser.parse_args(argv)
+    if args.cmd == "build":
+        build_bank(args.path, args.count, args.types, args.seed)
+        print(f"questionbank.py: wrote {args.count} x {len(args.types)} questions "
+              f"to {args.path} ({os.path.getsize(args.path)} bytes)")
+        return
+
+    try:
+        bank = QuestionBank(args.path)
+    except (OSError, ValueError) as e:
+        print(f"questionbank.py: {e}")
+        sys.exit(1)
+    for qtype, (n, _) in bank.types.items():
+        sample = bank.get(qtype, 0) if n else None
+        print(f"{qtype}: {n} questions, first: {sample}")
+    bank.close()
+
+
+if __name__ == "__main__":
+    main()
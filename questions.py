@@ -4,6 +4,16 @@
 # English comments only as requested.
 
 import random
+import threading
+from collections import deque, namedtuple
+
+from solvers import (MATHEMATICS, NETWORK_BROADCAST, ROMAN, ROMAN_NUMERALS,
+                     USABLE_HOSTS_STR, USABLE_IP, int_to_ip, solve)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # --- 1) Mathematics ---
 def generate_mathematics_question() -> str:
@@ -52,3 +62,205 @@ def generate_network_broadcast_question() -> str:
     c = random.randint(0, 255)
     d = random.randint(1, 254)
     return f"{a}.{b}.{c}.{d}/{prefix}"
+
+
+# =============================
+# Batch generation with answer keys
+# =============================
+# Each question carries its short text and the exact answer string the
+# server grades against, so nothing is parsed back at question time.
+# Distributions match the single-question generators above. NumPy is used
+# when installed; otherwise a pure-Python loop computes the same answers.
+
+Question = namedtuple("Question", "short answer")
+
+MATH_OPS = ["+"] * 3 + ["-"] * 3 + ["*"] + ["/"]
+USABLE_PREFIXES = [8, 16, 24, 25, 26, 27, 28, 29]
+NETWORK_PREFIXES = [16, 24, 25, 26, 27, 28]
+
+
+# --- pure Python ---
+def _math_batch_py(n, rng):
+    out = []
+    for _ in range(n):
+        n_operands = rng.randint(2, 5)
+        x = rng.randint(1, 100)
+        parts = [str(x)]
+        acc, sign, term = 0, 1, x
+        for _ in range(n_operands - 1):
+            op = rng.choice(MATH_OPS)
+            x = rng.randint(1, 100)
+            parts.append(op)
+            parts.append(str(x))
+            # * and / bind tighter: fold into the running term
+            if op == "*":
+                term *= x
+            elif op == "/":
+                term //= x
+            else:
+                acc += sign * term
+                sign = 1 if op == "+" else -1
+                term = x
+        out.append(Question(" ".join(parts), str(acc + sign * term)))
+    return out
+
+
+def _roman_batch_py(n, rng):
+    out = []
+    for _ in range(n):
+        number = rng.randint(1, 3999)
+        out.append(Question(ROMAN[number], str(number)))
+    return out
+
+
+def _usable_batch_py(n, rng):
+    out = []
+    for _ in range(n):
+        prefix = rng.choice(USABLE_PREFIXES)
+        a = rng.randint(1, 223)
+        b = rng.randint(0, 255)
+        c = rng.randint(0, 255)
+        d = rng.choice([0, 128]) if prefix >= 25 else 0
+        out.append(Question(f"{a}.{b}.{c}.{d}/{prefix}", USABLE_HOSTS_STR[prefix]))
+    return out
+
+
+def _network_batch_py(n, rng):
+    out = []
+    for _ in range(n):
+        prefix = rng.choice(NETWORK_PREFIXES)
+        a = rng.randint(1, 223)
+        b = rng.randint(0, 255)
+        c = rng.randint(0, 255)
+        d = rng.randint(1, 254)
+        ip = (a << 24) | (b << 16) | (c << 8) | d
+        mask = (0xffffffff << (32 - prefix)) & 0xffffffff
+        net = ip & mask
+        bcast = net | (~mask & 0xffffffff)
+        out.append(Question(f"{a}.{b}.{c}.{d}/{prefix}",
+                            f"{int_to_ip(net)} and {int_to_ip(bcast)}"))
+    return out
+
+
+# --- NumPy ---
+def _math_batch_np(n, rng):
+    n_operands = rng.integers(2, 6, n)
+    operands = rng.integers(1, 101, (n, 5)).astype(np.int64)
+    ops = rng.integers(0, len(MATH_OPS), (n, 4))
+
+    acc = np.zeros(n, dtype=np.int64)
+    sign = np.ones(n, dtype=np.int64)
+    term = operands[:, 0].copy()
+    for i in range(4):
+        active = i < n_operands - 1
+        op = ops[:, i]
+        x = operands[:, i + 1]
+        additive = active & (op < 6)
+        acc = np.where(additive, acc + sign * term, acc)
+        sign = np.where(additive, np.where(op < 3, 1, -1), sign)
+        folded = np.where(op == 6, term * x, term // x)
+        term = np.where(active, np.where(op < 6, x, folded), term)
+    answers = acc + sign * term
+
+    syms = np.array(MATH_OPS)[ops].tolist()
+    out = []
+    for k, xs, os_, ans in zip(n_operands.tolist(), operands.tolist(), syms, answers.tolist()):
+        parts = [str(xs[0])]
+        for i in range(k - 1):
+            parts.append(os_[i])
+            parts.append(str(xs[i + 1]))
+        out.append(Question(" ".join(parts), str(ans)))
+    return out
+
+
+def _roman_batch_np(n, rng):
+    numbers = rng.integers(1, 4000, n)
+    return [Question(ROMAN[x], str(x)) for x in numbers.tolist()]
+
+
+def _usable_batch_np(n, rng):
+    prefix = np.array(USABLE_PREFIXES)[rng.integers(0, len(USABLE_PREFIXES), n)]
+    abc = rng.integers([1, 0, 0], [224, 256, 256], (n, 3))
+    d = np.where(prefix >= 25, rng.integers(0, 2, n) * 128, 0)
+    return [
+        Question(f"{a}.{b}.{c}.{dd}/{p}", USABLE_HOSTS_STR[p])
+        for (a, b, c), dd, p in zip(abc.tolist(), d.tolist(), prefix.tolist())
+    ]
+
+
+def _network_batch_np(n, rng):
+    prefix = np.array(NETWORK_PREFIXES)[rng.integers(0, len(NETWORK_PREFIXES), n)]
+    octets = rng.integers([1, 0, 0, 1], [224, 256, 256, 255], (n, 4)).astype(np.uint64)
+    ip = (octets[:, 0] << 24) | (octets[:, 1] << 16) | (octets[:, 2] << 8) | octets[:, 3]
+    mask = (np.uint64(0xffffffff) << (32 - prefix).astype(np.uint64)) & np.uint64(0xffffffff)
+    net = ip & mask
+    bcast = net | (~mask & np.uint64(0xffffffff))
+    return [
+        Question(f"{a}.{b}.{c}.{d}/{p}", f"{int_to_ip(nt)} and {int_to_ip(bc)}")
+        for (a, b, c, d), p, nt, bc in zip(octets.tolist(), prefix.tolist(),
+                                           net.tolist(), bcast.tolist())
+    ]
+
+
+_BATCH_PY = {
+    MATHEMATICS: _math_batch_py,
+    ROMAN_NUMERALS: _roman_batch_py,
+    USABLE_IP: _usable_batch_py,
+    NETWORK_BROADCAST: _network_batch_py,
+}
+_BATCH_NP = {
+    MATHEMATICS: _math_batch_np,
+    ROMAN_NUMERALS: _roman_batch_np,
+    USABLE_IP: _usable_batch_np,
+    NETWORK_BROADCAST: _network_batch_np,
+}
+
+
+def generate_batch(qtype, n, rng=None, use_numpy=None):
+    """n Questions of one type. Unknown types get network/broadcast
+    questions, like the server always did. rng is a random.Random (pure
+    Python) or a numpy Generator; use_numpy=None means "if installed"."""
+    if use_numpy is None:
+        use_numpy = np is not None and not isinstance(rng, random.Random)
+    if use_numpy:
+        fn = _BATCH_NP.get(qtype, _network_batch_np)
+        return fn(n, rng if rng is not None else np.random.default_rng())
+    fn = _BATCH_PY.get(qtype, _network_batch_py)
+    return fn(n, rng if rng is not None else random.Random())
+
+
+class QuestionPool:
+    """Pre-generated questions per type, refilled a batch at a time.
+    Safe to share between rooms."""
+
+    def __init__(self, batch_size=2048, seed=None):
+        self.batch_size = batch_size
+        self.lock = threading.Lock()
+        self.queues = {}
+        if np is not None:
+            self.rng = np.random.default_rng(seed)
+        else:
+            self.rng = random.Random(seed)
+
+    def next(self, qtype):
+        with self.lock:
+            q = self.queues.get(qtype)
+            if not q:
+                q = self.queues[qtype] = deque(generate_batch(qtype, self.batch_size, self.rng))
+            return q.popleft()
+
+
+class QuestionScript:
+    """Deals a fixed list of (qtype, short) questions in order, e.g. the
+    questions of a recorded game (see replay.py). Pool-compatible."""
+
+    def __init__(self, script):
+        self.lock = threading.Lock()
+        self.items = deque((qtype, short) for qtype, short in script)
+
+    def next(self, qtype):
+        with self.lock:
+            if not self.items:
+                raise ValueError("question script exhausted")
+            scripted_type, short = self.items.popleft()
+        return Question(short, solve(scripted_type, short))
@@ -0,0 +1,240 @@
+# =============================
+# FILE: replay.py
+# =============================
+# Re-drive a server from a game event log (see eventlog.py).
+#
+#   python replay.py game.tqlog --speed 10 --port 7790
+#   python replay.py game.tqlog.0 game.tqlog.1 --game 3
+#
+# With "workers" every worker writes its own log (event_log + ".<n>");
+# pass them all and --game counts through their games in order.
+# The recorded config is reused with the recorded questions as a
+# question_script, so the replayed server asks exactly the same
+# questions. One bot per recorded player sends the recorded HI at its
+# original offset, and every later message (ANSWER, STANDINGS, BYE,
+# disconnect) at its original delay after the QUESTION it followed.
+# All delays and the server's round timers are divided by --speed.
+#
+# The JSON report has the replayed server's per-round answer latency and
+# the number of RESULTs whose correctness differs from the recording.
+
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+
+from eventlog import OUT, read_events
+from ports import wait_for_port
+from protocol import JSON_LINES, FrameDecoder, get_wire
+
+
+# =============================
+# Read a recorded game
+# =============================
+def split_games(events):
+    """One event list per game, in the order the games started. Lobby
+    rooms share a log, so each record joins the latest game of its room."""
+    games = []
+    current = {}           # room -> events of its latest game
+    for ev in events:
+        if ev.msg.get("message_type") == "META":
+            current[ev.room] = []
+            games.append(current[ev.room])
+        game = current.get(ev.room)
+        if game is not None:
+            game.append(ev)
+    return games
+
+
+def load_game(paths, game=-1):
+    """(cfg, [(qtype, short)], {conn: (hi_t, hi, [(q, delay, msg)])},
+    {conn: [correct, ...]}) for one game of a log, or of several logs
+    taken in order."""
+    if isinstance(paths, str):
+        paths = [paths]
+    games = []
+    for path in paths:
+        games += split_games(read_events(path))
+    if not games:
+        raise ValueError(f"{', '.join(paths)} holds no games")
+    events = games[game]
+    cfg = events[0].msg["cfg"]
+
+    questions = []
+    asked = []             # QUESTION send times
+    players = {}
+    results = {}
+    for ev in events[1:]:
+        mtype = ev.msg.get("message_type")
+        if ev.direction == OUT:
+            if mtype == "QUESTION":
+                questions.append((ev.msg["question_type"], ev.msg["short_question"]))
+                asked.append(ev.t)
+            elif mtype == "RESULT":
+                results.setdefault(ev.conn, []).append(ev.msg["correct"])
+            elif mtype == "FINISHED":
+                break          # later events are just the connections closing
+            continue
+
+        if mtype == "HI":
+            players[ev.conn] = (ev.t, ev.msg, [])
+        elif ev.conn in players:
+            hi_t = players[ev.conn][0]
+            q = len(asked) - 1 if asked else None
+            delay = ev.t - (asked[q] if asked else hi_t)
+            players[ev.conn][2].append((q, delay, ev.msg))
+    return cfg, questions, players, results
+
+
+# =============================
+# Bots
+# =============================
+class ReplayBot:
+    def __init__(self, host, port, speed, hi_t, hi, actions):
+        self.host, self.port, self.speed = host, port, speed
+        self.hi_t, self.hi, self.actions = hi_t, hi, actions
+        self.asked = []            # asyncio.Event per question number
+        self.results = []
+        self.finished = False
+        self.writer = None
+        self.wire = JSON_LINES
+
+    def question(self, q):
+        while len(self.asked) <= q:
+            self.asked.append(asyncio.Event())
+        return self.asked[q]
+
+    def send(self, msg):
+        if self.writer is not None and not self.writer.is_closing():
+            self.writer.write(self.wire.encode(msg))
+
+    async def drive(self, hi_sent):
+        for q, delay, msg in self.actions:
+            if q is None:
+                start = hi_sent
+            else:
+                await self.question(q).wait()
+                start = self.asked_at[q]
+            await asyncio.sleep(max(0.0, start + delay / self.speed - time.monotonic()))
+            if msg.get("message_type") == "CLOSE":
+                self.writer.close()
+                return
+            self.send(msg)
+
+    async def run(self, t0):
+        await asyncio.sleep(max(0.0, t0 + self.hi_t / self.speed - time.monotonic()))
+        reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(JSON_LINES.encode(self.hi))       # HI is always JSON
+        hi_sent = time.monotonic()
+        wire = get_wire(self.hi.get("wire"), self.hi.get("codec", "json"))
+        if wire is not None:
+            self.wire = wire
+        decoder = FrameDecoder(wire.codec if wire is not None and wire.binary else None,
+                               strict=False)
+
+        self.asked_at = {}
+        driver = asyncio.create_task(self.drive(hi_sent))
+        n_questions = 0
+        try:
+            while not self.finished:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                for msg in decoder.feed(data):
+                    mtype = msg.get("message_type")
+                    if mtype == "QUESTION":
+                        self.asked_at[n_questions] = time.monotonic()
+                        self.question(n_questions).set()
+                        n_questions += 1
+                    elif mtype == "RESULT":
+                        self.results.append(msg["correct"])
+                    elif mtype == "FINISHED":
+                        self.finished = True
+        except OSError:
+            pass
+        finally:
+            driver.cancel()
+            self.writer.close()
+
+
+# =============================
+# Replay
+# =============================
+def replay(paths, speed=1.0, port=7790, engine=None, record=None, game=-1):
+    from server import make_server
+
+    cfg, questions, players, recorded = load_game(paths, game)
+    cfg = dict(cfg)
+    cfg.update({
+        "port": port,
+        "question_script": questions,
+        "question_types": [qtype for qtype, _ in questions],
+        "question_seconds": float(cfg["question_seconds"]) / speed,
+        "question_interval_seconds": float(cfg["question_interval_seconds"]) / speed,
+        "players": len(players),
+        "multi_room": False,
+        "workers": 0,
+        "metrics_port": None,
+        "event_log": record,
+        "global_board": None,      # never add replayed scores to the live board
+        "link_port": None,         # the production gateway link port may be taken
+    })
+    if engine:
+        cfg["server_engine"] = engine
+
+    server = make_server(cfg)
+    # The probe connection below never says HI, so it is not a player
+    threading.Thread(target=server.start, daemon=True).start()
+    if not wait_for_port("127.0.0.1", port):
+        raise OSError(f"replay server did not start on port {port}")
+
+    bots = {conn: ReplayBot("127.0.0.1", port, speed, *p) for conn, p in players.items()}
+
+    async def run_all():
+        t0 = time.monotonic()
+        await asyncio.gather(*(b.run(t0) for b in bots.values()), return_exceptions=True)
+
+    start = time.monotonic()
+    asyncio.run(run_all())
+    wall = time.monotonic() - start
+
+    mismatches = sum(
+        a != b
+        for conn, bot in bots.items()
+        for a, b in zip(bot.results, recorded.get(conn, []))
+    )
+    return {
+        "players": len(players),
+        "questions": len(questions),
+        "speed": speed,
+        "wall_seconds": round(wall, 3),
+        "finished": sum(b.finished for b in bots.values()),
+        "result_mismatches": mismatches,
+        "round_latency": server.round_latency,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded trivia game")
+    parser.add_argument("log", nargs="+", help="event log file(s)")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="time compression, e.g. 10 = ten times faster")
+    parser.add_argument("--port", type=int, default=7790)
+    parser.add_argument("--engine", choices=["threaded", "asyncio"])
+    parser.add_argument("--record", help="event log for the replayed game")
+    parser.add_argument("--game", type=int, default=-1,
+                        help="which game of the logs (default: the last)")
+    args = parser.parse_args(argv)
+
+    try:
+        report = replay(args.log, args.speed, args.port, args.engine, args.record, args.game)
+    except (OSError, ValueError, IndexError) as e:
+        print(f"replay.py: {e}")
+        sys.exit(1)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,139 +3,341 @@ import threading
 import json
 import time
 import sys
+from collections import deque
+from itertools import count
+
+from eventlog import BROADCAST, IN, OUT, EventLog
+from globalboard import open_board
+from leaderboard import Leaderboard
+from metrics import METRICS
+from muxlink import serve_links
+from protocol import JSON_LINES, TYPE_CODES, FrameDecoder, get_wire
+from sockopts import set_cork, socket_options, tune, tune_buffers
+# Solver names stay importable from server for older scripts
+from solvers import eval_math, int_to_ip, ip_to_int, network_and_broadcast, roman_to_int, solve
 
 ENC = "utf-8"
 
+# Outbound queue high-water marks (per connection)
+SEND_QUEUE_MAX_BYTES = 4 * 1024 * 1024
+SEND_QUEUE_MAX_MESSAGES = 256
+
 
 # =============================
 # JSON send util
 # =============================
+def encode_frame(obj):
+    """Encode one message as newline-terminated JSON bytes."""
+    return JSON_LINES.encode(obj)
+
+
 def send_json(sock, obj):
     """Send newline-terminated JSON."""
-    data = (json.dumps(obj) + "\n").encode(ENC)
+    data = encode_frame(obj)
     try:
         sock.sendall(data)
     except Exception:
         pass
 
 
+def frame_len(frame):
+    if isinstance(frame, (list, tuple)):
+        return sum(len(b) for b in frame)
+    return len(frame)
+
+
+def send_vectored(sock, buffers):
+    """sendall() for a list of buffers, using sendmsg() so they are not
+    concatenated first."""
+    if not hasattr(sock, "sendmsg"):
+        sock.sendall(b"".join(buffers))
+        return
+
+    views = [memoryview(b) for b in buffers if len(b)]
+    while views:
+        sent = sock.sendmsg(views)
+        while views and sent >= len(views[0]):
+            sent -= len(views[0])
+            views.pop(0)
+        if sent:
+            views[0] = views[0][sent:]
+
+
+# =============================
+# Bounded outbound queue, drained by one writer thread
+# =============================
+class Outbox:
+    """Per-connection send queue. A client that lets it grow past either
+    high-water mark is evicted instead of stalling the round loop.
+
+    With cork set, hold() keeps frames queued until release(), and the
+    writer sends every multi-frame backlog under TCP_CORK."""
+
+    def __init__(self, sock, max_bytes=SEND_QUEUE_MAX_BYTES,
+                 max_messages=SEND_QUEUE_MAX_MESSAGES, on_evict=None, cork=False):
+        self.sock = sock
+        self.max_bytes = max_bytes
+        self.max_messages = max_messages
+        self.on_evict = on_evict
+        self.cork = cork
+        self.cond = threading.Condition()
+        self.queue = deque()
+        self.queued_bytes = 0
+        self.held = False          # hold(): queue a burst, send it on release()
+        self.closing = False       # drain what is queued, then close
+        self.dead = False          # evicted or the socket failed
+        self.writer = threading.Thread(target=self.run, daemon=True)
+        self.writer.start()
+
+    def put(self, data):
+        with self.cond:
+            if self.dead or self.closing:
+                return False
+            size = frame_len(data)
+            if (self.queued_bytes + size > self.max_bytes or
+                    len(self.queue) >= self.max_messages):
+                self.dead = True
+                self.queue.clear()
+                evicted = True
+            else:
+                self.queue.append(data)
+                self.queued_bytes += size
+                self.cond.notify()
+                evicted = False
+
+        if evicted:
+            self.kill()
+            if self.on_evict:
+                self.on_evict()
+        return not evicted
+
+    def depth(self):
+        with self.cond:
+            return len(self.queue), self.queued_bytes
+
+    def hold(self):
+        with self.cond:
+            self.held = True
+
+    def release(self):
+        with self.cond:
+            self.held = False
+            self.cond.notify()
+
+    def run(self):
+        corked = False
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: (self.queue and not self.held) or
+                                   self.closing or self.dead)
+                if self.dead or not self.queue:
+                    break
+                data = self.queue[0]
+                burst = self.cork and len(self.queue) > 1
+
+            if burst and not corked:
+                corked = set_cork(self.sock, True)
+            try:
+                if isinstance(data, bytes):
+                    self.sock.sendall(data)
+                else:
+                    send_vectored(self.sock, data)
+            except OSError:
+                with self.cond:
+                    self.dead = True
+                break
+            METRICS.inc("trivia_bytes_sent_total", frame_len(data))
+
+            with self.cond:
+                if self.queue:
+                    self.queue.popleft()
+                    self.queued_bytes -= frame_len(data)
+                drained = not self.queue
+            if corked and drained:
+                corked = not set_cork(self.sock, False)
+
+        self.kill()
+
+    def kill(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+    def close(self):
+        with self.cond:
+            self.closing = True
+            self.cond.notify()
+
+    def wait_closed(self, timeout):
+        self.writer.join(timeout)
+        if self.writer.is_alive():
+            # Peer never drained its socket: give up on the backlog
+            with self.cond:
+                self.dead = True
+                self.cond.notify()
+            self.kill()
+
+
 # =============================
 # Player object
 # =============================
+_player_ids = count(1)     # 0 means "every player" in the event log
+
+
 class Player:
-    def __init__(self, conn, addr):
+    def __init__(self, conn, addr, outbox=None):
+        self.id = next(_player_ids)
         self.conn = conn
         self.addr = addr
+        self.outbox = outbox       # Outbox (threaded) or TransportConn (asyncio)
+        self.wire = JSON_LINES     # switched by HI "wire" negotiation
+        self.decoder = FrameDecoder()
         self.username = None
         self.points = 0
         self.last_answer = None
-
-
-# =============================
-# No-eval math expression evaluator
-# =============================
-def eval_math(expr):
-    tokens = expr.split()
-    prec = {"+": 1, "-": 1, "*": 2, "/": 2}
-
-    # Shunting-yard → RPN
-    output = []
-    stack = []
-
-    for t in tokens:
-        if t.isdigit():
-            output.append(int(t))
-        elif t in prec:
-            while stack and stack[-1] in prec and prec[stack[-1]] >= prec[t]:
-                output.append(stack.pop())
-            stack.append(t)
-
-    while stack:
-        output.append(stack.pop())
-
-    # Evaluate RPN
-    s = []
-    for t in output:
-        if isinstance(t, int):
-            s.append(t)
-        else:
-            b = s.pop()
-            a = s.pop()
-            if t == "+":
-                s.append(a + b)
-            elif t == "-":
-                s.append(a - b)
-            elif t == "*":
-                s.append(a * b)
-            else:
-                if b == 0:
-                    s.append(0)
+        self.last_correct = False  # graded when the answer arrives
+        self.answer_at = None      # time.monotonic() of the last answer
+        self.gone = False          # disconnected or evicted
+        self.room = None           # TriviaServer running this player's game
+        self.last_place = 1        # everyone starts tied for first
+
+    def send(self, obj):
+        self.send_bytes(self.wire.encode(obj))
+
+    def hold(self):
+        """Start a burst: frames are queued but not sent until release()."""
+        if self.outbox is not None:
+            self.outbox.hold()
+
+    def release(self):
+        if self.outbox is not None:
+            self.outbox.release()
+
+    def send_bytes(self, data):
+        """Queue an encoded frame: bytes, or a list of buffers."""
+        if self.gone:
+            return
+        if self.outbox is None:
+            try:
+                if isinstance(data, bytes):
+                    self.conn.sendall(data)
                 else:
-                    s.append(a // b)  # integer division
+                    send_vectored(self.conn, data)
+                METRICS.inc("trivia_bytes_sent_total", frame_len(data))
+            except OSError:
+                pass
+        else:
+            self.outbox.put(data)
 
-    return s[-1]
+    def disconnected(self):
+        if self.room is not None:
+            self.room.player_gone(self)
+        else:
+            self.gone = True
 
+    def close(self):
+        if self.outbox is not None:
+            self.outbox.close()
+            return
+        try:
+            self.conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        try:
+            self.conn.close()
+        except OSError:
+            pass
 
-# =============================
-# Roman numeral → int
-# =============================
-def roman_to_int(s):
-    vals = {"I": 1, "V": 5, "X": 10, "L": 50, "C": 100, "D": 500, "M": 1000}
-    total = 0
-    prev = 0
-    for ch in reversed(s.strip().upper()):
-        v = vals[ch]
-        if v < prev:
-            total -= v
-        else:
-            total += v
-        prev = v
-    return total
+    def wait_closed(self, timeout):
+        if self.outbox is not None:
+            self.outbox.wait_closed(timeout)
 
 
 # =============================
-# IP helpers
+# Game counters (shared by a lobby and its rooms)
 # =============================
-def ip_to_int(ip):
-    a, b, c, d = map(int, ip.split("."))
-    return (a << 24) | (b << 16) | (c << 8) | d
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {}
 
+    def add(self, key, n=1):
+        with self.lock:
+            self.counts[key] = self.counts.get(key, 0) + n
 
-def int_to_ip(x):
-    return ".".join(str((x >> s) & 255) for s in (24, 16, 8, 0))
+    def snapshot(self):
+        with self.lock:
+            return dict(self.counts)
 
 
-def network_and_broadcast(ip, prefix):
-    mask = (0xffffffff << (32 - prefix)) & 0xffffffff
-    base = ip_to_int(ip)
-    net = base & mask
-    bcast = net | (~mask & 0xffffffff)
-    return int_to_ip(net), int_to_ip(bcast)
+def percentiles(values, qs=(50, 90, 99)):
+    """Nearest-rank percentiles of a list of numbers ({q: value})."""
+    if not values:
+        return {}
+    values = sorted(values)
+    n = len(values)
+    return {q: values[max(0, -(-q * n // 100) - 1)] for q in qs}
 
 
 # =============================
 # MAIN SERVER CLASS
 # =============================
 class TriviaServer:
-    def __init__(self, cfg):
+    def __init__(self, cfg, room_id=None, stats=None, questions=None):
         self.cfg = cfg
         self.players_needed = cfg["players"]
         self.players = []          # list of Player objects
         self.lock = threading.Lock()
+        self.cond = threading.Condition(self.lock)   # wakes run_game
+        self.answered = 0          # players who answered the current question
+        self.board = Leaderboard() # standings, updated as points change
         self.server_sock = None
-
-        # Import questions
-        from questions import (
-            generate_mathematics_question,
-            generate_roman_numerals_question,
-            generate_usable_ip_question,
-            generate_network_broadcast_question
-        )
-
-        self.q_mat = generate_mathematics_question
-        self.q_rom = generate_roman_numerals_question
-        self.q_ip = generate_usable_ip_question
-        self.q_net = generate_network_broadcast_question
+        self.link_sock = None      # gateway links, see start_links
+        self.stats = stats if stats is not None else Stats()
+        self.sockopts = socket_options(cfg)   # see sockopts.py
+        self.global_board = open_board(cfg)   # shared by every worker, see globalboard.py
+
+        # Multi-room lobby: this instance only listens and deals players
+        # into rooms, each room being a socket-less TriviaServer.
+        self.room_id = room_id
+        self.is_lobby = bool(cfg.get("multi_room", False)) and room_id is None
+        self.rooms = []
+        self.filling = None        # room currently collecting players
+        self.next_room_id = 1
+
+        # READY is identical for every player: encode it once per wire
+        info = cfg["ready_info"].format(**cfg)
+        self.ready_msg = {"message_type": "READY", "info": info}
+        self.ready_frames = {}
+
+        # Import questions: generated in batches with their answer keys
+        # (or dealt from a pre-built bank file), one pool shared by a lobby
+        # and its rooms
+        if questions is None:
+            questions = self.open_questions()
+        self.questions = questions
+        self.current_question = None   # (qtype, Question) being asked
+
+        # Current round: answers are graded against the key as they arrive
+        self.round_no = 0
+        self.question_key = None
+        self.asked_at = None
+        self.round_latency = []    # one summary per round, see send_results
+
+        # Optional protocol event log for replay.py (rooms share the lobby's
+        # and tag their records with their room id)
+        self.events = None
+        self.log_room = room_id or 0
+        if cfg.get("event_log") and room_id is None:
+            self.events = EventLog(cfg["event_log"],
+                                   float(cfg.get("event_log_flush_seconds", 0.2)))
+            if not self.is_lobby:
+                self.events.meta(cfg=cfg)
 
     # =============================
     # Accept client connections
@@ -147,186 +349,584 @@ class TriviaServer:
             except OSError:
                 break
 
-            player = Player(conn, addr)
-            threading.Thread(target=self.handle_client, args=(player,), daemon=True).start()
+            tune(conn, self.sockopts)
+            self.new_connection(conn, addr)
+
+    def new_connection(self, conn, addr):
+        """Serve one client connection: a socket, or a gateway Channel."""
+        METRICS.inc("trivia_connections_total")
+        player = Player(conn, addr)
+        player.outbox = Outbox(
+            conn,
+            int(self.cfg.get("send_queue_max_bytes", SEND_QUEUE_MAX_BYTES)),
+            int(self.cfg.get("send_queue_max_messages", SEND_QUEUE_MAX_MESSAGES)),
+            on_evict=lambda p=player: self.evict(p),
+            cork=bool(self.sockopts["cork"]) and isinstance(conn, socket.socket)
+        )
+        threading.Thread(target=self.handle_client, args=(player,), daemon=True).start()
+
+    # =============================
+    # Gateway links (see gateway.py and muxlink.py)
+    # =============================
+    def link_load(self):
+        """What this node tells the gateway: connected players, and how
+        many are waiting in the room that is filling up."""
+        room = self.filling if self.is_lobby else self
+        waiting = 0
+        if room is not None and len(room.players) < room.players_needed:
+            waiting = len(room.players)
+        return {"players": sum(not p.gone for p in self.all_players()),
+                "waiting": waiting, "room_size": self.players_needed}
+
+    def start_links(self):
+        port = self.cfg.get("link_port")
+        if not port:
+            return
+        self.link_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.link_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.cfg.get("reuse_port"):
+            self.link_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        try:
+            self.link_sock.bind((self.cfg.get("link_host", "127.0.0.1"), int(port)))
+        except OSError:
+            print(f"server.py: Binding to link port {port} was unsuccessful")
+            sys.exit(1)
+        self.link_sock.listen(16)
+        threading.Thread(target=serve_links, daemon=True, args=(
+            self.link_sock, self.new_connection, self.link_load,
+            float(self.cfg.get("link_load_seconds", 1.0)))).start()
 
     # =============================
     # Handle one client's messages
     # =============================
     def handle_client(self, player):
-        f = player.conn.makefile("r", encoding=ENC)
-
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
+        reading = True
+        try:
+            while reading:
+                data = player.conn.recv(65536)
+                if not data:
+                    break
 
-            msg = json.loads(line)
-            mtype = msg.get("message_type")
+                # JSON lines or binary frames (see protocol.py)
+                for msg in player.decoder.feed(data):
+                    if not self.handle_message(player, msg):
+                        reading = False
+                        break
+        except (OSError, ValueError):
+            pass
 
-            # ========== HI ==========
-            if mtype == "HI":
-                username = msg.get("username", "")
-                if not any(c.isalnum() for c in username):
-                    # Username invalid → server immediate exit
-                    self.shutdown_all()
-                    print("Invalid username received. Exiting.")
-                    sys.exit(0)
+        # Cleanup: flush anything still queued, then close
+        METRICS.inc("trivia_disconnections_total")
+        player.disconnected()
+        player.close()
 
-                player.username = username
+    def evict(self, player):
+        # Slow consumer: its outbox hit a high-water mark
+        self.stats.add("evicted")
+        METRICS.inc("trivia_evictions_total")
+        player.disconnected()
 
-                # Add player
-                with self.lock:
-                    self.players.append(player)
+    # =============================
+    # Apply one inbound message (shared by both engines)
+    # =============================
+    def handle_message(self, player, msg):
+        """Handle one decoded message. Returns False once the client said BYE."""
+        mtype = msg.get("message_type")
+        METRICS.inc("trivia_messages_in_total",
+                    type=mtype if mtype in TYPE_CODES else "other")
+        if self.events and mtype != "HI":     # HI is logged with its room
+            room = player.room if player.room is not None else self
+            self.events.log(player.id, IN, msg, room.log_room)
+
+        # ========== HI ==========
+        if mtype == "HI":
+            username = msg.get("username", "")
+            if not any(c.isalnum() for c in username):
+                if self.events:
+                    self.events.log(player.id, IN, msg, self.log_room)
+                if self.is_lobby:
+                    # Other rooms keep playing; only drop this client
+                    return False
+
+                # Username invalid → server immediate exit
+                self.shutdown_all()
+                print("Invalid username received. Exiting.")
+                sys.exit(0)
+
+            player.username = username
+            self.stats.add("players")
+
+            # Optional binary framing; unknown requests stay on JSON lines
+            wire = get_wire(msg.get("wire"), msg.get("codec", "json"))
+            if wire is not None:
+                player.wire = wire
+                if wire.binary:
+                    player.decoder.codec = wire.codec
+
+            # Add player
+            if self.is_lobby:
+                self.seat_player(player, msg)
+            else:
+                if self.events:
+                    self.events.log(player.id, IN, msg, self.log_room)
+                self.add_player(player)
+
+            # Send READY (but game starts later)
+            frame = self.ready_frames.get(player.wire)
+            if frame is None:
+                frame = self.ready_frames[player.wire] = player.wire.encode(self.ready_msg)
+            player.send_bytes(frame)
+            METRICS.inc("trivia_messages_out_total", type="READY")
+            if self.events:
+                self.events.log(player.id, OUT, self.ready_msg, player.room.log_room)
+
+        # ========== Player Answer ==========
+        elif mtype == "ANSWER":
+            if player.room is not None:
+                player.room.record_answer(player, str(msg.get("answer")))
+            else:
+                player.last_answer = str(msg.get("answer"))
 
-                # Send READY (but game starts later)
-                info = self.cfg["ready_info"].format(**self.cfg)
-                send_json(player.conn, {"message_type": "READY", "info": info})
+        # ========== Paged standings ==========
+        elif mtype == "STANDINGS":
+            if player.room is not None:
+                try:
+                    page = int(msg.get("page", 1))
+                except (TypeError, ValueError):
+                    page = 1
+                player.room.send_standings_page(player, page)
 
-            # ========== Player Answer ==========
-            elif mtype == "ANSWER":
-                player.last_answer = str(msg.get("answer"))
+        # ========== Player BYE ==========
+        elif mtype == "BYE":
+            return False
 
-            # ========== Player BYE ==========
-            elif mtype == "BYE":
-                break
+        return True
 
-        # Cleanup
+    # =============================
+    # Lobby: deal players into rooms
+    # =============================
+    def seat_player(self, player, hi=None):
+        with self.lock:
+            room = self.filling
+            if room is None or len(room.players) >= room.players_needed:
+                room = self.open_room()
+                self.filling = room
+            if self.events and hi is not None:
+                # Before add_player: the room may start its game right away
+                self.events.log(player.id, IN, hi, room.log_room)
+            room.add_player(player)
+        return room
+
+    def open_room(self):
+        room = type(self)(self.cfg, room_id=self.next_room_id, stats=self.stats,
+                          questions=self.questions)
+        room.events = self.events
+        if room.events:
+            room.events.meta(room=room.room_id, cfg=self.cfg)
+        self.next_room_id += 1
+        self.rooms.append(room)
+        self.spawn_room(room)
+        return room
+
+    def spawn_room(self, room):
+        threading.Thread(target=self.run_room, args=(room,), daemon=True).start()
+
+    def run_room(self, room):
         try:
-            player.conn.close()
-        except:
-            pass
+            room.run_game()
+        finally:
+            self.close_room(room)
+
+    def close_room(self, room):
+        # Finished rooms are dropped so their slot can be reused
+        with self.lock:
+            self.rooms.remove(room)
+            if self.filling is room:
+                self.filling = None
 
     # =============================
     # Generate a question
     # =============================
+    def open_questions(self):
+        if self.cfg.get("question_script"):
+            from questions import QuestionScript
+            return QuestionScript(self.cfg["question_script"])
+
+        path = self.cfg.get("question_bank")
+        if not path:
+            from questions import QuestionPool
+            return QuestionPool(int(self.cfg.get("question_batch_size", 2048)),
+                                self.cfg.get("question_seed"))
+
+        from questionbank import ALL_TYPES, BankPool, QuestionBank
+        from questions import QuestionPool
+        try:
+            bank = QuestionBank(path)
+        except (OSError, ValueError) as e:
+            print(f"server.py: Cannot open question bank {path}: {e}")
+            sys.exit(1)
+        missing = [t for t in self.cfg.get("question_types", []) if bank.count(t) == 0]
+        known = [t for t in missing if t in ALL_TYPES]
+        unknown = [t for t in missing if t not in ALL_TYPES]
+        if known:
+            print(f"server.py: question bank {path} has no {', '.join(known)} questions, "
+                  "using generated questions", flush=True)
+        if unknown:
+            print(f"server.py: question types {', '.join(unknown)} are unknown, "
+                  "using network/broadcast questions", flush=True)
+        cursor = self.cfg.get("question_bank_cursor") or path + ".cursor"
+        return BankPool(bank, cursor, int(self.cfg.get("question_bank_block", 64)),
+                        QuestionPool(int(self.cfg.get("question_batch_size", 2048)),
+                                     self.cfg.get("question_seed")))
+
     def generate_short(self, qtype):
-        if qtype == "Mathematics":
-            return self.q_mat()
-        if qtype == "Roman Numerals":
-            return self.q_rom()
-        if qtype == "Usable IP Addresses of a Subnet":
-            return self.q_ip()
-        return self.q_net()
+        q = self.questions.next(qtype)
+        self.current_question = (qtype, q)
+        return q.short
 
     def compute_correct(self, qtype, short):
-        if qtype == "Mathematics":
-            return str(eval_math(short))
-        if qtype == "Roman Numerals":
-            return str(roman_to_int(short))
-        if qtype == "Usable IP Addresses of a Subnet":
-            _, p = short.split("/")
-            return str(max(0, (2 ** (32 - int(p))) - 2))
-        if qtype == "Network and Broadcast Address of a Subnet":
-            ip, p = short.split("/")
-            n, b = network_and_broadcast(ip, int(p))
-            return f"{n} and {b}"
-        return ""
+        # The question being asked already carries its answer key
+        cur = self.current_question
+        if cur is not None and cur[0] == qtype and cur[1].short == short:
+            return cur[1].answer
+
+        return solve(qtype, short)
 
     # =============================
     # Ranking logic
     # =============================
+    def points_noun(self, points):
+        return (self.cfg["points_noun_singular"]
+                if points == 1 else
+                self.cfg["points_noun_plural"])
+
     def final_ranking(self):
-        # Sort by points desc, username lexicographically
-        ps = sorted(self.players, key=lambda p: (-p.points, p.username))
+        # Points desc, then username; the board keeps that order already
+        t0 = time.perf_counter()
         heading = self.cfg["final_standings_heading"]
         lines = [heading]
 
         # tie-handling: same points => same place number
-        place = 0
-        prev_score = None
-        for idx, p in enumerate(ps):
-            if p.points != prev_score:
-                place = idx + 1
-                prev_score = p.points
-            noun = (self.cfg["points_noun_singular"]
-                    if p.points == 1 else
-                    self.cfg["points_noun_plural"])
-            lines.append(f"{place}. {p.username}: {p.points} {noun}")
+        for place, points, names in self.board.tie_groups():
+            noun = self.points_noun(points)
+            for name in names:
+                lines.append(f"{place}. {name}: {points} {noun}")
 
         # Winner(s)
-        top = ps[0].points
-        winners = sorted([p.username for p in ps if p.points == top])
+        lines.append(self.winners_line())
+
+        text = "\n".join(lines)
+        METRICS.observe("trivia_final_ranking_seconds", time.perf_counter() - t0)
+        return text
+
+    def winners_line(self, limit=None):
+        winners = self.board.leaders()
         if len(winners) == 1:
-            lines.append(self.cfg["one_winner"].format(winners[0]))
-        else:
-            lines.append(self.cfg["multiple_winners"].format(", ".join(winners)))
+            return self.cfg["one_winner"].format(winners[0])
+        if limit is not None and len(winners) > limit:
+            # Bounded payloads: name the first few, count the rest
+            winners = winners[:limit] + [f"+{len(winners) - limit}"]
+        return self.cfg["multiple_winners"].format(", ".join(winners))
 
-        return "\n".join(lines)
+    # =============================
+    # Personal standings: top K + own place, O(K) bytes per player
+    # =============================
+    def send_personal_standings(self, mtype, key, final=False):
+        k = int(self.cfg.get("standings_top_k", 10))
+        tpl = self.cfg.get("your_standing",
+                           "Your place: {place}. {username}: {points} {noun} ({change})")
+
+        lines = [self.cfg["final_standings_heading"]]
+        for place, name, points in self.board.top(k):
+            lines.append(f"{place}. {name}: {points} {self.points_noun(points)}")
+        if final:
+            lines.append(self.winners_line(limit=k))
+        shared = "\n".join(lines) + "\n"
+
+        t0 = time.perf_counter()
+        heads = {}
+        n = len(self.board)
+        sent = 0
+        for p in self.players:
+            if p.gone:
+                continue
+            sent += 1
+            place = self.board.rank(p)
+            change = p.last_place - place
+            p.last_place = place
+
+            personal = tpl.format(
+                place=place, username=p.username, points=p.points,
+                noun=self.points_noun(p.points),
+                change=f"{change:+d}" if change else "="
+            )
+            if p.wire not in heads:
+                heads[p.wire] = p.wire.text_head(mtype, key, shared)
+            obj = {"message_type": mtype, "place": place, "points": p.points,
+                   "change": change, "players": n}
+            p.send_bytes(p.wire.text_frame(heads[p.wire], obj, key, shared, personal))
+        self.fanout_done(mtype, sent, t0)
+        if self.events:
+            self.events.log(BROADCAST, OUT, {"message_type": mtype, key: shared},
+                            self.log_room)
+
+    def send_standings_page(self, player, page):
+        """Answer a STANDINGS request with one page of the full table."""
+        size = max(1, int(self.cfg.get("standings_page_size", 50)))
+        with self.lock:
+            pages = max(1, -(-len(self.board) // size))
+            page = min(max(1, page), pages)
+            entries = self.board.slice((page - 1) * size, page * size)
+
+        lines = [self.cfg["final_standings_heading"]]
+        for place, name, points in entries:
+            lines.append(f"{place}. {name}: {points} {self.points_noun(points)}")
+        msg = {"message_type": "STANDINGS", "page": page, "pages": pages,
+               "state": "\n".join(lines)}
+        player.send(msg)
+        if self.events:
+            self.events.log(player.id, OUT, msg, self.log_room)
+        METRICS.inc("trivia_messages_out_total", type="STANDINGS")
+
+    # =============================
+    # Round steps (shared by both engines)
+    # =============================
+    def add_player(self, player):
+        with self.lock:
+            self.players.append(player)
+            self.board.add(player, player.username, player.points)
+            player.room = self
+            self.wake()
+
+    def record_answer(self, player, answer):
+        now = time.monotonic()
+        with self.lock:
+            if player.last_answer is None and not player.gone:
+                self.answered += 1
+            player.last_answer = answer
+            player.last_correct = (answer == self.question_key)
+            player.answer_at = now
+            asked_at = self.asked_at
+            if self.answered >= len(self.players):
+                self.wake()
+        if asked_at is not None:
+            METRICS.observe("trivia_answer_latency_seconds", now - asked_at)
+
+    def player_gone(self, player):
+        # A dead connection must not hold the round open until the deadline
+        with self.lock:
+            if player.gone:
+                return
+            player.gone = True
+            if self.events:
+                self.events.log(player.id, IN, {"message_type": "CLOSE"}, self.log_room)
+            if player.last_answer is None:
+                self.answered += 1
+            if self.answered >= len(self.players):
+                self.wake()
+
+    def wake(self):
+        # Called with self.lock held
+        self.cond.notify_all()
+
+    def enough_players(self):
+        return len(self.players) >= self.players_needed
+
+    def all_answered(self):
+        return self.answered >= len(self.players)
+
+    def wait_for_players(self):
+        with self.lock:
+            self.cond.wait_for(self.enough_players)
+
+    def wait_for_answers(self, timeout):
+        # Returns as soon as the last answer lands or the deadline passes
+        with self.lock:
+            self.cond.wait_for(self.all_answered, timeout)
+
+    def start_round(self, qn, qt, short):
+        key = self.compute_correct(qt, short)
+        with self.lock:
+            self.round_no = qn
+            self.question_key = key
+            self.answered = 0
+            for p in self.players:
+                p.last_answer = None
+                p.last_correct = False
+                p.answer_at = None
+                if p.gone:
+                    self.answered += 1
+            self.asked_at = time.monotonic()
+
+    def ask_question(self, qn, qt):
+        short = self.generate_short(qt)
+        full = self.cfg["question_formats"][qt].format(short)
+        self.stats.add("questions")
+        self.start_round(qn, qt, short)
+
+        # Broadcast QUESTION
+        self.broadcast({
+            "message_type": "QUESTION",
+            "question_type": qt,
+            "trivia_question": f"{self.cfg['question_word']} {qn} ({qt}):\n{full}",
+            "short_question": short,
+            "time_limit": self.cfg["question_seconds"]
+        })
+        return short
+
+    def hold_players(self):
+        if self.sockopts["cork"]:
+            for p in self.players:
+                p.hold()
+
+    def release_players(self):
+        if self.sockopts["cork"]:
+            for p in self.players:
+                p.release()
+
+    def broadcast(self, obj):
+        """Send the same message to every player, encoded once per wire."""
+        t0 = time.perf_counter()
+        frames = {}
+        for p in self.players:
+            frame = frames.get(p.wire)
+            if frame is None:
+                frame = frames[p.wire] = p.wire.encode(obj)
+            p.send_bytes(frame)
+        self.fanout_done(obj["message_type"], len(self.players), t0)
+        if self.events:
+            self.events.log(BROADCAST, OUT, obj, self.log_room)
+
+    def fanout_done(self, mtype, n, t0):
+        METRICS.inc("trivia_messages_out_total", n, type=mtype)
+        METRICS.observe("trivia_broadcast_seconds", time.perf_counter() - t0, type=mtype)
+
+    def round_points(self, player):
+        """Points for a correct answer: 1, plus a speed bonus in "speed"
+        scoring mode that shrinks linearly to 0 at the deadline."""
+        if self.cfg.get("scoring_mode", "fixed") != "speed":
+            return 1
+        limit = float(self.cfg["question_seconds"])
+        left = 0.0
+        if limit > 0:
+            left = max(0.0, 1.0 - (player.answer_at - self.asked_at) / limit)
+        return 1 + round(int(self.cfg.get("speed_bonus_points", 4)) * left)
+
+    def send_results(self, qt, short):
+        # Answers were graded in record_answer; only points and frames remain
+        correct_answer = self.question_key
+
+        # Players who gave the same answer share the same frame
+        t0 = time.perf_counter()
+        frames = {}
+        out = []                   # (player, frame, correct, answer)
+        n_answers = n_correct = 0
+        latencies = []
+        with self.lock:            # STANDINGS requests read the board
+            for p in self.players:
+                ans = p.last_answer
+                correct = p.last_correct
+                if correct:
+                    gained = self.round_points(p)
+                    p.points += gained
+                    self.board.add_points(p, gained)
+                    n_correct += 1
+                if ans is not None:
+                    n_answers += 1
+                    latencies.append(p.answer_at - self.asked_at)
+
+                key = (p.wire, correct, ans)
+                frame = frames.get(key)
+                if frame is None:
+                    tpl = (self.cfg["correct_answer"]
+                           if correct else
+                           self.cfg["incorrect_answer"])
+                    fb = tpl.format(answer=ans, correct_answer=correct_answer)
+                    frame = frames[key] = p.wire.result_frame(correct, fb)
+                out.append((p, frame, correct, ans))
+
+        # Send without the lock: an eviction calls player_gone, which takes it
+        for p, frame, correct, ans in out:
+            p.send_bytes(frame)
+            if self.events:
+                self.events.log(p.id, OUT, {"message_type": "RESULT",
+                                            "correct": correct, "answer": ans},
+                                self.log_room)
+        self.fanout_done("RESULT", len(out), t0)
+
+        self.stats.add("answers", n_answers)
+        self.stats.add("correct", n_correct)
+        self.log_latency(latencies)
+
+    def log_latency(self, latencies):
+        pct = percentiles([round(x * 1000, 1) for x in latencies])
+        summary = {"round": self.round_no, "answers": len(latencies)}
+        summary.update({f"p{q}_ms": v for q, v in pct.items()})
+        self.round_latency.append(summary)
+        if self.cfg.get("log_latency"):
+            print("server.py: answer latency " + json.dumps(summary), flush=True)
+
+    def send_leaderboard(self):
+        if self.cfg.get("standings_mode", "full") == "personal":
+            self.send_personal_standings("LEADERBOARD", "state")
+            return
+        lb = self.final_ranking()
+        self.broadcast({"message_type": "LEADERBOARD", "state": lb})
+
+    def record_global(self):
+        """Queue this game's final scores for the cross-process board (a
+        writer thread takes the stripe locks, not the game loop)."""
+        if self.global_board is None:
+            return
+        winners = set(self.board.leaders())
+        results = [(p.username, p.points, p.username in winners)
+                   for p in self.players if p.username is not None]
+        self.global_board.post(results, lambda: self.stats.add("global_board_full"))
+
+    def send_finished(self):
+        self.stats.add("games")
+        self.record_global()
+        if self.cfg.get("standings_mode", "full") == "personal":
+            self.send_personal_standings("FINISHED", "final_standings", final=True)
+            return
+        final = self.final_ranking()
+        self.broadcast({
+            "message_type": "FINISHED",
+            "final_standings": final
+        })
 
     # =============================
     # Run the entire game
     # =============================
     def run_game(self):
         # Wait for all players
-        while True:
-            with self.lock:
-                if len(self.players) >= self.players_needed:
-                    break
-            time.sleep(0.05)
+        self.wait_for_players()
 
         # Broadcast READY already done in HI messages
         time.sleep(float(self.cfg["question_interval_seconds"]))
 
         qtypes = self.cfg["question_types"]
         for qn, qt in enumerate(qtypes, 1):
+            short = self.ask_question(qn, qt)
 
-            short = self.generate_short(qt)
-            full = self.cfg["question_formats"][qt].format(short)
+            # Wait for answers (early exit once everyone answered)
+            self.wait_for_answers(float(self.cfg["question_seconds"]))
 
-            # Broadcast QUESTION
-            for p in self.players:
-                p.last_answer = None
-                send_json(p.conn, {
-                    "message_type": "QUESTION",
-                    "question_type": qt,
-                    "trivia_question": f"{self.cfg['question_word']} {qn} ({qt}):\n{full}",
-                    "short_question": short,
-                    "time_limit": self.cfg["question_seconds"]
-                })
-
-            # Wait for answers
-            end = time.time() + float(self.cfg["question_seconds"])
-            while time.time() < end:
-                # If all answered early → break
-                if all(p.last_answer is not None for p in self.players):
-                    break
-                time.sleep(0.05)
-
-            correct_answer = self.compute_correct(qt, short)
-
-            # Send RESULT
-            for p in self.players:
-                ans = p.last_answer
-                correct = (ans == correct_answer)
-                if correct:
-                    p.points += 1
-
-                tpl = (self.cfg["correct_answer"]
-                       if correct else
-                       self.cfg["incorrect_answer"])
-                fb = tpl.format(answer=ans, correct_answer=correct_answer)
-
-                send_json(p.conn, {
-                    "message_type": "RESULT",
-                    "correct": correct,
-                    "feedback": fb
-                })
+            # RESULT and LEADERBOARD leave together as one corked burst
+            self.hold_players()
+            try:
+                self.send_results(qt, short)
 
-            # LEADERBOARD (except after last question)
+                # LEADERBOARD (except after last question)
+                if qn < len(qtypes):
+                    self.send_leaderboard()
+            finally:
+                self.release_players()
             if qn < len(qtypes):
-                lb = self.final_ranking()
-                for p in self.players:
-                    send_json(p.conn, {"message_type": "LEADERBOARD", "state": lb})
                 time.sleep(float(self.cfg["question_interval_seconds"]))
 
         # FINISHED
-        final = self.final_ranking()
-        for p in self.players:
-            send_json(p.conn, {
-                "message_type": "FINISHED",
-                "final_standings": final
-            })
+        self.send_finished()
 
         # Close all connections
         self.shutdown_all()
@@ -335,27 +935,71 @@ class TriviaServer:
     # Shut down server and all players
     # =============================
     def shutdown_all(self):
+        # Queued frames (FINISHED) are flushed before each socket closes
         for p in self.players:
-            try:
-                p.conn.shutdown(socket.SHUT_RDWR)
-            except:
-                pass
-            try:
-                p.conn.close()
-            except:
-                pass
+            p.close()
+        deadline = time.monotonic() + float(self.cfg.get("send_flush_seconds", 2))
+        for p in self.players:
+            p.wait_closed(max(0.0, deadline - time.monotonic()))
+        if self.events and self.room_id is None:
+            self.events.close()
+        if self.global_board and self.room_id is None:
+            self.global_board.drain()
         if self.server_sock:
             try:
                 self.server_sock.close()
             except:
                 pass
+        if self.link_sock:
+            self.link_sock.close()
 
     # =============================
     # Start server
     # =============================
+    def all_players(self):
+        """Players of this game, or of every open room for a lobby."""
+        if not self.is_lobby:
+            return list(self.players)
+        return [p for room in list(self.rooms) for p in list(room.players)]
+
+    def register_gauges(self):
+        def queue_bytes():
+            depths = [p.outbox.depth()[1] for p in self.all_players() if p.outbox]
+            return depths or [0]
+
+        METRICS.gauge("trivia_connections", "Open client connections",
+                      lambda: (METRICS.value("trivia_connections_total") -
+                               METRICS.value("trivia_disconnections_total")))
+        METRICS.gauge("trivia_players", "Players in a game and still connected",
+                      lambda: sum(not p.gone for p in self.all_players()))
+        METRICS.gauge("trivia_send_queue_bytes", "Bytes queued for all players",
+                      lambda: sum(queue_bytes()))
+        METRICS.gauge("trivia_send_queue_bytes_max", "Largest per-player send queue",
+                      lambda: max(queue_bytes()))
+
+    def start_metrics(self):
+        port = self.cfg.get("metrics_port")
+        if not port:
+            return
+        self.register_gauges()
+        try:
+            METRICS.serve(int(port))
+        except OSError:
+            # The game itself does not need the endpoint
+            print(f"server.py: Metrics port {port} is unavailable, metrics disabled")
+
     def start(self):
+        self.start_metrics()
+
         # Create socket
         self.server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if sys.platform != "win32":
+            # Same as asyncio: rebind while old game sockets sit in TIME_WAIT
+            self.server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.cfg.get("reuse_port"):
+            # Several worker processes share this port (see supervisor.py)
+            self.server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        tune_buffers(self.server_sock, self.sockopts)    # inherited by accepted sockets
 
         # Bind port
         try:
@@ -364,7 +1008,13 @@ class TriviaServer:
             print(f"server.py: Binding to port {self.cfg['port']} was unsuccessful")
             sys.exit(1)
 
-        self.server_sock.listen(16)
+        self.server_sock.listen(int(self.sockopts["backlog"]))
+        self.start_links()
+
+        # Lobby: the listener stays open and rooms run in the background
+        if self.is_lobby:
+            self.accept_loop()
+            return
 
         # Accept connections
         threading.Thread(target=self.accept_loop, daemon=True).start()
@@ -385,6 +1035,13 @@ def load_config(path):
         sys.exit(1)
 
 
+def make_server(cfg):
+    if cfg.get("server_engine", "threaded") == "asyncio":
+        from server_async import AsyncTriviaServer
+        return AsyncTriviaServer(cfg)
+    return TriviaServer(cfg)
+
+
 if __name__ == "__main__":
     if "--config" not in sys.argv:
         print("server.py: Configuration not provided")
@@ -398,4 +1055,17 @@ if __name__ == "__main__":
     cfg_path = sys.argv[idx + 1]
     cfg = load_config(cfg_path)
 
-    TriviaServer(cfg).start()
+    engine = cfg.get("server_engine", "threaded")
+    if engine not in ("threaded", "asyncio"):
+        print(f"server.py: Unknown server_engine {engine}")
+        sys.exit(1)
+
+    if cfg.get("link_port") and engine != "threaded":
+        print("server.py: link_port needs the threaded server_engine")
+        sys.exit(1)
+
+    if int(cfg.get("workers", 0)) > 0:
+        from supervisor import Supervisor
+        Supervisor(cfg, make_server).run()
+    else:
+        make_server(cfg).start()
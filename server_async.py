@@ -0,0 +1,245 @@
+import asyncio
+import sys
+
+from metrics import METRICS
+from server import SEND_QUEUE_MAX_BYTES, Player, TriviaServer, frame_len
+from sockopts import set_cork, tune, tune_buffers
+
+
+# =============================
+# Raise the open-file limit (one fd per player)
+# =============================
+def raise_fd_limit():
+    try:
+        import resource
+    except ImportError:
+        return  # not available on Windows
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        except (ValueError, OSError):
+            pass
+
+
+# =============================
+# Socket-like wrapper around an asyncio transport
+# =============================
+class TransportConn:
+    """Gives a transport the socket and outbox calls Player expects.
+
+    The transport's own write buffer is the outbound queue; a client whose
+    buffer passes max_bytes is evicted.
+    """
+
+    def __init__(self, transport, max_bytes=SEND_QUEUE_MAX_BYTES, on_evict=None):
+        self.transport = transport
+        self.max_bytes = max_bytes
+        self.on_evict = on_evict
+        self.sock = transport.get_extra_info("socket")
+
+    def sendall(self, data):
+        if not self.transport.is_closing():
+            self.transport.write(data)
+
+    def put(self, data):
+        if self.transport.is_closing():
+            return False
+        if self.transport.get_write_buffer_size() + frame_len(data) > self.max_bytes:
+            self.transport.abort()
+            if self.on_evict:
+                self.on_evict()
+            return False
+        if isinstance(data, bytes):
+            self.transport.write(data)
+        else:
+            self.transport.writelines(data)
+        METRICS.inc("trivia_bytes_sent_total", frame_len(data))
+        return True
+
+    def depth(self):
+        return None, self.transport.get_write_buffer_size()
+
+    # Writes go straight to the socket, so the kernel can hold the burst
+    def hold(self):
+        set_cork(self.sock, True)
+
+    def release(self):
+        set_cork(self.sock, False)
+
+    def wait_closed(self, timeout):
+        pass  # see AsyncTriviaServer.wait_closed
+
+    def shutdown(self, how):
+        self.transport.close()
+
+    def close(self):
+        self.transport.close()
+
+
+# =============================
+# One protocol instance per client connection
+# =============================
+class ClientProtocol(asyncio.Protocol):
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+        self.player = None
+        self.closed = asyncio.get_running_loop().create_future()
+
+    def connection_made(self, transport):
+        self.transport = transport
+        tune(transport.get_extra_info("socket"), self.server.sockopts)
+        conn = TransportConn(
+            transport,
+            int(self.server.cfg.get("send_queue_max_bytes", SEND_QUEUE_MAX_BYTES)),
+            on_evict=lambda: self.server.evict(self.player)
+        )
+        self.player = Player(conn, transport.get_extra_info("peername"), outbox=conn)
+        self.server.protocols.add(self)
+        METRICS.inc("trivia_connections_total")
+
+    def data_received(self, data):
+        try:
+            msgs = self.player.decoder.feed(data)
+        except ValueError:
+            self.transport.close()
+            return
+
+        for msg in msgs:
+            if not self.server.handle_message(self.player, msg):
+                self.transport.close()
+                return
+
+    def connection_lost(self, exc):
+        METRICS.inc("trivia_disconnections_total")
+        self.player.disconnected()
+        self.server.protocols.discard(self)
+        if not self.closed.done():
+            self.closed.set_result(None)
+
+
+# =============================
+# Single-threaded asyncio engine
+# =============================
+class AsyncTriviaServer(TriviaServer):
+    """Same game as TriviaServer, but every client lives on one event loop."""
+
+    def __init__(self, cfg, room_id=None, stats=None, questions=None):
+        super().__init__(cfg, room_id, stats, questions)
+        self.aio_server = None
+        self.protocols = set()
+        self.room_tasks = set()
+        self.event = asyncio.Event()   # set by wake()
+
+    # =============================
+    # Lobby: rooms are tasks on the same loop
+    # =============================
+    def spawn_room(self, room):
+        task = asyncio.get_running_loop().create_task(self.run_room_async(room))
+        self.room_tasks.add(task)
+        task.add_done_callback(self.room_tasks.discard)
+
+    async def run_room_async(self, room):
+        try:
+            await room.run_game_async()
+        finally:
+            self.close_room(room)
+
+    # =============================
+    # Event-driven waits (everything runs on the loop thread)
+    # =============================
+    def wake(self):
+        self.event.set()
+
+    async def wait_until(self, pred, timeout=None):
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while not pred():
+            self.event.clear()
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(self.event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return
+
+    # =============================
+    # Run the entire game
+    # =============================
+    async def run_game_async(self):
+        # Wait for all players
+        await self.wait_until(self.enough_players)
+
+        await asyncio.sleep(float(self.cfg["question_interval_seconds"]))
+
+        qtypes = self.cfg["question_types"]
+        for qn, qt in enumerate(qtypes, 1):
+            short = self.ask_question(qn, qt)
+
+            # Wait for answers (early exit once everyone answered)
+            await self.wait_until(self.all_answered, float(self.cfg["question_seconds"]))
+
+            # RESULT and LEADERBOARD leave together as one corked burst
+            self.hold_players()
+            try:
+                self.send_results(qt, short)
+
+                # LEADERBOARD (except after last question)
+                if qn < len(qtypes):
+                    self.send_leaderboard()
+            finally:
+                self.release_players()
+            if qn < len(qtypes):
+                await asyncio.sleep(float(self.cfg["question_interval_seconds"]))
+
+        # FINISHED
+        self.send_finished()
+
+        # Close all connections, then let the transports flush
+        self.shutdown_all()
+        await self.wait_closed()
+
+    async def wait_closed(self, timeout=5.0):
+        pending = [p.closed for p in self.protocols]
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+
+    # =============================
+    # Shut down server and all players
+    # =============================
+    def shutdown_all(self):
+        super().shutdown_all()
+        if self.aio_server:
+            self.aio_server.close()
+
+    # =============================
+    # Start server
+    # =============================
+    async def serve(self):
+        loop = asyncio.get_running_loop()
+        try:
+            self.aio_server = await loop.create_server(
+                lambda: ClientProtocol(self), "0.0.0.0", self.cfg["port"],
+                backlog=int(self.sockopts["backlog"]),
+                reuse_port=bool(self.cfg.get("reuse_port")), start_serving=False
+            )
+            for sock in self.aio_server.sockets:
+                tune_buffers(sock, self.sockopts)
+            await self.aio_server.start_serving()
+        except OSError:
+            print(f"server.py: Binding to port {self.cfg['port']} was unsuccessful")
+            sys.exit(1)
+
+        if self.is_lobby:
+            await self.aio_server.serve_forever()
+            return
+
+        await self.run_game_async()
+
+    def start(self):
+        raise_fd_limit()
+        self.start_metrics()
+        asyncio.run(self.serve())
@@ -0,0 +1,87 @@
+# =============================
+# FILE: sockopts.py
+# =============================
+# Socket tuning shared by both server engines, client.py and swarm.py,
+# read from the "socket_options" section of their configs:
+#
+#   backlog             listen() queue length (servers only)
+#   nodelay             TCP_NODELAY: small frames go out without waiting
+#                       for the ACK of the previous one (Nagle)
+#   cork                TCP_CORK while the server sends a RESULT +
+#                       LEADERBOARD burst, so it leaves as full segments
+#   sndbuf, rcvbuf      SO_SNDBUF / SO_RCVBUF in bytes, null = OS default
+#   keepalive           SO_KEEPALIVE, so dead peers are eventually dropped
+#   keepalive_idle      idle seconds before the first probe
+#   keepalive_interval  seconds between probes
+#   keepalive_count     unanswered probes before the connection is reset
+#
+# Options the platform does not have are skipped.
+
+import socket
+
+DEFAULTS = {
+    "backlog": 1024,
+    "nodelay": True,
+    "cork": False,
+    "sndbuf": None,
+    "rcvbuf": None,
+    "keepalive": True,
+    "keepalive_idle": 60,
+    "keepalive_interval": 10,
+    "keepalive_count": 5,
+}
+
+HAS_CORK = hasattr(socket, "TCP_CORK")
+
+# macOS calls the idle time TCP_KEEPALIVE
+_KEEPIDLE = getattr(socket, "TCP_KEEPIDLE", getattr(socket, "TCP_KEEPALIVE", None))
+_KEEPINTVL = getattr(socket, "TCP_KEEPINTVL", None)
+_KEEPCNT = getattr(socket, "TCP_KEEPCNT", None)
+
+
+def socket_options(cfg):
+    """DEFAULTS overridden by cfg["socket_options"]."""
+    opts = dict(DEFAULTS)
+    opts.update(cfg.get("socket_options") or {})
+    return opts
+
+
+def _set(sock, level, name, value):
+    if name is None:
+        return False
+    try:
+        sock.setsockopt(level, name, value)
+        return True
+    except OSError:
+        return False
+
+
+def tune_buffers(sock, opts):
+    # Set before listen()/connect() so the window scale is chosen to fit
+    if opts.get("sndbuf"):
+        _set(sock, socket.SOL_SOCKET, socket.SO_SNDBUF, int(opts["sndbuf"]))
+    if opts.get("rcvbuf"):
+        _set(sock, socket.SOL_SOCKET, socket.SO_RCVBUF, int(opts["rcvbuf"]))
+
+
+def tune(sock, opts):
+    """Apply nodelay, buffer sizes and keepalive to a connected socket."""
+    if sock is None:
+        return
+    _set(sock, socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 if opts.get("nodelay") else 0)
+    tune_buffers(sock, opts)
+    if not opts.get("keepalive"):
+        _set(sock, socket.SOL_SOCKET, socket.SO_KEEPALIVE, 0)
+        return
+    _set(sock, socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    _set(sock, socket.IPPROTO_TCP, _KEEPIDLE, int(opts.get("keepalive_idle", 60)))
+    _set(sock, socket.IPPROTO_TCP, _KEEPINTVL, int(opts.get("keepalive_interval", 10)))
+    _set(sock, socket.IPPROTO_TCP, _KEEPCNT, int(opts.get("keepalive_count", 5)))
+
+
+def set_cork(sock, on):
+    """TCP_CORK on or off; returns False where the platform lacks it.
+    Turning it off sends whatever is still held back."""
+    if not HAS_CORK or sock is None:
+        return False
+    return _set(sock, socket.IPPROTO_TCP, socket.TCP_CORK, 1 if on else 0)
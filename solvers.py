@@ -0,0 +1,179 @@
+# =============================
+# FILE: solvers.py
+# =============================
+# One set of answer functions for the server (grading) and every client
+# (auto mode, AI fallback, bots). Everything that can be precomputed is a
+# table built at import time; math expressions are compiled once and the
+# compiled form is cached.
+
+from functools import lru_cache
+
+MATHEMATICS = "Mathematics"
+ROMAN_NUMERALS = "Roman Numerals"
+USABLE_IP = "Usable IP Addresses of a Subnet"
+NETWORK_BROADCAST = "Network and Broadcast Address of a Subnet"
+
+
+# =============================
+# Roman numerals
+# =============================
+_NUMERALS = [
+    (1000, "M"), (900, "CM"), (500, "D"), (400, "CD"),
+    (100, "C"), (90, "XC"), (50, "L"), (40, "XL"),
+    (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I"),
+]
+_ROMAN_DIGITS = {"I": 1, "V": 5, "X": 10, "L": 50, "C": 100, "D": 500, "M": 1000}
+
+
+def int_to_roman(number):
+    out = []
+    for v, sym in _NUMERALS:
+        while number >= v:
+            out.append(sym)
+            number -= v
+    return "".join(out)
+
+
+# ROMAN[n] is the numeral for n (index 0 unused); ROMAN_VALUES is the inverse
+ROMAN = [""] + [int_to_roman(n) for n in range(1, 4000)]
+ROMAN_VALUES = {r: n for n, r in enumerate(ROMAN) if n}
+
+
+def _roman_scan(s):
+    total = 0
+    prev = 0
+    for ch in reversed(s):
+        v = _ROMAN_DIGITS[ch]
+        if v < prev:
+            total -= v
+        else:
+            total += v
+        prev = v
+    return total
+
+
+def roman_to_int(s):
+    s = s.strip().upper()
+    v = ROMAN_VALUES.get(s)
+    if v is None:
+        v = _roman_scan(s)    # non-canonical forms such as IIII
+    return v
+
+
+# =============================
+# IPv4 subnets
+# =============================
+# Indexed by prefix length 0..32
+PREFIX_MASKS = [(0xffffffff << (32 - p)) & 0xffffffff for p in range(33)]
+HOST_MASKS = [~m & 0xffffffff for m in PREFIX_MASKS]
+USABLE_HOSTS = [max(0, (2 ** (32 - p)) - 2) for p in range(33)]
+USABLE_HOSTS_STR = [str(n) for n in USABLE_HOSTS]
+
+
+def ip_to_int(ip):
+    a, b, c, d = map(int, ip.split("."))
+    return (a << 24) | (b << 16) | (c << 8) | d
+
+
+def int_to_ip(x):
+    return f"{x >> 24}.{(x >> 16) & 255}.{(x >> 8) & 255}.{x & 255}"
+
+
+def network_and_broadcast(ip, prefix):
+    net = ip_to_int(ip) & PREFIX_MASKS[prefix]
+    return int_to_ip(net), int_to_ip(net | HOST_MASKS[prefix])
+
+
+def usable_hosts(prefix):
+    return USABLE_HOSTS[prefix]
+
+
+# =============================
+# Math expressions (no eval)
+# =============================
+# An expression is compiled into signed terms, each a first literal
+# followed by (op, literal) factors: "7 - 2 * 3 / 4" becomes
+# ((1, 7, ()), (-1, 2, (("*", 3), ("/", 4)))). This is exactly what the
+# old shunting-yard evaluator computed: * and / bind tighter, everything
+# is left-associative, / is integer division and x / 0 gives 0.
+
+@lru_cache(maxsize=4096)
+def compile_math(expr):
+    terms = []
+    sign = 1
+    first = None
+    factors = []
+    pending = None             # operator waiting for its right operand
+
+    for t in expr.split():
+        if t.isdigit():
+            x = int(t)
+            if first is None:
+                first = x
+            elif pending in ("*", "/"):
+                factors.append((pending, x))
+            else:
+                terms.append((sign, first, tuple(factors)))
+                sign = 1 if pending == "+" else -1
+                first = x
+                factors = []
+            pending = None
+        elif t in ("+", "-", "*", "/"):
+            if first is None or pending is not None:
+                raise ValueError(f"bad expression: {expr!r}")
+            pending = t
+
+    if first is None or pending is not None:
+        raise ValueError(f"bad expression: {expr!r}")
+    terms.append((sign, first, tuple(factors)))
+    return tuple(terms)
+
+
+def eval_math(expr):
+    total = 0
+    for sign, term, factors in compile_math(expr):
+        for op, x in factors:
+            if op == "*":
+                term *= x
+            elif x == 0:
+                term = 0
+            else:
+                term //= x
+        total += sign * term
+    return total
+
+
+# =============================
+# One entry point per question type
+# =============================
+def _solve_math(short):
+    return str(eval_math(short))
+
+
+def _solve_roman(short):
+    return str(roman_to_int(short))
+
+
+def _solve_usable(short):
+    _, p = short.split("/")
+    return USABLE_HOSTS_STR[int(p)]
+
+
+def _solve_network(short):
+    ip, p = short.split("/")
+    n, b = network_and_broadcast(ip, int(p))
+    return f"{n} and {b}"
+
+
+SOLVERS = {
+    MATHEMATICS: _solve_math,
+    ROMAN_NUMERALS: _solve_roman,
+    USABLE_IP: _solve_usable,
+    NETWORK_BROADCAST: _solve_network,
+}
+
+
+def solve(qtype, short):
+    """Correct answer string for a question, or "" for unknown types."""
+    fn = SOLVERS.get(qtype)
+    return fn(short) if fn else ""
@@ -0,0 +1,215 @@
+import json
+import os
+import selectors
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+
+from globalboard import drain_boards, open_board
+
+# Exit code a worker uses for an unexpected exception (restart it).
+# sys.exit(1) from the server itself (bind failure, bad config) is fatal.
+CRASH_EXIT = 70
+
+
+# =============================
+# Worker process side
+# =============================
+def worker_main(cfg, index, make_server, wfd):
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    signal.signal(signal.SIGINT, signal.SIG_IGN)   # supervisor decides
+
+    out = os.fdopen(wfd, "w", encoding="utf-8")
+    out_lock = threading.Lock()
+    wcfg = dict(cfg, reuse_port=True)
+    if cfg.get("metrics_port"):
+        wcfg["metrics_port"] = int(cfg["metrics_port"]) + index   # one endpoint per worker
+    if cfg.get("event_log"):
+        wcfg["event_log"] = f"{cfg['event_log']}.{index}"          # one log file per worker
+    server = make_server(wcfg)
+
+    def report():
+        line = json.dumps({"worker": index, "stats": server.stats.snapshot()})
+        with out_lock:
+            try:
+                out.write(line + "\n")
+                out.flush()
+            except OSError:
+                pass
+
+    def report_loop():
+        while True:
+            time.sleep(float(cfg.get("stats_interval_seconds", 5)))
+            report()
+
+    threading.Thread(target=report_loop, daemon=True).start()
+
+    code = 0
+    try:
+        server.start()
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            code = e.code
+        elif e.code is not None:
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = CRASH_EXIT
+    finally:
+        drain_boards()             # os._exit below skips the writer thread
+        report()
+
+    sys.stdout.flush()
+    os._exit(code)
+
+
+# =============================
+# Supervisor: fork, watch, restart, combine stats
+# =============================
+class Supervisor:
+    def __init__(self, cfg, make_server):
+        self.cfg = cfg
+        self.make_server = make_server
+        self.n_workers = int(cfg["workers"])
+        self.sel = selectors.DefaultSelector()
+        self.workers = {}      # pid -> worker index
+        self.started = {}      # pid -> start time
+        self.bufs = {}         # pid -> partial stats line
+        self.latest = {}       # pid -> last stats snapshot
+        self.retired = {}      # summed stats of workers that exited
+        self.stopping = False
+        self.signalled = False
+
+    def spawn(self, index):
+        r, w = os.pipe()
+        sys.stdout.flush()
+        pid = os.fork()
+        if pid == 0:
+            os.close(r)
+            for key in list(self.sel.get_map().values()):
+                os.close(key.fd)
+            worker_main(self.cfg, index, self.make_server, w)
+
+        os.close(w)
+        os.set_blocking(r, False)
+        self.sel.register(r, selectors.EVENT_READ, pid)
+        self.workers[pid] = index
+        self.started[pid] = time.monotonic()
+        self.bufs[pid] = b""
+        print(f"server.py: worker {index} started (pid {pid})", flush=True)
+
+    def read_stats(self, fd, pid):
+        while True:
+            try:
+                chunk = os.read(fd, 65536)
+            except BlockingIOError:
+                return
+            if not chunk:
+                self.sel.unregister(fd)
+                os.close(fd)
+                return
+
+            self.bufs[pid] += chunk
+            *lines, self.bufs[pid] = self.bufs[pid].split(b"\n")
+            for line in lines:
+                if line.strip():
+                    self.latest[pid] = json.loads(line)["stats"]
+
+    def retire(self, pid):
+        # Drain what the worker wrote before it died
+        for key in list(self.sel.get_map().values()):
+            if key.data == pid:
+                self.read_stats(key.fd, pid)
+                if key.fd in self.sel.get_map():
+                    self.sel.unregister(key.fd)
+                    os.close(key.fd)
+
+        for k, v in self.latest.pop(pid, {}).items():
+            self.retired[k] = self.retired.get(k, 0) + v
+        self.bufs.pop(pid, None)
+        self.started.pop(pid, None)
+        return self.workers.pop(pid)
+
+    def combined(self):
+        total = dict(self.retired)
+        for snap in self.latest.values():
+            for k, v in snap.items():
+                total[k] = total.get(k, 0) + v
+        return total
+
+    def write_stats_file(self):
+        path = self.cfg.get("stats_file")
+        if not path:
+            return
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"workers": len(self.workers), "stats": self.combined()}, f)
+        os.replace(tmp, path)
+
+    def reap(self):
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+            lived = time.monotonic() - self.started.get(pid, 0)
+            index = self.retire(pid)
+            crashed = (os.WIFSIGNALED(status) or
+                       os.WEXITSTATUS(status) == CRASH_EXIT)
+
+            if self.stopping:
+                continue
+            if crashed:
+                print(f"server.py: worker {index} crashed, restarting", flush=True)
+            elif os.WEXITSTATUS(status) != 0:
+                # Bind failure or bad config: every worker would hit it
+                self.stop()
+                continue
+            else:
+                # A single-game worker (multi_room off) exits 0 after its
+                # game or an invalid username: keep the capacity
+                print(f"server.py: worker {index} exited, restarting", flush=True)
+            if lived < 1.0:
+                time.sleep(1.0)         # do not spin on a worker that dies at once
+            self.spawn(index)
+
+    def stop(self, *_):
+        self.stopping = True
+
+    def run(self):
+        if not (hasattr(os, "fork") and hasattr(socket, "SO_REUSEPORT")):
+            print("server.py: workers need fork and SO_REUSEPORT, running one process")
+            self.make_server(self.cfg).start()
+            return
+
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        # Created before forking so every worker inherits the stripe locks
+        open_board(self.cfg)
+
+        for i in range(self.n_workers):
+            self.spawn(i)
+
+        while self.workers:
+            if self.stopping and not self.signalled:
+                for pid in self.workers:
+                    try:
+                        os.kill(pid, signal.SIGTERM)
+                    except ProcessLookupError:
+                        pass
+                self.signalled = True
+
+            for key, _ in self.sel.select(timeout=0.5):
+                self.read_stats(key.fd, key.data)
+            self.reap()
+            self.write_stats_file()
+
+        print("server.py: combined stats " + json.dumps(self.combined(), sort_keys=True),
+              flush=True)
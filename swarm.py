@@ -0,0 +1,249 @@
+# =============================
+# FILE: swarm.py
+# =============================
+# Load generator: N bot players from one process on one event loop.
+#
+#   python swarm.py --config swarm_config.json
+#
+# Every bot sends HI, answers each QUESTION after a random delay (right
+# with probability "accuracy") and leaves on FINISHED. The report is one
+# JSON object with p50/p95/p99/max (milliseconds) for:
+#   hi_ready_ms       HI sent -> READY received
+#   question_skew_ms  QUESTION arrival minus the earliest arrival of the
+#                     same question at any bot
+#   answer_result_ms  ANSWER sent -> RESULT received
+#   result_leaderboard_ms  RESULT received -> the LEADERBOARD after it
+# plus bytes sent/received per player.
+
+import asyncio
+import json
+import random
+import sys
+import time
+
+from protocol import JSON_LINES, FrameDecoder, get_wire
+from server import percentiles
+from server_async import raise_fd_limit
+from sockopts import socket_options, tune
+from solvers import solve
+
+QS = (50, 95, 99, 100)
+
+
+def summarize(values):
+    pct = percentiles([round(v * 1000, 2) for v in values], QS)
+    out = {f"p{q}": v for q, v in pct.items() if q != 100}
+    if pct:
+        out["max"] = pct[100]
+    out["n"] = len(values)
+    return out
+
+
+# =============================
+# Answer delay distributions
+# =============================
+def make_delay(spec, rng):
+    """spec: {"distribution": "fixed" | "uniform" | "exponential" | "normal", ...}
+    Delays are seconds, never negative."""
+    dist = spec.get("distribution", "fixed")
+    if dist == "fixed":
+        v = float(spec.get("seconds", 0))
+        return lambda: v
+    if dist == "uniform":
+        lo, hi = float(spec.get("min", 0)), float(spec.get("max", 1))
+        return lambda: rng.uniform(lo, hi)
+    if dist == "exponential":
+        mean = float(spec.get("mean", 0.5))
+        return lambda: rng.expovariate(1 / mean) if mean > 0 else 0.0
+    if dist == "normal":
+        mu, sigma = float(spec.get("mean", 0.5)), float(spec.get("stddev", 0.1))
+        return lambda: max(0.0, rng.gauss(mu, sigma))
+    raise ValueError(f"unknown answer delay distribution {dist}")
+
+
+# =============================
+# One bot
+# =============================
+class Bot:
+    def __init__(self, swarm, index):
+        self.swarm = swarm
+        self.username = f"{swarm.cfg.get('username_prefix', 'bot')}{index}"
+        self.writer = None
+        self.wire = JSON_LINES
+        self.sent = 0
+        self.received = 0
+        self.hi_at = None
+        self.answer_at = None
+        self.result_at = None
+        self.finished = False
+
+    def send(self, obj):
+        data = self.wire.encode(obj)
+        self.sent += len(data)
+        self.writer.write(data)
+
+    async def answer(self, msg):
+        sw = self.swarm
+        await asyncio.sleep(sw.delay())
+        correct = solve(msg["question_type"], msg["short_question"])
+        ans = correct if sw.rng.random() < sw.accuracy else "wrong"
+        self.answer_at = time.monotonic()
+        self.send({"message_type": "ANSWER", "answer": ans})
+        await self.writer.drain()
+
+    async def run(self):
+        sw = self.swarm
+        reader, self.writer = await asyncio.open_connection(sw.host, sw.port)
+        tune(self.writer.get_extra_info("socket"), sw.sockopts)
+        hi = {"message_type": "HI", "username": self.username}
+        if sw.wire is not JSON_LINES:
+            hi["wire"], hi["codec"] = "binary", sw.cfg.get("codec", "json")
+        self.send(hi)                  # HI is always a JSON line
+        self.hi_at = time.monotonic()
+        if sw.wire is not JSON_LINES:
+            self.wire = sw.wire
+
+        decoder = FrameDecoder(sw.wire.codec if sw.wire.binary else None, strict=False)
+        qn = 0
+        tasks = set()
+        try:
+            while not self.finished:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                self.received += len(data)
+                now = time.monotonic()
+                for msg in decoder.feed(data):
+                    mtype = msg.get("message_type")
+                    if mtype == "READY":
+                        sw.hi_ready.append(now - self.hi_at)
+                    elif mtype == "QUESTION":
+                        sw.arrivals.setdefault(qn, []).append(now)
+                        qn += 1
+                        task = asyncio.create_task(self.answer(msg))
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+                    elif mtype == "RESULT":
+                        self.result_at = now
+                        if self.answer_at is not None:
+                            sw.answer_result.append(now - self.answer_at)
+                            self.answer_at = None
+                    elif mtype == "LEADERBOARD" and self.result_at is not None:
+                        sw.result_leaderboard.append(now - self.result_at)
+                        self.result_at = None
+                    elif mtype == "FINISHED":
+                        self.finished = True
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.writer.close()
+
+
+# =============================
+# The swarm
+# =============================
+class Swarm:
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.host = cfg.get("host", "127.0.0.1")
+        self.port = int(cfg.get("port", 7777))
+        self.n = int(cfg.get("players", 100))
+        self.accuracy = float(cfg.get("accuracy", 1.0))
+        self.rng = random.Random(cfg.get("seed"))
+        self.delay = make_delay(cfg.get("answer_delay", {}), self.rng)
+        self.wire = get_wire(cfg.get("wire", "json"), cfg.get("codec", "json"))
+        self.sockopts = socket_options(cfg)
+        if self.wire is None:
+            raise ValueError("unsupported wire/codec")
+
+        self.hi_ready = []
+        self.arrivals = {}     # question number -> arrival times
+        self.answer_result = []
+        self.result_leaderboard = []
+        self.errors = 0
+
+    async def run_bot(self, bot):
+        try:
+            await bot.run()
+        except (OSError, asyncio.IncompleteReadError):
+            self.errors += 1
+
+    async def run(self):
+        bots = [Bot(self, i) for i in range(self.n)]
+        rate = float(self.cfg.get("connect_rate", 0))    # per second, 0 = all at once
+        start = time.monotonic()
+        tasks = []
+        for i, bot in enumerate(bots):
+            if rate > 0:
+                await asyncio.sleep(max(0.0, start + i / rate - time.monotonic()))
+            tasks.append(asyncio.create_task(self.run_bot(bot)))
+
+        timeout = self.cfg.get("timeout_seconds")
+        done, pending = await asyncio.wait(tasks, timeout=timeout and float(timeout))
+        for task in pending:
+            task.cancel()
+        return self.report(bots, time.monotonic() - start)
+
+    def report(self, bots, wall):
+        skew = []
+        for times in self.arrivals.values():
+            first = min(times)
+            skew.extend(t - first for t in times)
+        sent = [b.sent for b in bots]
+        received = [b.received for b in bots]
+        return {
+            "players": self.n,
+            "finished": sum(b.finished for b in bots),
+            "errors": self.errors,
+            "wall_seconds": round(wall, 3),
+            "hi_ready_ms": summarize(self.hi_ready),
+            "question_skew_ms": summarize(skew),
+            "answer_result_ms": summarize(self.answer_result),
+            "result_leaderboard_ms": summarize(self.result_leaderboard),
+            "bytes_per_player": {
+                "sent": {f"p{q}": v for q, v in percentiles(sent, QS[:3]).items()},
+                "received": {f"p{q}": v for q, v in percentiles(received, QS[:3]).items()},
+                "total_sent": sum(sent),
+                "total_received": sum(received),
+            },
+        }
+
+
+def run_swarm(cfg):
+    raise_fd_limit()
+    return asyncio.run(Swarm(cfg).run())
+
+
+def main():
+    if "--config" not in sys.argv:
+        print("swarm.py: Configuration not provided")
+        sys.exit(1)
+
+    idx = sys.argv.index("--config")
+    if idx + 1 >= len(sys.argv):
+        print("swarm.py: Configuration not provided")
+        sys.exit(1)
+
+    path = sys.argv[idx + 1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cfg = json.load(f)
+    except FileNotFoundError:
+        print(f"swarm.py: File {path} does not exist")
+        sys.exit(1)
+
+    try:
+        report = run_swarm(cfg)
+    except ValueError as e:
+        print(f"swarm.py: {e}")
+        sys.exit(1)
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if cfg.get("report_file"):
+        with open(cfg["report_file"], "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
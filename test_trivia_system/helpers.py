@@ -0,0 +1,38 @@
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from protocol import get_wire
+from server import Player, TriviaServer
+
+
+class RecordingBox:
+    """Outbox stand-in that keeps every frame put on it."""
+
+    def __init__(self):
+        self.frames = []
+
+    def put(self, data):
+        self.frames.append(data)
+        return True
+
+    def depth(self):
+        return len(self.frames), 10
+
+
+def make_server(n_players, wires=("json",), name="p{}", **overrides):
+    """TriviaServer on server_test.json (plus overrides) with n seated
+    players that record their frames instead of sending them."""
+    with open(ROOT / "test_trivia_system/configs/server_test.json", encoding="utf-8") as f:
+        cfg = json.load(f)
+    cfg.update(overrides)
+    server = TriviaServer(cfg)
+    for i in range(n_players):
+        p = Player(None, None, outbox=RecordingBox())
+        p.username = name.format(i)
+        p.wire = get_wire(wires[i % len(wires)], "json")
+        server.add_player(p)
+    return server
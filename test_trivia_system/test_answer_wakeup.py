@@ -0,0 +1,66 @@
+import json
+import socket
+import statistics
+import subprocess
+import tempfile
+import time
+
+import pytest
+
+from ports import wait_for_port
+
+
+CONFIG = "test_trivia_system/configs/server_latency_test.json"
+
+
+def answer_to_result_seconds(engine):
+    with open(CONFIG, encoding="utf-8") as f:
+        cfg = json.load(f)
+    cfg["server_engine"] = engine
+    cfg["question_types"] = (cfg["question_types"] * 3)[:5]    # 5 rounds
+    cfg["question_interval_seconds"] = 0.2
+    if engine == "asyncio":
+        cfg["port"] += 100     # threaded run leaves TIME_WAIT on the first port
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump(cfg, f)
+
+    server = subprocess.Popen(["python", "server.py", "--config", f.name],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+    try:
+        assert wait_for_port("127.0.0.1", cfg["port"], timeout=10)
+        s = socket.create_connection(("127.0.0.1", cfg["port"]))
+        s.sendall(b'{"message_type": "HI", "username": "fast"}\n')
+
+        delays = []
+        sent = None
+        for line in s.makefile("r", encoding="utf-8"):
+            msg = json.loads(line)
+            if msg["message_type"] == "QUESTION":
+                sent = time.monotonic()
+                s.sendall(b'{"message_type": "ANSWER", "answer": "0"}\n')
+            elif msg["message_type"] == "RESULT":
+                delays.append(time.monotonic() - sent)
+            elif msg["message_type"] == "FINISHED":
+                break
+        s.close()
+        return delays
+    finally:
+        server.terminate()
+        server.wait()
+
+
+@pytest.mark.parametrize("engine", ["threaded", "asyncio"])
+def test_result_follows_last_answer(engine):
+    print(f"🔧 [TEST] {engine}: RESULT right after the last ANSWER")
+    # The answer lands right after the QUESTION, so a 50 ms polling loop
+    # would answer every round ~50 ms late; the wake-up makes it ~RTT
+    delays = answer_to_result_seconds(engine)
+    assert len(delays) == 5
+    assert statistics.median(delays) < 0.045, delays
+    print("✅ answer wake-up test passed")
+
+
+if __name__ == "__main__":
+    test_result_follows_last_answer("threaded")
+    test_result_follows_last_answer("asyncio")
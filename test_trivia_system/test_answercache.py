@@ -0,0 +1,80 @@
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from answercache import AnswerCache
+from client import Client
+
+MODEL = "qwen2.5:0.5b"
+
+
+def test_lru_eviction_and_persistence(tmp_path):
+    print("🔧 test: answer cache keeps the most recently used entries")
+    path = str(tmp_path / "answers.jsonl")
+    cache = AnswerCache(path, max_entries=3)
+    for n in ("I", "II", "III"):
+        cache.put("Roman Numerals", n, MODEL, f" {len(n)}\n")
+    assert cache.get("Roman Numerals", "I", MODEL) == " 1\n"    # raw, untouched
+    cache.put("Roman Numerals", "IV", MODEL, "4")               # evicts II
+    assert cache.get("Roman Numerals", "II", MODEL) is None
+    assert cache.get("Roman Numerals", "I", "other-model") is None
+    cache.close()
+
+    again = AnswerCache(path, max_entries=3)
+    assert list(again.entries) == [("Roman Numerals", n, MODEL) for n in ("III", "I", "IV")]
+    again.put("Roman Numerals", "V", MODEL, "5")                # evicts III
+    again.f.close()                                             # crash: no compaction
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('["Roman Numerals", "VI"')                      # torn line
+
+    third = AnswerCache(path, max_entries=3)
+    assert [k[1] for k in third.entries] == ["I", "IV", "V"]
+    third.close()
+    assert len(Path(path).read_text(encoding="utf-8").splitlines()) == 3
+    print("✅ LRU cache ok")
+
+
+def test_hits_are_fast(tmp_path):
+    cache = AnswerCache(str(tmp_path / "a.jsonl"))
+    for i in range(1, 4000):
+        cache.put("Roman Numerals", str(i), MODEL, str(i))
+    t0 = time.perf_counter()
+    for _ in range(10):
+        for i in range(1, 4000):
+            cache.get("Roman Numerals", str(i), MODEL)
+    per_hit = (time.perf_counter() - t0) / 39990
+    assert per_hit < 20e-6, per_hit
+    cache.close()
+
+
+def test_client_answers_from_cache(tmp_path):
+    print("🔧 test: AI client answers a cached question without the model")
+    path = str(tmp_path / "answers.jsonl")
+    cache = AnswerCache(path)
+    cache.put("Mathematics", "6 * 7", MODEL, "42\n")
+    cache.close()
+
+    client = Client({"username": "ai", "client_mode": "ai", "ai_cache_file": path,
+                     "ollama_config": {"ollama_host": "127.0.0.1", "ollama_port": 1,
+                                       "ollama_model": MODEL}})
+    sent = []
+    client.send_json = sent.append
+    result = client.on_question({"message_type": "QUESTION", "question_type": "Mathematics",
+                                 "trivia_question": "6 * 7", "short_question": "6 * 7",
+                                 "time_limit": 5})
+    assert result is None                       # no request task started
+    assert sent == [{"message_type": "ANSWER", "answer": "42"}]
+    assert client.ai_cache.hits == 1
+    client.ai_cache.close()
+    print("✅ cached answer sent")
+
+
+if __name__ == "__main__":
+    import tempfile
+    for fn in (test_lru_eviction_and_persistence, test_hits_are_fast,
+               test_client_answers_from_cache):
+        with tempfile.TemporaryDirectory() as d:
+            fn(Path(d))
@@ -0,0 +1,42 @@
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT / "benchmarks"))
+
+import bench
+
+
+def test_suite_covers_hot_path():
+    names = set(bench.BENCHMARKS)
+    for required in ["solvers.eval_math", "solvers.roman_to_int",
+                     "solvers.network_and_broadcast",
+                     "questions.generate_mathematics",
+                     "ranking.final_ranking[10]", "ranking.final_ranking[1000]",
+                     "ranking.final_ranking[100000]",
+                     "encode.json_dumps[QUESTION]", "send.send_json[RESULT]"]:
+        assert required in names, required
+
+
+def test_run_save_and_compare(tmp_path):
+    print("🔧 test: benchmark run, baseline and regression flag")
+    out = tmp_path / "run.json"
+    bench.main(["--filter", "solvers.roman", "--budget", "0.05", "--save", str(out)])
+    current = json.loads(out.read_text(encoding="utf-8"))
+    ns = current["results"]["solvers.roman_to_int"]["ns_per_op"]
+    assert ns > 0 and "python" in current["meta"]
+
+    faster = {"results": {"solvers.roman_to_int": {"ns_per_op": ns / 2}}}
+    slower = {"results": {"solvers.roman_to_int": {"ns_per_op": ns * 2}}}
+    assert bench.compare(current, faster, 0.25)[0][4] is True
+    assert bench.compare(current, slower, 0.25)[0][4] is False
+    assert bench.compare(current, {"results": {}}, 0.25) == []
+    print("✅ benchmark harness ok")
+
+
+if __name__ == "__main__":
+    import tempfile
+    test_suite_covers_hot_path()
+    with tempfile.TemporaryDirectory() as d:
+        test_run_save_and_compare(Path(d))
@@ -0,0 +1,78 @@
+import json
+import socket
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from protocol import FRAME_TAIL, RESULT_HEAD
+from server import encode_frame, send_vectored
+
+from helpers import make_server
+
+
+def test_result_pieces_match_json():
+    print("🔧 test: RESULT pieces are the same bytes as encode_frame")
+    for correct in (True, False):
+        fb = "❌ Incorrect. You answered (\"x\"), but the correct answer is 4."
+        obj = {"message_type": "RESULT", "correct": correct, "feedback": fb}
+        pieces = RESULT_HEAD[correct] + json.dumps(fb).encode() + FRAME_TAIL
+        assert pieces == encode_frame(obj)
+    print("✅ RESULT pieces ok")
+
+
+def test_broadcast_encodes_once():
+    print("🔧 test: broadcast shares one frame between players")
+    server = make_server(5)
+    server.broadcast({"message_type": "LEADERBOARD", "state": "x"})
+    frames = [p.outbox.frames[-1] for p in server.players]
+    assert all(f is frames[0] for f in frames)
+    print("✅ one frame for all players")
+
+
+def test_send_results_vectored():
+    print("🔧 test: send_results builds per-player frames from shared parts")
+    server = make_server(3)
+    short = "1 + 2"
+    server.start_round(1, "Mathematics", short)
+    for p, ans in zip(server.players, ["3", "3", "7"]):
+        server.record_answer(p, ans)
+    server.send_results("Mathematics", short)
+
+    parts = [p.outbox.frames[-1] for p in server.players]
+    msgs = [json.loads(b"".join(x)) for x in parts]
+    assert [m["correct"] for m in msgs] == [True, True, False]
+    assert parts[0][1] is parts[1][1]          # same answer → same body
+    assert [p.points for p in server.players] == [1, 1, 0]
+    print("✅ RESULT frames ok")
+
+
+def test_send_vectored_partial_writes():
+    print("🔧 test: send_vectored survives partial sendmsg()")
+    a, b = socket.socketpair()
+    bufs = [b"a" * 300000, b"b" * 5, b"", b"c" * 200000]
+    expected = b"".join(bufs)
+
+    got = bytearray()
+
+    def reader():
+        while len(got) < len(expected):
+            got.extend(b.recv(65536))
+
+    t = threading.Thread(target=reader)
+    t.start()
+    send_vectored(a, bufs)
+    t.join(5)
+    assert bytes(got) == expected
+    a.close()
+    b.close()
+    print("✅ send_vectored ok")
+
+
+if __name__ == "__main__":
+    test_result_pieces_match_json()
+    test_broadcast_encodes_once()
+    test_send_results_vectored()
+    test_send_vectored_partial_writes()
@@ -0,0 +1,115 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+requests = pytest.importorskip("requests")
+
+from client import Client
+from fake_ollama import FakeOllama
+
+
+def ai_client(port, **extra):
+    return Client(dict({"username": "ai", "client_mode": "ai", "ollama_config": {
+        "ollama_host": "127.0.0.1", "ollama_port": port, "ollama_model": "m"}}, **extra))
+
+
+def test_session_prewarm_and_stream():
+    print("🔧 test: AI mode keeps one connection, prewarms and streams")
+    fake = FakeOllama({"port": 0, "seed": 3})
+    port = fake.start()
+    try:
+        client = ai_client(port)
+        client.prewarm_ai()
+        q = {"question_type": "Mathematics", "short_question": "6 * 7", "time_limit": 5}
+        answers = [client.solve_ai(q) for _ in range(3)]
+    finally:
+        fake.stop()
+
+    assert answers == ["42", "42", "42"]
+    seen = fake.requests
+    assert seen[0][1]["messages"] == [] and seen[0][1]["keep_alive"]
+    assert all(body["stream"] for _, body in seen[1:])
+    assert len({p for p, _ in seen}) == 1        # one pooled connection
+    assert len(client.ai_timings) == 3
+    assert all(t["first_token"] <= t["total"] for t in client.ai_timings)
+    print("✅ AI session ok")
+
+
+def test_failures_give_empty_answer():
+    fake = FakeOllama({"port": 0, "error_rate": 1.0})
+    port = fake.start()
+    slow = FakeOllama({"port": 0, "first_token_delay": {"distribution": "fixed",
+                                                         "seconds": 1.0}})
+    slow_port = slow.start()
+    try:
+        q = {"question_type": "Mathematics", "short_question": "1 + 1", "time_limit": 0.3}
+        assert ai_client(port).solve_ai(q) == ""
+        assert ai_client(slow_port).solve_ai(q) == ""
+    finally:
+        fake.stop()
+        slow.stop()
+
+
+def scheduled_answer(client, qmsg):
+    """Run answer_ai for one question; returns (answer, seconds to send)."""
+    sent = []
+
+    async def go():
+        client.question_at = time.perf_counter()
+        client.current_qmsg = qmsg
+        client.answer = lambda ans: sent.append((ans, time.perf_counter() - client.question_at))
+        await client.answer_ai(qmsg)
+
+    asyncio.run(go())
+    return sent[0]
+
+
+def test_deadline_fallback():
+    print("🔧 test: a slow model is cut off before the round closes")
+    slow = FakeOllama({"port": 0, "first_token_delay": {"distribution": "fixed",
+                                                         "seconds": 1.0}})
+    port = slow.start()
+    q = {"question_type": "Mathematics", "short_question": "6 * 7", "time_limit": 0.5}
+    try:
+        auto = ai_client(port, ai_fallback="auto", ai_deadline_margin_ms=50)
+        auto.rtt = 0.1
+        ans, at = scheduled_answer(auto, q)
+        # Waits for the model until the deadline (0.5 - rtt - margin), not longer
+        assert ans == "42" and 0.3 <= at < q["time_limit"], at
+
+        empty = ai_client(port)
+        ans, at = scheduled_answer(empty, q)
+        assert ans == "" and at < q["time_limit"]
+    finally:
+        slow.stop()
+
+    stages = auto.ai_budget[0]
+    assert stages["source"] == "fallback-auto"
+    assert stages["model"] >= 0.3 and stages["slack"] > 0
+    assert empty.ai_budget[0]["source"] == "fallback-empty"
+    print("✅ fallback sent in time")
+
+
+def test_model_answer_in_time():
+    fake = FakeOllama({"port": 0})
+    port = fake.start()
+    try:
+        client = ai_client(port, ai_fallback="auto")
+        ans, _ = scheduled_answer(client, {"question_type": "Roman Numerals",
+                                           "short_question": "XIV", "time_limit": 2})
+    finally:
+        fake.stop()
+    assert ans == "14" and client.ai_budget[0]["source"] == "model"
+
+
+if __name__ == "__main__":
+    test_session_prewarm_and_stream()
+    test_failures_give_empty_answer()
+    test_deadline_fallback()
+    test_model_answer_in_time()
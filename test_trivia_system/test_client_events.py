@@ -0,0 +1,86 @@
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from client import Client
+
+QUESTION = {"message_type": "QUESTION", "question_type": "Mathematics",
+            "trivia_question": "Question 1 (Mathematics):\n6 * 7",
+            "short_question": "6 * 7", "time_limit": 5}
+
+
+async def fake_game(client, port, rounds=3):
+    """Tiny server: READY, then QUESTION/RESULT rounds, then FINISHED.
+    Returns the seconds between writing each QUESTION and reading its ANSWER."""
+    gaps = []
+    got_hi = asyncio.Event()
+
+    async def handle(reader, writer):
+        hi = json.loads(await reader.readline())
+        assert hi["message_type"] == "HI" and hi["username"] == client.username
+        got_hi.set()
+        writer.write(b'{"message_type": "READY", "info": "Player connected"}\n')
+        for _ in range(rounds):
+            writer.write((json.dumps(QUESTION) + "\n").encode())
+            sent = time.perf_counter()
+            answer = json.loads(await reader.readline())
+            gaps.append(time.perf_counter() - sent)
+            assert answer == {"message_type": "ANSWER", "answer": "42"}
+            writer.write(b'{"message_type": "RESULT", "correct": true, "feedback": "ok"}\n')
+        writer.write(b'{"message_type": "FINISHED", "final_standings": "done"}\n')
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", port)
+    async with server:
+        await client.connect("127.0.0.1", port)
+        await asyncio.wait_for(client.done.wait(), 5)
+    return gaps
+
+
+def test_auto_answers_from_question_handler():
+    print("🔧 test: auto mode answers without polling")
+    client = Client({"username": "evt", "client_mode": "auto"})
+    seen = []
+    client.on("RESULT", lambda m: seen.append(m["correct"]))
+
+    gaps = asyncio.run(fake_game(client, 7786))
+    assert seen == [True, True, True]
+    assert client.stop and len(client.answer_latency) == 3
+    # Answered from the QUESTION handler. The old loop slept 50 ms between
+    # checks; solving "6 * 7" and writing takes microseconds, so a few ms
+    # (client's own perf_counter, medians over the rounds) tells them apart
+    assert statistics.median(client.answer_latency) < 0.005, client.answer_latency
+    assert statistics.median(gaps) < 0.045, gaps
+    assert all(0 <= a <= g for a, g in zip(client.answer_latency, gaps))
+    assert 0 < client.rtt < 5             # handshake and HI -> READY, within the game's wait
+    print("✅ answers sent from the handler")
+
+
+def test_coroutine_handlers_do_not_block_reading():
+    print("🔧 test: a slow async handler runs as a task")
+    client = Client({"username": "evt2", "client_mode": "you"})
+    order = []
+
+    async def slow_answer(msg):
+        await asyncio.sleep(0.05)
+        order.append("answered")
+        client.answer("42")
+
+    client.handlers["QUESTION"] = [lambda m: setattr(client, "current_qmsg", m), slow_answer]
+    client.on("RESULT", lambda m: order.append("result"))
+
+    asyncio.run(fake_game(client, 7787, rounds=2))
+    assert order == ["answered", "result", "answered", "result"]
+    print("✅ handler tasks ok")
+
+
+if __name__ == "__main__":
+    test_auto_answers_from_question_handler()
+    test_coroutine_handlers_do_not_block_reading()
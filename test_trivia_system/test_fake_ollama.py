@@ -0,0 +1,106 @@
+import json
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from fake_ollama import FakeOllama
+
+PROMPT = "Answer.\nQuestion type: Roman Numerals\nQuestion: XLII"
+
+
+def post(port, body):
+    req = urllib.request.Request(f"http://127.0.0.1:{port}/api/chat",
+                                 data=json.dumps(body).encode(),
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=5) as r:
+        return [json.loads(line) for line in r.read().splitlines() if line.strip()]
+
+
+def chat(stream=True):
+    return {"model": "m", "stream": stream,
+            "messages": [{"role": "user", "content": PROMPT}]}
+
+
+def fake(**cfg):
+    f = FakeOllama(dict({"port": 0, "seed": 1}, **cfg))
+    return f, f.start()
+
+
+def test_streams_the_solved_answer():
+    print("🔧 test: fake Ollama streams the correct answer in pieces")
+    f, port = fake()
+    try:
+        chunks = post(port, chat())
+        single = post(port, chat(stream=False))
+        warm = post(port, {"model": "m", "messages": []})
+    finally:
+        f.stop()
+    assert "".join(c["message"]["content"] for c in chunks) == "42"
+    assert chunks[-1]["done"] and not any(c["done"] for c in chunks[:-1])
+    assert single == [{"model": "m", "message": {"role": "assistant", "content": "42"},
+                       "done": True}]
+    assert warm[0]["done_reason"] == "load"
+    print("✅ streaming ok")
+
+
+def test_canned_and_scripted_answers():
+    f, port = fake(answers="script", script_answers=["first", "second"])
+    c, cport = fake(answers="canned", canned_answer="seven")
+    try:
+        got = ["".join(x["message"]["content"] for x in post(port, chat())) for _ in range(3)]
+        canned = post(cport, chat(stream=False))[0]["message"]["content"]
+    finally:
+        f.stop()
+        c.stop()
+    assert got == ["first", "second", "42"]
+    assert canned == "seven"
+
+
+def test_error_injection():
+    print("🔧 test: injected errors and dropped streams")
+    f, port = fake(error_rate=1.0)
+    d, dport = fake(disconnect_rate=1.0)
+    try:
+        try:
+            post(port, chat())
+        except urllib.error.HTTPError as e:
+            assert e.code == 500
+        else:
+            raise AssertionError("no error injected")
+        try:
+            post(dport, chat())
+        except Exception:
+            pass                     # truncated chunked body
+        else:
+            raise AssertionError("stream was not cut")
+    finally:
+        f.stop()
+        d.stop()
+    print("✅ error injection ok")
+
+
+def test_latency_and_cold_start():
+    import time
+    f, port = fake(cold_start_seconds=0.2,
+                   first_token_delay={"distribution": "fixed", "seconds": 0.05})
+    try:
+        t0 = time.perf_counter()
+        post(port, chat())
+        cold = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        post(port, chat())
+        warm = time.perf_counter() - t0
+    finally:
+        f.stop()
+    assert cold >= 0.25 and 0.05 <= warm < cold
+
+
+if __name__ == "__main__":
+    test_streams_the_solved_answer()
+    test_canned_and_scripted_answers()
+    test_error_injection()
+    test_latency_and_cold_start()
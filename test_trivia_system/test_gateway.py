@@ -0,0 +1,147 @@
+import json
+import socket
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from muxlink import CLOSE, DATA, OPEN, LinkDecoder, encode_record
+from ports import wait_for_port
+
+GATEWAY_PORT = 7800
+NODES = [(7801, 7811), (7802, 7812)]      # (client port, link port)
+
+
+def popen(cmd):
+    return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, encoding="utf-8", errors="ignore")
+
+
+def write_json(path, obj):
+    path.write_text(json.dumps(obj), encoding="utf-8")
+    return str(path)
+
+
+def test_link_decoder_splits_records():
+    stream = (encode_record(1, OPEN, b"127.0.0.1:5000") +
+              encode_record(1, DATA, b'{"message_type": "HI"}\n') +
+              encode_record(1, CLOSE))
+    dec = LinkDecoder()
+    out = []
+    for i in range(0, len(stream), 5):
+        out += dec.feed(stream[i:i + 5])
+    assert out == [(1, OPEN, b"127.0.0.1:5000"),
+                   (1, DATA, b'{"message_type": "HI"}\n'),
+                   (1, CLOSE, b"")]
+
+
+def test_gateway_spreads_players(tmp_path):
+    print("🔧 [TEST] gateway: four clients over two game nodes")
+    with open(ROOT / "test_trivia_system/configs/server_gateway_test.json", encoding="utf-8") as f:
+        base = json.load(f)
+
+    procs = []
+    try:
+        nodes = []
+        for i, (port, link_port) in enumerate(NODES):
+            path = write_json(tmp_path / f"node{i}.json",
+                              dict(base, port=port, link_port=link_port))
+            nodes.append(popen(["python", "server.py", "--config", path]))
+        procs += nodes
+        for _, link_port in NODES:
+            assert wait_for_port("127.0.0.1", link_port, timeout=10)
+
+        gw_path = write_json(tmp_path / "gateway.json", {
+            "port": GATEWAY_PORT,
+            "nodes": [{"host": "127.0.0.1", "link_port": lp} for _, lp in NODES],
+        })
+        procs.append(popen(["python", "gateway.py", "--config", gw_path]))
+        assert wait_for_port("127.0.0.1", GATEWAY_PORT, timeout=10)
+
+        # Plain client.py processes: they only know the gateway's port
+        clients = []
+        for i in range(4):
+            path = write_json(tmp_path / f"client{i}.json", {
+                "username": f"gw{i}", "client_mode": "auto",
+                "auto_connect_port": GATEWAY_PORT})
+            clients.append(popen(["python", "client.py", "--config", path]))
+        outs = []
+        for c in clients:
+            try:
+                out, _ = c.communicate(timeout=30)
+            except subprocess.TimeoutExpired:
+                c.kill()
+                out, _ = c.communicate()
+            outs.append(out)
+    finally:
+        for p in procs:
+            p.terminate()
+        node_outs = [n.communicate()[0] for n in nodes]
+        for p in procs[len(nodes):]:
+            p.wait()
+
+    assert all("FINISHED" in out for out in outs), outs
+    assert all(out.count("Correct") == 2 for out in outs)
+    # players=2 per room: each node ran one full room
+    for out in node_outs:
+        assert out.count('"answers": 2') == 2, out
+    print("✅ gateway test passed")
+
+
+def read_until(proc, text):
+    while True:
+        line = proc.stdout.readline()
+        assert line, f"exited before printing {text!r}"
+        if text in line:
+            return line
+
+
+def test_gateway_relinks_after_node_restart(tmp_path):
+    print("🔧 [TEST] gateway: bad HI rejected, node restarted, link comes back")
+    with open(ROOT / "test_trivia_system/configs/server_gateway_test.json", encoding="utf-8") as f:
+        base = json.load(f)
+    node_path = write_json(tmp_path / "node.json", dict(base, port=7803, link_port=7813))
+    gw_path = write_json(tmp_path / "gateway.json", {
+        "port": 7804, "nodes": [{"host": "127.0.0.1", "link_port": 7813}],
+        "reconnect_min_seconds": 0.1, "reconnect_max_seconds": 0.4})
+
+    node = popen(["python", "server.py", "--config", node_path])
+    gateway = None
+    try:
+        assert wait_for_port("127.0.0.1", 7813, timeout=10)
+        gateway = popen(["python", "gateway.py", "--config", gw_path])
+        assert wait_for_port("127.0.0.1", 7804, timeout=10)
+
+        # Valid JSON that is not an object is a bad HI like any other
+        with socket.create_connection(("127.0.0.1", 7804), timeout=5) as s:
+            s.sendall(b"[1, 2]\n")
+            assert s.recv(100) == b""
+
+        node.terminate()
+        node.wait()
+        read_until(gateway, "lost the link to node 0")
+        node = popen(["python", "server.py", "--config", node_path])
+        read_until(gateway, "relinked to node 0")
+
+        clients = []
+        for i in range(2):
+            path = write_json(tmp_path / f"client{i}.json", {
+                "username": f"back{i}", "client_mode": "auto", "auto_connect_port": 7804})
+            clients.append(popen(["python", "client.py", "--config", path]))
+        outs = [c.communicate(timeout=30)[0] for c in clients]
+        assert all("FINISHED" in out for out in outs), outs
+    finally:
+        for p in (node, gateway):
+            if p is not None:
+                p.kill()
+                p.wait()
+    print("✅ gateway relinked")
+
+
+if __name__ == "__main__":
+    import tempfile
+    test_link_decoder_splits_records()
+    test_gateway_spreads_players(Path(tempfile.mkdtemp()))
+    test_gateway_relinks_after_node_restart(Path(tempfile.mkdtemp()))
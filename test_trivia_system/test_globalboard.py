@@ -0,0 +1,196 @@
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from globalboard import GlobalBoard, fcntl, key_hash
+from ports import wait_for_port
+
+
+def board_name(tag):
+    return f"tq_test_{tag}_{os.getpid()}"
+
+
+def test_scores_accumulate_and_rank():
+    print("🔧 test: global board adds games per username")
+    board = GlobalBoard.open(board_name("rank"), capacity=64, stripes=4)
+    try:
+        board.add_result("alice", 3, won=True)
+        board.add_result("bob", 2)
+        board.add_result("alice", 1)
+        board.add_result("carol", 4, won=True)
+        board.add_result("dave", 4)
+        long_name = "é" * 40
+        board.add_result(long_name, 0)
+
+        top = board.top(3)
+        assert top == [("alice", 4, 2, 1), ("carol", 4, 1, 1), ("dave", 4, 1, 0)]
+        assert len(board) == 5
+        assert any(name == "é" * 16 for name, *_ in board.entries())
+
+        # Another process attaches read-only by name
+        reader = GlobalBoard.attach(board_name("rank"))
+        assert reader.top(1) == [("alice", 4, 2, 1)]
+        try:
+            reader.add_result("eve", 1)
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("read-only board accepted a write")
+        reader.close()
+    finally:
+        board.unlink()
+        board.close()
+    print("✅ ranking ok")
+
+
+def test_full_stripe_rejects():
+    board = GlobalBoard.open(board_name("full"), capacity=4, stripes=2)
+    try:
+        added = [board.add_result(f"user{i}", 1) for i in range(20)]
+        assert added.count(True) == 4 and len(board) == 4
+    finally:
+        board.unlink()
+        board.close()
+
+
+def hammer(board, worker, rounds):
+    for i in range(rounds):
+        board.add_result(f"p{(worker + i) % 10}", 1, won=i % 2 == 0)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_concurrent_workers_lose_no_updates():
+    print("🔧 test: four forked writers on the same usernames")
+    board = GlobalBoard.open(board_name("mp"), capacity=256, stripes=4)
+    ctx = multiprocessing.get_context("fork")
+    try:
+        procs = [ctx.Process(target=hammer, args=(board, w, 500)) for w in range(4)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(30)
+            assert p.exitcode == 0
+        entries = list(board.entries())
+        assert len(entries) == 10
+        assert sum(points for _, points, _, _ in entries) == 2000
+        assert sum(games for _, _, games, _ in entries) == 2000
+        assert sum(wins for _, _, _, wins in entries) == 1000
+    finally:
+        board.unlink()
+        board.close()
+    print("✅ no lost updates")
+
+
+def open_and_hold(name, stripe, ready):
+    # An independent process (not forked from the opener) that dies
+    # holding a stripe lock
+    board = GlobalBoard.open(name, capacity=64, stripes=4)
+    board.locks[stripe].acquire()
+    fcntl.lockf(board.lock_fd, fcntl.LOCK_EX, 1, stripe)
+    ready.set()
+    time.sleep(60)
+
+
+@pytest.mark.skipif(fcntl is None, reason="needs fcntl")
+def test_independent_writers_and_dead_holder():
+    print("🔧 test: stripe locks across unrelated processes, holder SIGKILLed")
+    name = board_name("dead")
+    board = GlobalBoard.open(name, capacity=64, stripes=4)
+    ctx = multiprocessing.get_context("spawn")
+    stripe = key_hash("victim") % 4
+    ready = ctx.Event()
+    holder = ctx.Process(target=open_and_hold, args=(name, stripe, ready))
+    try:
+        holder.start()
+        assert ready.wait(20)
+
+        # While the holder lives, writes to its stripe wait
+        writer = threading.Thread(target=board.add_result, args=("victim", 5))
+        writer.start()
+        writer.join(0.3)
+        assert writer.is_alive()
+
+        os.kill(holder.pid, signal.SIGKILL)
+        holder.join(10)
+        writer.join(5)
+        assert not writer.is_alive()
+        assert board.top(1) == [("victim", 5, 1, 0)]
+    finally:
+        holder.kill()
+        board.unlink()
+        board.close()
+    print("✅ a dead holder does not block the stripe")
+
+
+def test_posted_games_are_written():
+    board = GlobalBoard.open(board_name("post"), capacity=4, stripes=1)
+    full = []
+    try:
+        board.post([(f"user{i}", i, i == 5) for i in range(6)], lambda: full.append(1))
+        board.drain()
+        assert len(board) == 4 and len(full) == 2
+    finally:
+        board.unlink()
+        board.close()
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"), reason="needs SO_REUSEPORT")
+def test_workers_write_finished_games(tmp_path):
+    print("🔧 [TEST] supervisor workers share one global board")
+    name = board_name("workers")
+    with open(ROOT / "test_trivia_system/configs/server_workers_test.json", encoding="utf-8") as f:
+        cfg = json.load(f)
+    cfg.update({"port": 7789, "global_board": name, "global_board_capacity": 1024,
+                "stats_file": None})
+    server_cfg = tmp_path / "server.json"
+    server_cfg.write_text(json.dumps(cfg), encoding="utf-8")
+
+    server = subprocess.Popen(["python", "server.py", "--config", str(server_cfg)],
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                              text=True, encoding="utf-8", errors="ignore")
+    try:
+        assert wait_for_port("127.0.0.1", 7789, timeout=10)
+        clients = []
+        for i in range(4):
+            path = tmp_path / f"client{i}.json"
+            path.write_text(json.dumps({"username": f"global{i % 2}", "client_mode": "auto",
+                                        "auto_connect_port": 7789}), encoding="utf-8")
+            clients.append(subprocess.Popen(["python", "client.py", "--config", str(path)],
+                                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                            text=True, encoding="utf-8", errors="ignore"))
+        outs = [c.communicate(timeout=30)[0] for c in clients]
+        assert all("FINISHED" in out for out in outs)
+
+        out = subprocess.run(["python", "globalboard.py", "top", "--name", name],
+                             capture_output=True, text=True, timeout=10).stdout
+        # players=1: every client won its own 2-question room
+        assert "global0: 4 points, 2 games, 2 wins" in out, out
+        assert "global1: 4 points, 2 games, 2 wins" in out, out
+    finally:
+        server.terminate()
+        server.wait()
+        subprocess.run(["python", "globalboard.py", "reset", "--name", name],
+                       capture_output=True, timeout=10)
+    print("✅ workers share the board")
+
+
+if __name__ == "__main__":
+    import tempfile
+    test_scores_accumulate_and_rank()
+    test_full_stripe_rejects()
+    test_concurrent_workers_lose_no_updates()
+    test_independent_writers_and_dead_holder()
+    test_posted_games_are_written()
+    test_workers_write_finished_games(Path(tempfile.mkdtemp()))
@@ -1,26 +1,17 @@
 import subprocess
-import socket
 import time
 import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from ports import wait_for_port
 
 # ============================
 # Trivia.NET Integration Test Script
 # ============================
 
-def wait_for_port(host, port, timeout=5):
-    """Wait until the server port is open"""
-    start = time.time()
-    while time.time() - start < timeout:
-        try:
-            sock = socket.socket()
-            sock.settimeout(1)
-            sock.connect((host, port))
-            sock.close()
-            return True
-        except:
-            time.sleep(0.1)
-    return False
-
 
 def test_integration():
     print("🔧 [TEST] Starting Trivia.NET integration test", flush=True)
@@ -0,0 +1,106 @@
+import json
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from leaderboard import Leaderboard
+from server import Player, TriviaServer
+
+
+def naive_ranking(cfg, players):
+    """The original sort-based final_ranking, kept as the reference."""
+    ps = sorted(players, key=lambda p: (-p.points, p.username))
+    lines = [cfg["final_standings_heading"]]
+    place = 0
+    prev_score = None
+    for idx, p in enumerate(ps):
+        if p.points != prev_score:
+            place = idx + 1
+            prev_score = p.points
+        noun = cfg["points_noun_singular"] if p.points == 1 else cfg["points_noun_plural"]
+        lines.append(f"{place}. {p.username}: {p.points} {noun}")
+    top = ps[0].points
+    winners = sorted([p.username for p in ps if p.points == top])
+    if len(winners) == 1:
+        lines.append(cfg["one_winner"].format(winners[0]))
+    else:
+        lines.append(cfg["multiple_winners"].format(", ".join(winners)))
+    return "\n".join(lines)
+
+
+def test_final_ranking_unchanged():
+    print("🔧 test: final_ranking matches the sort-based version")
+    with open(ROOT / "test_trivia_system/configs/server_test.json", encoding="utf-8") as f:
+        cfg = json.load(f)
+
+    rng = random.Random(7)
+    for n in (1, 2, 7, 60):
+        server = TriviaServer(cfg)
+        for i in range(n):
+            p = Player(None, None)
+            p.username = rng.choice(["ann", "bob", "cy", "dee", f"p{i}"])
+            server.add_player(p)
+
+        for _ in range(6):
+            for p in server.players:
+                if rng.random() < 0.5:
+                    p.points += 1
+                    server.board.add_points(p, 1)
+            assert server.final_ranking() == naive_ranking(cfg, server.players)
+    print("✅ final_ranking unchanged")
+
+
+def test_rank_top_and_ties():
+    print("🔧 test: rank, top-k and tie groups")
+    board = Leaderboard()
+    for name, pts in [("dee", 3), ("ann", 5), ("bob", 3), ("cy", 0)]:
+        board.add(name, name, 0)
+        board.add_points(name, pts)
+
+    assert board.rank("ann") == 1
+    assert board.rank("bob") == board.rank("dee") == 2
+    assert board.rank("cy") == 4
+    assert board.top(2) == [(1, "ann", 5), (2, "bob", 3)]
+    assert list(board.tie_groups()) == [(1, 5, ["ann"]), (2, 3, ["bob", "dee"]), (4, 0, ["cy"])]
+
+    board.add_points("cy", 200)        # grows the score index
+    assert board.rank("cy") == 1 and board.rank("ann") == 2
+    board.remove("cy")
+    assert board.leaders() == ["ann"]
+    print("✅ leaderboard queries ok")
+
+
+def test_reads_follow_random_updates():
+    print("🔧 test: standings and pages stay sorted through random updates")
+    rng = random.Random(11)
+    board = Leaderboard()
+    points = {}
+    for i in range(300):
+        board.add(i, rng.choice(["ann", "bob", f"p{i:03d}"]), 0)
+        points[i] = 0
+    for step in range(40):
+        for key in rng.sample(sorted(points), 50):
+            delta = rng.randint(-min(points[key], 2), 3)   # scores stay >= 0
+            points[key] += delta
+            board.add_points(key, delta)
+        if step % 7 == 3:
+            gone = rng.choice(sorted(points))
+            board.remove(gone)
+            del points[gone]
+
+        expected = sorted((-points[k], board.entries[k][0], board.entries[k][1]) for k in points)
+        standings = list(board.standings())
+        assert [(-p, name) for _, name, p in standings] == [e[:2] for e in expected]
+        start = rng.randrange(len(expected))
+        assert board.slice(start, start + 25) == standings[start:start + 25]
+        assert board.leaders() == [name for _, name, p in standings if p == -expected[0][0]]
+    print("✅ reads match a full sort")
+
+
+if __name__ == "__main__":
+    test_final_ranking_unchanged()
+    test_rank_top_and_ties()
+    test_reads_follow_random_updates()
@@ -0,0 +1,95 @@
+import sys
+import threading
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from metrics import METRICS, Metrics
+
+from helpers import make_server
+
+
+def test_sharded_counters_add_up():
+    print("🔧 test: per-thread shards sum to the right totals")
+    m = Metrics()
+    m.counter("hits_total", "hits")
+    m.histogram("wait_seconds", "waits", (0.1, 1))
+
+    def work():
+        for i in range(10000):
+            m.inc("hits_total", kind="a")
+            m.observe("wait_seconds", 0.5 if i % 2 else 2.0)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert m.value("hits_total", kind="a") == 40000
+    text = m.render()
+    assert 'hits_total{kind="a"} 40000' in text
+    assert 'wait_seconds_bucket{le="0.1"} 0' in text
+    assert 'wait_seconds_bucket{le="1"} 20000' in text
+    assert 'wait_seconds_bucket{le="+Inf"} 40000' in text
+    assert "wait_seconds_count 40000" in text
+    assert "# TYPE wait_seconds histogram" in text
+    print("✅ shards ok")
+
+
+def test_ended_threads_are_folded():
+    print("🔧 test: shards of finished threads are merged, not kept")
+    m = Metrics()
+    m.counter("conn_total", "connections")
+    m.histogram("wait_seconds", "waits", (0.1, 1))
+    m.inc("conn_total")                # this thread's shard stays live
+
+    def work():
+        m.inc("conn_total")
+        m.observe("wait_seconds", 0.5)
+
+    for _ in range(200):
+        t = threading.Thread(target=work)
+        t.start()
+        t.join()
+
+    assert len(m.shards) <= 2          # ours, maybe one thread still being torn down
+    assert m.value("conn_total") == 201
+    assert 'wait_seconds_bucket{le="1"} 200' in m.render()
+    print("✅ ended threads folded")
+
+
+def test_server_metrics_over_http():
+    print("🔧 test: server counters on the metrics endpoint")
+    server = make_server(3)
+
+    before = METRICS.value("trivia_messages_out_total", type="QUESTION")
+    server.ask_question(1, "Mathematics")
+    server.record_answer(server.players[0], "x")
+    server.final_ranking()
+    assert METRICS.value("trivia_messages_out_total", type="QUESTION") == before + 3
+
+    server.register_gauges()
+    httpd = METRICS.serve(0)
+    try:
+        url = f"http://127.0.0.1:{httpd.server_address[1]}/metrics"
+        text = urllib.request.urlopen(url, timeout=5).read().decode("utf-8")
+    finally:
+        httpd.shutdown()
+
+    assert 'trivia_messages_out_total{type="QUESTION"}' in text
+    assert 'trivia_broadcast_seconds_count{type="QUESTION"}' in text
+    assert "trivia_answer_latency_seconds_count" in text
+    assert "trivia_final_ranking_seconds_count" in text
+    assert "trivia_players 3" in text
+    assert "trivia_send_queue_bytes 30" in text
+    assert "trivia_send_queue_bytes_max 10" in text
+    print("✅ metrics endpoint ok")
+
+
+if __name__ == "__main__":
+    test_sharded_counters_add_up()
+    test_ended_threads_are_folded()
+    test_server_metrics_over_http()
@@ -0,0 +1,164 @@
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from server import Outbox, Player, TriviaServer
+from server_async import AsyncTriviaServer, TransportConn
+
+
+def stalled_pair():
+    a, b = socket.socketpair()
+    a.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+    b.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    return a, b
+
+
+def test_slow_consumer_evicted():
+    print("🔧 test: Outbox evicts a client that stops reading")
+    a, b = stalled_pair()
+    evicted = threading.Event()
+    box = Outbox(a, max_bytes=64 * 1024, max_messages=1000, on_evict=evicted.set)
+
+    chunk = b"x" * 4096 + b"\n"
+    accepted = 0
+    while box.put(chunk):
+        accepted += 1
+        assert accepted < 1000
+
+    assert evicted.wait(1)
+    assert not box.put(chunk)
+    box.writer.join(1)
+    assert not box.writer.is_alive()
+    b.close()
+    print("✅ slow consumer evicted")
+
+
+def test_stalled_client_does_not_block_others():
+    print("🔧 test: a stalled Outbox does not delay another one")
+    slow_a, slow_b = stalled_pair()
+    fast_a, fast_b = socket.socketpair()
+    slow = Outbox(slow_a, max_bytes=1 << 30, max_messages=1 << 20)
+    fast = Outbox(fast_a)
+
+    big = b"y" * (256 * 1024)
+    start = time.monotonic()
+    slow.put(big)                 # stays stuck in the kernel buffers
+    fast.put(b"hello\n")
+    fast_b.settimeout(1)
+    assert fast_b.recv(16) == b"hello\n"
+    assert time.monotonic() - start < 0.5
+
+    fast.close()
+    fast.wait_closed(1)
+    slow.wait_closed(0.1)         # gives up on the stuck backlog
+    slow.writer.join(1)
+    assert not slow.writer.is_alive()
+    for s in (slow_b, fast_b):
+        s.close()
+    print("✅ fast client unaffected")
+
+
+def test_close_flushes_queue():
+    print("🔧 test: Outbox.close() drains queued frames first")
+    a, b = socket.socketpair()
+    box = Outbox(a)
+    for i in range(50):
+        box.put(f"{i}\n".encode())
+    box.close()
+    box.wait_closed(2)
+
+    data = b""
+    while True:
+        chunk = b.recv(4096)
+        if not chunk:
+            break
+        data += chunk
+    assert data.split() == [str(i).encode() for i in range(50)]
+    b.close()
+    print("✅ queued frames flushed on close")
+
+
+class FakeTransport:
+    """A full one is always past the high-water mark."""
+
+    def __init__(self, full):
+        self.full = full
+        self.aborted = False
+        self.written = []
+
+    def is_closing(self):
+        return self.aborted
+
+    def get_write_buffer_size(self):
+        return 1 << 40 if self.full else 0
+
+    def get_extra_info(self, name):
+        return None
+
+    def write(self, data):
+        self.written.append(data)
+
+    def writelines(self, data):
+        self.written.append(b"".join(data))
+
+    def abort(self):
+        self.aborted = True
+
+    close = abort
+
+
+def evicting_game(engine):
+    import json
+    with open(ROOT / "test_trivia_system/configs/server_test.json", encoding="utf-8") as f:
+        cfg = json.load(f)
+    cfg["players"] = 2
+    server = engine(cfg)
+    players = []
+    for i in range(2):
+        p = Player(None, None)
+        p.username = f"p{i}"
+        if engine is TriviaServer:
+            a, b = socket.socketpair()
+            players.append(b)
+            # max_messages=0: the very first put() evicts
+            p.conn = a
+            p.outbox = Outbox(a, max_messages=0 if i == 0 else 256,
+                              on_evict=lambda p=p: server.evict(p))
+        else:
+            p.outbox = TransportConn(FakeTransport(full=i == 0),
+                                     on_evict=lambda p=p: server.evict(p))
+        server.add_player(p)
+    server.start_round(1, "Mathematics", "1 + 1")
+    return server, players
+
+
+def test_eviction_during_results():
+    print("🔧 test: evicting a player while RESULTs go out")
+    for engine in (TriviaServer, AsyncTriviaServer):
+        server, peers = evicting_game(engine)
+        finished = []
+        done = threading.Thread(target=lambda: finished.append(
+            server.send_results("Mathematics", "1 + 1")), daemon=True)
+        done.start()
+        done.join(2)
+        assert not done.is_alive(), f"{engine.__name__} deadlocked in send_results"
+        assert finished, f"{engine.__name__} send_results raised"
+        assert server.players[0].gone and not server.players[1].gone
+        assert server.stats.snapshot()["evicted"] >= 1
+        for p in server.players:
+            p.close()
+        for s in peers:
+            s.close()
+    print("✅ eviction during RESULT ok")
+
+
+if __name__ == "__main__":
+    test_slow_consumer_evicted()
+    test_stalled_client_does_not_block_others()
+    test_close_flushes_queue()
+    test_eviction_during_results()
@@ -0,0 +1,178 @@
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from client import Client
+from protocol import HEADER, JSON_LINES, TYPE_CODES, FrameDecoder, get_wire
+from server import Player, TriviaServer
+from ports import wait_for_port
+
+
+MESSAGES = [
+    {"message_type": "HI", "username": "ann"},
+    {"message_type": "READY", "info": "✅ Player connected!"},
+    {"message_type": "QUESTION", "question_type": "Mathematics",
+     "trivia_question": "Question 1 (Mathematics):\n1 + 2",
+     "short_question": "1 + 2", "time_limit": 5},
+    {"message_type": "ANSWER", "answer": "3"},
+    {"message_type": "RESULT", "correct": True, "feedback": "Correct (3)"},
+    {"message_type": "LEADERBOARD", "state": "1. ann: 1 point"},
+    {"message_type": "FINISHED", "final_standings": "Winner: ann"},
+    {"message_type": "BYE"},
+]
+
+
+def test_round_trip_both_wires():
+    print("🔧 test: every message type survives both wires")
+    binary = get_wire("binary", "json")
+    for wire in (JSON_LINES, binary):
+        dec = FrameDecoder(binary.codec)
+        data = b"".join(wire.encode(m) for m in MESSAGES)
+        assert dec.feed(data) == MESSAGES
+    assert len(binary.encode(MESSAGES[5])) < len(JSON_LINES.encode(MESSAGES[5]))
+    print("✅ round trip ok")
+
+
+def test_mixed_stream_split_anywhere():
+    print("🔧 test: JSON lines and binary frames on one stream, fed bytewise")
+    binary = get_wire("binary", "json")
+    data = JSON_LINES.encode(MESSAGES[0]) + b"".join(binary.encode(m) for m in MESSAGES[1:])
+    dec = FrameDecoder()
+    out = []
+    for i in range(len(data)):
+        out += dec.feed(data[i:i + 1])
+    assert out == MESSAGES
+    assert dec.saw_binary
+    print("✅ mixed stream ok")
+
+
+def test_result_frame_pieces():
+    print("🔧 test: result_frame matches encode on both wires")
+    for wire in (JSON_LINES, get_wire("binary", "json")):
+        for correct in (True, False):
+            msg = {"message_type": "RESULT", "correct": correct, "feedback": "ok ❌"}
+            assert b"".join(wire.result_frame(correct, "ok ❌")) == wire.encode(msg)
+    print("✅ result frames ok")
+
+
+def test_unknown_wire_falls_back():
+    assert get_wire("json") is JSON_LINES
+    assert get_wire("binary", "no-such-codec") is None
+    assert get_wire("carrier-pigeon") is None
+
+
+def not_an_object_frame():
+    # A binary RESULT frame whose payload is a JSON list
+    return HEADER.pack(len(b"[1]") + 1, TYPE_CODES["RESULT"]) + b"[1]"
+
+
+def test_non_object_payloads_rejected():
+    print("🔧 test: payloads that are not objects are malformed on both wires")
+    for data in (b"[1]\n", b"42\n", not_an_object_frame()):
+        try:
+            FrameDecoder().feed(data)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{data!r} was accepted")
+    # Lenient decoders skip such lines and keep going
+    assert FrameDecoder(strict=False).feed(b'[1]\n{"message_type": "BYE"}\n') == [
+        {"message_type": "BYE"}]
+    print("✅ non-objects rejected")
+
+
+def test_server_drops_client_sending_non_objects():
+    print("🔧 test: a non-object message disconnects the player cleanly")
+    with open(ROOT / "test_trivia_system/configs/server_test.json", encoding="utf-8") as f:
+        cfg = json.load(f)
+    for bad in (b"[1]\n", not_an_object_frame()):
+        server = TriviaServer(dict(cfg, players=2))
+        a, b = socket.socketpair()
+        player = Player(a, ("test", 0))
+        b.sendall(JSON_LINES.encode({"message_type": "HI", "username": "ann"}) + bad)
+        handler = threading.Thread(target=server.handle_client, args=(player,))
+        handler.start()
+        handler.join(5)
+        assert not handler.is_alive()
+        assert player.gone             # the round no longer waits for it
+        b.close()
+    print("✅ player dropped")
+
+
+def test_client_stops_on_non_object_frame():
+    print("🔧 test: the client gives up on a bad frame instead of hanging")
+    client = Client({"username": "ann", "client_mode": "auto"})
+
+    async def handle(reader, writer):
+        await reader.readline()
+        writer.write(b'{"message_type": "READY", "info": "ok"}\n' + not_an_object_frame())
+        await asyncio.sleep(5)         # keeps the connection open
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(handle, "127.0.0.1", 7798)
+        async with server:
+            await client.connect("127.0.0.1", 7798)
+            await asyncio.wait_for(client.done.wait(), 3)
+
+    asyncio.run(run())
+    assert client.stop
+    print("✅ client stopped")
+
+
+def test_binary_game_end_to_end():
+    print("🔧 [TEST] binary client plays a game, nc-style client still works")
+    server = subprocess.Popen(
+        ["python", "server.py", "--config", "test_trivia_system/configs/server_binary_test.json"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT
+    )
+    try:
+        assert wait_for_port("127.0.0.1", 7782, timeout=10)
+
+        # Raw check: HI asks for binary, READY must come back framed
+        s = socket.create_connection(("127.0.0.1", 7782))
+        s.sendall(JSON_LINES.encode({"message_type": "HI", "username": "raw",
+                                     "wire": "binary", "codec": "json"}))
+        s.settimeout(5)
+        first = s.recv(1)
+        assert first == b"\x00"
+        s.close()
+    finally:
+        server.terminate()
+        server.wait()
+
+    server = subprocess.Popen(
+        ["python", "server.py", "--config", "test_trivia_system/configs/server_binary_test.json"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT
+    )
+    try:
+        assert wait_for_port("127.0.0.1", 7782, timeout=10)
+        out = subprocess.run(
+            ["python", "client.py", "--config",
+             "test_trivia_system/configs/client_auto_binary_test.json"],
+            capture_output=True, text=True, encoding="utf-8", errors="ignore", timeout=30
+        ).stdout
+        assert "Correct" in out
+        assert "FINISHED" in out
+    finally:
+        server.terminate()
+        server.wait()
+    print("✅ binary game ok")
+
+
+if __name__ == "__main__":
+    test_round_trip_both_wires()
+    test_mixed_stream_split_anywhere()
+    test_result_frame_pieces()
+    test_unknown_wire_falls_back()
+    test_non_object_payloads_rejected()
+    test_server_drops_client_sending_non_objects()
+    test_client_stops_on_non_object_frame()
+    test_binary_game_end_to_end()
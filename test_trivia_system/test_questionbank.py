@@ -0,0 +1,138 @@
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from questionbank import ALL_TYPES, BankPool, QuestionBank, build_bank
+from server import TriviaServer
+from solvers import MATHEMATICS, NETWORK_BROADCAST, ROMAN_NUMERALS, solve
+
+
+def test_build_and_random_access(tmp_path):
+    print("🔧 test: bank file gives question i and its key")
+    path = str(tmp_path / "bank.qbank")
+    build_bank(path, 500, seed=1)
+    bank = QuestionBank(path)
+    for qtype in ALL_TYPES:
+        assert bank.count(qtype) == 500
+        for i in (0, 1, 250, 499):
+            q = bank.get(qtype, i)
+            assert q.answer == solve(qtype, q.short)
+    try:
+        bank.get(MATHEMATICS, 500)
+    except IndexError:
+        pass
+    else:
+        raise AssertionError("read past the end")
+    bank.close()
+    print("✅ random access ok")
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "junk.qbank"
+    path.write_bytes(b"not a bank at all, just some bytes")
+    try:
+        QuestionBank(str(path))
+    except ValueError:
+        return
+    raise AssertionError("junk accepted")
+
+
+def test_pools_share_cursor(tmp_path):
+    print("🔧 test: pools advance one shared cursor file")
+    path = str(tmp_path / "bank.qbank")
+    cursor = str(tmp_path / "bank.cursor")
+    build_bank(path, 40, [ROMAN_NUMERALS], seed=2)
+    a = BankPool(QuestionBank(path), cursor, block=3)
+    b = BankPool(QuestionBank(path), cursor, block=5)
+
+    for i in range(32):
+        (a if i % 2 else b).next(ROMAN_NUMERALS)
+
+    # A fresh pool (next game) continues after everything reserved so far
+    with open(cursor, encoding="utf-8") as f:
+        assert json.load(f)[ROMAN_NUMERALS] >= 32
+    print("✅ cursor ok")
+
+
+def test_indexes_are_dealt_once(tmp_path):
+    path = str(tmp_path / "bank.qbank")
+    cursor = str(tmp_path / "bank.cursor")
+    build_bank(path, 10, [MATHEMATICS], seed=3)
+    bank = QuestionBank(path)
+    order = [bank.get(MATHEMATICS, i) for i in range(10)]
+    pools = [BankPool(bank, cursor, block=4) for _ in range(2)]
+    dealt = [pools[i % 2].next(MATHEMATICS) for i in range(8)]
+    assert sorted(order.index(q) for q in dealt) == list(range(8))
+
+    # Exhausted: wraps to the start
+    last = BankPool(bank, cursor, block=4)
+    assert [last.next(MATHEMATICS) for _ in range(2)] == order[8:]
+    assert BankPool(bank, cursor, block=4).next(MATHEMATICS) == order[0]
+
+
+def test_server_uses_bank(tmp_path):
+    print("🔧 test: TriviaServer deals from question_bank")
+    path = str(tmp_path / "bank.qbank")
+    build_bank(path, 20, [MATHEMATICS, NETWORK_BROADCAST], seed=4)
+    with open(ROOT / "test_trivia_system/configs/server_test.json", encoding="utf-8") as f:
+        cfg = json.load(f)
+    cfg["question_bank"] = path
+    server = TriviaServer(cfg)
+    bank = QuestionBank(path)
+
+    short = server.generate_short(MATHEMATICS)
+    assert short == bank.get(MATHEMATICS, 0).short
+    assert server.compute_correct(MATHEMATICS, short) == bank.get(MATHEMATICS, 0).answer
+    # Types missing from the bank fall back to network/broadcast
+    assert server.generate_short("Trivia") == bank.get(NETWORK_BROADCAST, 0).short
+    assert Path(path + ".cursor").exists()
+    print("✅ server bank ok")
+
+
+def test_bank_without_fallback_type(tmp_path, capsys):
+    print("🔧 test: a type the bank cannot deal is generated")
+    path = str(tmp_path / "bank.qbank")
+    build_bank(path, 5, [MATHEMATICS], seed=5)
+    with open(ROOT / "test_trivia_system/configs/server_test.json", encoding="utf-8") as f:
+        cfg = json.load(f)
+    cfg.update({"question_bank": path, "question_types": [MATHEMATICS, ROMAN_NUMERALS]})
+    server = TriviaServer(cfg)
+    assert "has no Roman Numerals questions, using generated questions" in capsys.readouterr().out
+
+    short = server.generate_short(ROMAN_NUMERALS)
+    assert short and server.compute_correct(ROMAN_NUMERALS, short) == solve(ROMAN_NUMERALS, short)
+    bank = QuestionBank(path)
+    assert server.generate_short(MATHEMATICS) == bank.get(MATHEMATICS, 0).short
+    print("✅ generated fallback ok")
+
+
+def test_known_type_is_never_swapped(tmp_path, capsys):
+    print("🔧 test: Roman Numerals missing from a bank with network/broadcast")
+    path = str(tmp_path / "bank.qbank")
+    build_bank(path, 5, [MATHEMATICS, NETWORK_BROADCAST], seed=6)
+    with open(ROOT / "test_trivia_system/configs/server_test.json", encoding="utf-8") as f:
+        cfg = json.load(f)
+    cfg.update({"question_bank": path, "question_types": [MATHEMATICS, ROMAN_NUMERALS]})
+    server = TriviaServer(cfg)
+    out = capsys.readouterr().out
+    assert "has no Roman Numerals questions, using generated questions" in out
+    assert "using network/broadcast" not in out
+
+    bank = QuestionBank(path)
+    network = {bank.get(NETWORK_BROADCAST, i).short for i in range(5)}
+    for _ in range(5):
+        short = server.generate_short(ROMAN_NUMERALS)
+        assert short not in network and "/" not in short
+        assert server.compute_correct(ROMAN_NUMERALS, short) == solve(ROMAN_NUMERALS, short)
+    print("✅ known types keep their own questions")
+
+
+if __name__ == "__main__":
+    import tempfile
+    for fn in (test_build_and_random_access, test_rejects_other_files,
+               test_pools_share_cursor, test_indexes_are_dealt_once, test_server_uses_bank):
+        with tempfile.TemporaryDirectory() as d:
+            fn(Path(d))
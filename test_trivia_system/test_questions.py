@@ -0,0 +1,69 @@
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+import questions
+from questions import QuestionPool, generate_batch
+from server import eval_math, network_and_broadcast, roman_to_int
+
+
+def parse_answer(qtype, short):
+    """Reference answers, recomputed the old way from the question text."""
+    if qtype == questions.MATHEMATICS:
+        return str(eval_math(short))
+    if qtype == questions.ROMAN_NUMERALS:
+        return str(roman_to_int(short))
+    if qtype == questions.USABLE_IP:
+        return str(max(0, 2 ** (32 - int(short.split("/")[1])) - 2))
+    ip, p = short.split("/")
+    n, b = network_and_broadcast(ip, int(p))
+    return f"{n} and {b}"
+
+
+ALL_TYPES = [questions.MATHEMATICS, questions.ROMAN_NUMERALS,
+             questions.USABLE_IP, questions.NETWORK_BROADCAST]
+
+BACKENDS = [False] + ([True] if questions.np is not None else [])
+
+
+@pytest.mark.parametrize("use_numpy", BACKENDS)
+@pytest.mark.parametrize("qtype", ALL_TYPES)
+def test_batch_answer_keys(qtype, use_numpy):
+    print(f"🔧 test: batch answer keys for {qtype} (numpy={use_numpy})")
+    rng = questions.np.random.default_rng(3) if use_numpy else random.Random(3)
+    batch = generate_batch(qtype, 3000, rng, use_numpy=use_numpy)
+    assert len(batch) == 3000
+    for q in batch:
+        assert q.answer == parse_answer(qtype, q.short)
+    print("✅ answer keys ok")
+
+
+def test_math_shape_matches_single_generator():
+    batch = generate_batch(questions.MATHEMATICS, 4000, random.Random(5))
+    lengths = Counter(len(q.short.split()) // 2 + 1 for q in batch)
+    assert set(lengths) == {2, 3, 4, 5}
+    numbers = [int(t) for q in batch for t in q.short.split() if t.isdigit()]
+    assert min(numbers) >= 1 and max(numbers) <= 100
+
+
+def test_pool_refills_and_is_seeded():
+    a = QuestionPool(batch_size=8, seed=11)
+    b = QuestionPool(batch_size=8, seed=11)
+    qa = [a.next(questions.ROMAN_NUMERALS) for _ in range(20)]
+    qb = [b.next(questions.ROMAN_NUMERALS) for _ in range(20)]
+    assert qa == qb
+    assert all(q.answer == str(roman_to_int(q.short)) for q in qa)
+
+
+if __name__ == "__main__":
+    for qt in ALL_TYPES:
+        for np_flag in BACKENDS:
+            test_batch_answer_keys(qt, np_flag)
+    test_math_shape_matches_single_generator()
+    test_pool_refills_and_is_seeded()
@@ -0,0 +1,149 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from eventlog import IN, OUT, EventLog, read_events
+from globalboard import GlobalBoard
+from replay import load_game, replay
+from swarm import run_swarm
+from ports import wait_for_port
+
+
+def test_log_roundtrip(tmp_path):
+    print("🔧 test: event log records and reads back")
+    path = tmp_path / "game.tqlog"
+    log = EventLog(str(path), flush_seconds=0.01)
+    log.meta(cfg={"players": 1})
+    log.log(7, IN, {"message_type": "HI", "username": "a"})
+    log.log(0, OUT, {"message_type": "QUESTION", "short_question": "1 + 1"})
+    log.log(7, IN, {"message_type": "CLOSE"})
+    log.close()
+
+    with open(path, "ab") as f:
+        f.write(b"\x05\x00")           # torn record from a crash
+    events = list(read_events(str(path)))
+    assert [e.msg["message_type"] for e in events] == ["META", "HI", "QUESTION", "CLOSE"]
+    assert events[1].conn == 7 and events[1].direction == IN
+    assert events[2].direction == OUT and events[2].msg["short_question"] == "1 + 1"
+    assert events[0].t <= events[1].t <= events[3].t
+    print("✅ roundtrip ok")
+
+
+def test_games_across_worker_logs(tmp_path):
+    print("🔧 test: load_game counts games through several log files")
+    paths = []
+    for worker in range(2):
+        path = str(tmp_path / f"game.tqlog.{worker}")
+        log = EventLog(path, flush_seconds=0.01)
+        for game in range(2):
+            log.meta(cfg={"players": 1, "tag": f"{worker}-{game}"})
+            log.log(worker * 10 + game + 1, IN, {"message_type": "HI", "username": "a"})
+        log.close()
+        paths.append(path)
+
+    tags = [load_game(paths, g)[0]["tag"] for g in range(4)]
+    assert tags == ["0-0", "0-1", "1-0", "1-1"]
+    assert load_game(paths)[0]["tag"] == "1-1"
+    assert list(load_game(paths[0], 1)[2]) == [2]
+    print("✅ several logs ok")
+
+
+def test_record_and_replay(tmp_path):
+    print("🔧 [TEST] record a game, then replay it 4x faster")
+    with open(ROOT / "test_trivia_system/configs/server_async_test.json", encoding="utf-8") as f:
+        cfg = json.load(f)
+    log_path = tmp_path / "game.tqlog"
+    board_name = f"tq_test_replay_{os.getpid()}"
+    cfg.update({"port": 7784, "server_engine": "threaded", "players": 3,
+                "event_log": str(log_path), "event_log_flush_seconds": 0.05,
+                "global_board": board_name, "global_board_capacity": 64})
+    cfg_path = tmp_path / "server.json"
+    cfg_path.write_text(json.dumps(cfg), encoding="utf-8")
+
+    server = subprocess.Popen(["python", "server.py", "--config", str(cfg_path)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        assert wait_for_port("127.0.0.1", 7784, timeout=10)
+        report = run_swarm({"port": 7784, "players": 3, "accuracy": 0.5, "seed": 5,
+                            "answer_delay": {"distribution": "uniform", "min": 0, "max": 0.4},
+                            "timeout_seconds": 30})
+        assert report["finished"] == 3
+        server.wait(timeout=10)
+    finally:
+        server.kill()
+
+    _, questions, players, recorded = load_game(str(log_path))
+    assert len(questions) == 2 and len(players) == 3
+    assert all(len(r) == 2 for r in recorded.values())
+
+    board = GlobalBoard.attach(board_name)
+    try:
+        before = sorted(board.entries())
+        assert len(before) == 3
+
+        result = replay(str(log_path), speed=4, port=7785)
+        print(result)
+        assert result["finished"] == 3
+        assert result["questions"] == 2
+        assert result["result_mismatches"] == 0
+        assert len(result["round_latency"]) == 2
+        # The recorded config names the live board: the replay must not touch it
+        assert sorted(board.entries()) == before
+    finally:
+        board.unlink()
+        board.close()
+    print("✅ replay ok")
+
+
+def test_lobby_rooms_replay_apart(tmp_path):
+    print("🔧 [TEST] two concurrent lobby rooms split into two games")
+    with open(ROOT / "test_trivia_system/configs/server_async_test.json", encoding="utf-8") as f:
+        cfg = json.load(f)
+    log_path = tmp_path / "lobby.tqlog"
+    cfg.update({"port": 7796, "server_engine": "threaded", "players": 2, "multi_room": True,
+                "event_log": str(log_path), "event_log_flush_seconds": 0.05})
+    cfg_path = tmp_path / "server.json"
+    cfg_path.write_text(json.dumps(cfg), encoding="utf-8")
+
+    server = subprocess.Popen(["python", "server.py", "--config", str(cfg_path)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        assert wait_for_port("127.0.0.1", 7796, timeout=10)
+        report = run_swarm({"port": 7796, "players": 4, "accuracy": 0.5, "seed": 9,
+                            "timeout_seconds": 30})
+        assert report["finished"] == 4
+        # A lobby keeps running: wait for the log writer to catch up
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            events = list(read_events(str(log_path)))
+            if sum(e.msg["message_type"] == "FINISHED" for e in events) == 2:
+                break
+            time.sleep(0.05)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    assert sum(e.msg["message_type"] == "META" for e in events) == 2
+    assert {e.room for e in events} == {1, 2}
+    games = [load_game(str(log_path), g) for g in range(2)]
+    assert all(len(players) == 2 for _, _, players, _ in games)
+    assert not set(games[0][2]) & set(games[1][2])
+    assert all(len(r) == 2 for _, _, _, recorded in games for r in recorded.values())
+
+    result = replay(str(log_path), speed=4, port=7797, game=0)
+    assert result["finished"] == 2 and result["result_mismatches"] == 0
+    print("✅ rooms replay apart")
+
+
+if __name__ == "__main__":
+    import tempfile
+    for fn in (test_log_roundtrip, test_games_across_worker_logs, test_record_and_replay,
+               test_lobby_rooms_replay_apart):
+        with tempfile.TemporaryDirectory() as d:
+            fn(Path(d))
@@ -0,0 +1,73 @@
+import subprocess
+import time
+
+from ports import wait_for_port
+
+
+SERVER_CMD = [
+    "python", "server.py",
+    "--config", "test_trivia_system/configs/server_rooms_test.json"
+]
+
+CLIENT_CMD = [
+    "python", "client.py",
+    "--config", "test_trivia_system/configs/client_auto_rooms_test.json"
+]
+
+
+def run_clients(n):
+    clients = [
+        subprocess.Popen(
+            CLIENT_CMD,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            errors="ignore"
+        )
+        for _ in range(n)
+    ]
+
+    finished = 0
+    for c in clients:
+        try:
+            out, _ = c.communicate(timeout=30)
+        except subprocess.TimeoutExpired:
+            c.kill()
+            out, _ = c.communicate()
+        if "FINISHED" in out:
+            finished += 1
+    return finished
+
+
+def test_rooms_recycle():
+    print("🔧 [TEST] multi-room lobby: concurrent rooms, listener stays open")
+
+    server = subprocess.Popen(
+        SERVER_CMD,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="ignore"
+    )
+
+    try:
+        assert wait_for_port("127.0.0.1", 7779, timeout=10)
+
+        # players=1, so three clients get three independent rooms
+        assert run_clients(3) == 3
+
+        # The listener must survive finished rooms
+        time.sleep(0.5)
+        assert server.poll() is None
+        assert run_clients(1) == 1
+    finally:
+        server.terminate()
+        server.wait()
+
+    print("✅ multi-room test passed")
+
+
+if __name__ == "__main__":
+    test_rooms_recycle()
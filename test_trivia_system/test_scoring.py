@@ -0,0 +1,69 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from server import percentiles
+
+from helpers import make_server
+
+
+def test_graded_on_arrival():
+    print("🔧 test: ANSWER is graded and timestamped when it arrives")
+    server = make_server(2)
+    server.start_round(1, "Mathematics", "2 * 3")
+    a, b = server.players
+    server.record_answer(a, "6")
+    server.record_answer(b, "5")
+    assert a.last_correct and not b.last_correct
+    assert a.answer_at >= server.asked_at
+    server.record_answer(b, "6")            # last answer still wins
+    assert b.last_correct and b.answer_at >= a.answer_at
+    server.send_results("Mathematics", "2 * 3")
+    assert [p.points for p in server.players] == [1, 1]
+    print("✅ arrival grading ok")
+
+
+def test_speed_scoring():
+    print("🔧 test: speed scoring rewards earlier answers")
+    server = make_server(3, scoring_mode="speed", speed_bonus_points=4,
+                         question_seconds=10)
+    server.start_round(1, "Roman Numerals", "XIV")
+    for p in server.players:
+        server.record_answer(p, "14")
+    t0 = server.asked_at
+    for p, at in zip(server.players, [0.0, 5.0, 12.0]):
+        p.answer_at = t0 + at
+    server.send_results("Roman Numerals", "XIV")
+    assert [p.points for p in server.players] == [5, 3, 1]
+    assert server.board.leaders() == ["p0"]
+    print("✅ speed scoring ok")
+
+
+def test_round_latency_summary():
+    server = make_server(4)
+    server.start_round(3, "Mathematics", "1 + 1")
+    for p in server.players[:3]:
+        server.record_answer(p, "2")
+    t0 = server.asked_at
+    for p, at in zip(server.players, [0.010, 0.020, 0.200]):
+        p.answer_at = t0 + at
+    server.send_results("Mathematics", "1 + 1")
+    summary = server.round_latency[-1]
+    assert summary["round"] == 3 and summary["answers"] == 3
+    assert summary["p50_ms"] == 20.0 and summary["p99_ms"] == 200.0
+
+
+def test_percentiles():
+    assert percentiles([]) == {}
+    assert percentiles(list(range(1, 101))) == {50: 50, 90: 90, 99: 99}
+    assert percentiles([7]) == {50: 7, 90: 7, 99: 7}
+    assert percentiles([3, 1, 2], qs=(1, 100)) == {1: 1, 100: 3}
+
+
+if __name__ == "__main__":
+    test_graded_on_arrival()
+    test_speed_scoring()
+    test_round_latency_summary()
+    test_percentiles()
@@ -0,0 +1,105 @@
+import os
+import subprocess
+import socket
+import time
+
+import pytest
+
+from server_async import raise_fd_limit
+from ports import wait_for_port
+
+
+SERVER_CMD = [
+    "python", "server.py",
+    "--config", "test_trivia_system/configs/server_async_test.json"
+]
+
+CLIENT_CMD = [
+    "python", "client.py",
+    "--config", "test_trivia_system/configs/client_auto_async_test.json"
+]
+
+# The 10k variant takes a while: TRIVIA_SLOW_TESTS=1 python -m pytest ...
+slow = pytest.mark.skipif(not os.environ.get("TRIVIA_SLOW_TESTS"),
+                          reason="slow: set TRIVIA_SLOW_TESTS=1")
+
+
+def idle_limit(wanted):
+    """As many idle sockets as this process may open, up to wanted."""
+    raise_fd_limit()
+    try:
+        import resource
+    except ImportError:
+        return min(wanted, 400)    # Windows: no RLIMIT_NOFILE
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    return max(0, min(wanted, soft - 100))
+
+
+def game_with_idle_sockets(n_idle):
+    server = subprocess.Popen(
+        SERVER_CMD,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="ignore"
+    )
+
+    idle = []
+    finished = False
+    try:
+        assert wait_for_port("127.0.0.1", 7778, timeout=10)
+
+        # Many silent connections must not hold up the event loop
+        for _ in range(n_idle):
+            s = socket.socket()
+            s.connect(("127.0.0.1", 7778))
+            idle.append(s)
+
+        client = subprocess.Popen(
+            CLIENT_CMD,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            errors="ignore"
+        )
+
+        start_time = time.time()
+        while time.time() - start_time < 30:
+            line = client.stdout.readline()
+            if not line:
+                break
+            if "FINISHED" in line:
+                finished = True
+                break
+
+        client.terminate()
+    finally:
+        for s in idle:
+            s.close()
+        server.terminate()
+        server.wait()
+    return finished
+
+
+def test_async_engine_game():
+    n_idle = idle_limit(2000)
+    print(f"🔧 [TEST] asyncio engine: {n_idle} idle sockets + one full game")
+    assert game_with_idle_sockets(n_idle)
+    print("✅ asyncio engine test passed")
+
+
+@slow
+def test_async_engine_game_10k_idle():
+    n_idle = idle_limit(10000)
+    if n_idle < 10000:
+        pytest.skip(f"file descriptor limit allows only {n_idle} sockets")
+    print("🔧 [TEST] asyncio engine: 10000 idle sockets + one full game")
+    assert game_with_idle_sockets(n_idle)
+    print("✅ 10k idle sockets ok")
+
+
+if __name__ == "__main__":
+    test_async_engine_game()
+    test_async_engine_game_10k_idle()
@@ -0,0 +1,102 @@
+import socket
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "benchmarks"))
+
+from server import Outbox
+from sockopts import HAS_CORK, set_cork, socket_options, tune
+
+
+def tcp_pair():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    client = socket.create_connection(listener.getsockname())
+    conn, _ = listener.accept()
+    listener.close()
+    return conn, client
+
+
+def test_tune_applies_options():
+    print("🔧 test: socket_options reach the socket")
+    opts = socket_options({"socket_options": {"sndbuf": 65536, "keepalive_idle": 30}})
+    assert opts["nodelay"] and opts["keepalive"] and opts["backlog"] == 1024
+
+    conn, client = tcp_pair()
+    try:
+        tune(conn, opts)
+        assert conn.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+        assert conn.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+        assert conn.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF) >= 65536
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            assert conn.getsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE) == 30
+
+        tune(conn, socket_options({"socket_options": {"nodelay": False, "keepalive": False}}))
+        assert not conn.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY)
+        assert not conn.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE)
+
+        if HAS_CORK:
+            assert set_cork(conn, True)
+            assert conn.getsockopt(socket.IPPROTO_TCP, socket.TCP_CORK)
+            assert set_cork(conn, False)
+    finally:
+        conn.close()
+        client.close()
+    print("✅ options applied")
+
+
+def test_outbox_holds_burst():
+    print("🔧 test: a held Outbox sends RESULT + LEADERBOARD together")
+    conn, client = tcp_pair()
+    box = Outbox(conn, cork=True)
+    try:
+        box.hold()
+        box.put(b'{"message_type": "RESULT"}\n')
+        box.put(b'{"message_type": "LEADERBOARD"}\n')
+        client.settimeout(0.1)
+        try:
+            client.recv(100)
+        except socket.timeout:
+            pass
+        else:
+            raise AssertionError("frames left before release()")
+
+        box.release()
+        client.settimeout(2)
+        data = b""
+        while data.count(b"\n") < 2:
+            data += client.recv(100)
+        assert data == b'{"message_type": "RESULT"}\n{"message_type": "LEADERBOARD"}\n'
+    finally:
+        box.close()
+        box.wait_closed(2)
+        client.close()
+    print("✅ burst released")
+
+
+def test_corked_game_completes():
+    print("🔧 test: a full game with nodelay + cork")
+    import bench_sockets
+
+    class Args:
+        players, questions, engine = 5, 2, "threaded"
+
+    start = time.monotonic()
+    result = bench_sockets.run_profile("nodelay+cork", bench_sockets.PROFILES["nodelay+cork"],
+                                       Args, 7788)
+    assert result["finished"] == 5
+    assert result["result_leaderboard_ms"]["n"] == 5       # one LEADERBOARD round
+    # Corking must not hold frames back until Linux's 200 ms cap
+    assert result["result_leaderboard_ms"]["max"] < 200
+    assert time.monotonic() - start < 20
+    print("✅ corked game ok")
+
+
+if __name__ == "__main__":
+    test_tune_applies_options()
+    test_outbox_holds_burst()
+    test_corked_game_completes()
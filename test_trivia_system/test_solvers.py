@@ -0,0 +1,120 @@
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+import solvers
+from questions import generate_mathematics_question, generate_usable_ip_question
+from solvers import (ROMAN, eval_math, int_to_ip, ip_to_int, network_and_broadcast,
+                     roman_to_int, solve)
+
+
+# =============================
+# Reference implementations (the pre-table versions)
+# =============================
+def ref_eval_math(expr):
+    prec = {"+": 1, "-": 1, "*": 2, "/": 2}
+    output, stack = [], []
+    for t in expr.split():
+        if t.isdigit():
+            output.append(int(t))
+        elif t in prec:
+            while stack and prec[stack[-1]] >= prec[t]:
+                output.append(stack.pop())
+            stack.append(t)
+    output.extend(reversed(stack))
+
+    s = []
+    for t in output:
+        if isinstance(t, int):
+            s.append(t)
+            continue
+        b, a = s.pop(), s.pop()
+        if t == "+":
+            s.append(a + b)
+        elif t == "-":
+            s.append(a - b)
+        elif t == "*":
+            s.append(a * b)
+        else:
+            s.append(0 if b == 0 else a // b)
+    return s[-1]
+
+
+def ref_roman_to_int(s):
+    vals = {"I": 1, "V": 5, "X": 10, "L": 50, "C": 100, "D": 500, "M": 1000}
+    total = prev = 0
+    for ch in reversed(s.strip().upper()):
+        v = vals[ch]
+        total = total - v if v < prev else total + v
+        prev = v
+    return total
+
+
+def test_math_matches_reference():
+    print("🔧 test: compiled math vs shunting-yard")
+    rng = random.Random(1)
+    ops = ["+", "-", "*", "/"]
+    for _ in range(5000):
+        n = rng.randint(1, 6)
+        parts = [str(rng.randint(0, 100))]
+        for _ in range(n - 1):
+            parts += [rng.choice(ops), str(rng.randint(0, 100))]
+        expr = " ".join(parts)
+        assert eval_math(expr) == ref_eval_math(expr), expr
+    for _ in range(1000):
+        expr = generate_mathematics_question()
+        assert eval_math(expr) == ref_eval_math(expr), expr
+    print("✅ math ok")
+
+
+def test_math_rejects_malformed():
+    for bad in ["", "+", "1 +", "* 2", "1 + + 2"]:
+        try:
+            eval_math(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {bad!r}")
+
+
+def test_roman_table_and_fallback():
+    print("🔧 test: roman table")
+    for n in range(1, 4000):
+        assert roman_to_int(ROMAN[n]) == n == ref_roman_to_int(ROMAN[n])
+    assert roman_to_int(" xiv ") == 14
+    assert roman_to_int("IIII") == ref_roman_to_int("IIII") == 4
+    print("✅ roman ok")
+
+
+def test_ip_helpers():
+    rng = random.Random(2)
+    for _ in range(2000):
+        x = rng.getrandbits(32)
+        assert ip_to_int(int_to_ip(x)) == x
+        assert int_to_ip(x) == ".".join(str((x >> s) & 255) for s in (24, 16, 8, 0))
+    assert network_and_broadcast("192.168.1.77", 24) == ("192.168.1.0", "192.168.1.255")
+    assert network_and_broadcast("10.1.2.3", 0) == ("0.0.0.0", "255.255.255.255")
+    assert network_and_broadcast("10.1.2.3", 32) == ("10.1.2.3", "10.1.2.3")
+
+
+def test_solve_per_type():
+    assert solve(solvers.MATHEMATICS, "7 - 2 * 3 / 4") == "6"
+    assert solve(solvers.ROMAN_NUMERALS, "MCMXCIV") == "1994"
+    assert solve(solvers.USABLE_IP, "10.0.0.1/30") == "2"
+    assert solve(solvers.USABLE_IP, "10.0.0.1/31") == "0"
+    assert solve(solvers.NETWORK_BROADCAST, "172.16.5.9/20") == "172.16.0.0 and 172.16.15.255"
+    assert solve("Unknown", "x") == ""
+    for _ in range(200):
+        short = generate_usable_ip_question()
+        p = int(short.split("/")[1])
+        assert solve(solvers.USABLE_IP, short) == str(max(0, 2 ** (32 - p) - 2))
+
+
+if __name__ == "__main__":
+    test_math_matches_reference()
+    test_math_rejects_malformed()
+    test_roman_table_and_fallback()
+    test_ip_helpers()
+    test_solve_per_type()
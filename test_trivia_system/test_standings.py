@@ -0,0 +1,100 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from protocol import FrameDecoder
+
+from helpers import make_server
+
+
+def personal_server(n_players, wires=("json",)):
+    return make_server(n_players, wires, "p{:03d}", standings_mode="personal",
+                       standings_top_k=3, standings_page_size=4)
+
+
+def last_message(player):
+    frame = player.outbox.frames[-1]
+    data = b"".join(frame) if isinstance(frame, (list, tuple)) else frame
+    return FrameDecoder().feed(data)[0]
+
+
+def score(server, winners):
+    server.start_round(1, "Mathematics", "1 + 2")
+    for i in winners:
+        server.record_answer(server.players[i], "3")
+    server.send_results("Mathematics", "1 + 2")
+
+
+def test_personal_leaderboard_is_bounded():
+    print("🔧 test: personal LEADERBOARD size does not grow with players")
+    sizes = []
+    for n in (10, 400):
+        server = personal_server(n)
+        score(server, range(0, n, 2))
+        server.send_leaderboard()
+        frame = server.players[-1].outbox.frames[-1]
+        sizes.append(sum(len(b) for b in frame))
+    assert sizes[1] < sizes[0] * 1.2
+    print("✅ bounded payload")
+
+
+def test_personal_fields_and_rank_change():
+    print("🔧 test: place, points and rank change per player")
+    server = personal_server(6, wires=("json", "binary"))
+    score(server, [5])
+    server.send_leaderboard()
+    msg = last_message(server.players[5])
+    assert msg["place"] == 1 and msg["points"] == 1 and msg["change"] == 0
+    assert msg["state"].splitlines()[1] == "1. p005: 1 point"
+    assert msg["state"].endswith("(=)")
+
+    score(server, [0, 1])
+    score(server, [0])
+    server.send_leaderboard()
+    msg = last_message(server.players[5])      # binary wire, dropped 1 → 2
+    assert msg["place"] == 2 and msg["change"] == -1
+    assert msg["state"].endswith("(-1)")
+    msg = last_message(server.players[3])      # 2 → 4
+    assert msg["place"] == 4 and msg["change"] == -2
+    msg = last_message(server.players[0])
+    assert msg["place"] == 1 and msg["state"].endswith("(+1)")
+    print("✅ personal fields ok")
+
+
+def test_text_frame_equals_full_encode():
+    print("🔧 test: shared head + personal tail decodes like a full frame")
+    server = personal_server(5, wires=("json", "binary"))
+    score(server, [2, 3])
+    server.send_finished()
+    for p in server.players:
+        msg = last_message(p)
+        assert msg["message_type"] == "FINISHED"
+        assert "Winners: p002, p003" in msg["final_standings"]
+        assert msg["final_standings"].endswith(f"({msg['change']:+d})" if msg["change"] else "(=)")
+    print("✅ frames ok")
+
+
+def test_standings_pages():
+    print("🔧 test: paged STANDINGS")
+    server = personal_server(10)
+    score(server, [9])
+    p = server.players[0]
+    server.send_standings_page(p, 1)
+    msg = last_message(p)
+    assert (msg["page"], msg["pages"]) == (1, 3)
+    assert msg["state"].splitlines()[1:] == [
+        "1. p009: 1 point", "2. p000: 0 points", "2. p001: 0 points", "2. p002: 0 points"
+    ]
+    server.send_standings_page(p, 99)
+    msg = last_message(p)
+    assert msg["page"] == 3 and len(msg["state"].splitlines()) == 3
+    print("✅ pages ok")
+
+
+if __name__ == "__main__":
+    test_personal_leaderboard_is_bounded()
+    test_personal_fields_and_rank_change()
+    test_text_frame_equals_full_encode()
+    test_standings_pages()
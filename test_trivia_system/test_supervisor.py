@@ -0,0 +1,120 @@
+import json
+import os
+import signal
+import socket
+import subprocess
+
+import pytest
+
+from eventlog import MAGIC, read_events
+from replay import split_games
+from ports import wait_for_port
+
+
+SERVER_CMD = [
+    "python", "server.py",
+    "--config", "test_trivia_system/configs/server_workers_test.json"
+]
+
+CLIENT_CMD = [
+    "python", "client.py",
+    "--config", "test_trivia_system/configs/client_auto_workers_test.json"
+]
+
+
+def read_until(proc, text):
+    while True:
+        line = proc.stdout.readline()
+        assert line, f"server exited before printing {text!r}"
+        if text in line:
+            return line
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"), reason="needs SO_REUSEPORT")
+def test_supervisor_restarts_and_combines():
+    print("🔧 [TEST] supervisor: 2 workers, crash restart, combined stats")
+
+    server = subprocess.Popen(
+        SERVER_CMD,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="ignore"
+    )
+
+    try:
+        pids = [int(read_until(server, "started").split("pid ")[1].rstrip(")\n"))
+                for _ in range(2)]
+        assert wait_for_port("127.0.0.1", 7780, timeout=10)
+
+        # A worker that dies is replaced
+        os.kill(pids[0], signal.SIGKILL)
+        read_until(server, "crashed, restarting")
+        read_until(server, "started")
+
+        for _ in range(2):
+            out = subprocess.run(CLIENT_CMD, capture_output=True, text=True,
+                                 encoding="utf-8", errors="ignore", timeout=30).stdout
+            assert "FINISHED" in out
+
+        server.send_signal(signal.SIGTERM)
+        line = read_until(server, "combined stats")
+        stats = json.loads(line.split("combined stats ", 1)[1])
+        assert stats["games"] == 2
+        assert stats["questions"] == 4
+    finally:
+        server.kill()
+        server.wait()
+
+    print("✅ supervisor test passed")
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"), reason="needs SO_REUSEPORT")
+def test_single_game_workers_are_replaced(tmp_path):
+    print("🔧 [TEST] supervisor: one single-game worker serves game after game")
+    with open("test_trivia_system/configs/server_workers_test.json", encoding="utf-8") as f:
+        cfg = json.load(f)
+    log_path = tmp_path / "games.tqlog"
+    cfg.update({"port": 7791, "workers": 1, "multi_room": False, "stats_file": None,
+                "question_interval_seconds": 0.2, "event_log": str(log_path),
+                "event_log_flush_seconds": 0.05})
+    cfg_path = tmp_path / "server.json"
+    cfg_path.write_text(json.dumps(cfg), encoding="utf-8")
+    client_path = tmp_path / "client.json"
+    client_path.write_text(json.dumps({"username": "again", "client_mode": "auto",
+                                       "auto_connect_port": 7791}), encoding="utf-8")
+
+    server = subprocess.Popen(
+        ["python", "server.py", "--config", str(cfg_path)],
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        text=True, encoding="utf-8", errors="ignore"
+    )
+    try:
+        read_until(server, "started")
+        for game in range(3):
+            assert wait_for_port("127.0.0.1", 7791, timeout=10)
+            out = subprocess.run(["python", "client.py", "--config", str(client_path)],
+                                 capture_output=True, text=True, encoding="utf-8",
+                                 errors="ignore", timeout=30).stdout
+            assert "FINISHED" in out, f"game {game}: {out}"
+            if game < 2:
+                read_until(server, "exited, restarting")
+    finally:
+        server.kill()
+        server.wait()
+
+    # Worker 0 and each of its replacements append to their own file
+    assert [p.name for p in tmp_path.glob("games.tqlog*")] == ["games.tqlog.0"]
+    with open(log_path.with_name("games.tqlog.0"), "rb") as f:
+        assert f.read().count(MAGIC) == 1
+    games = split_games(read_events(str(log_path) + ".0"))
+    assert len(games) == 3
+    print("✅ worker replaced after each game")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    test_supervisor_restarts_and_combines()
+    test_single_game_workers_are_replaced(Path(tempfile.mkdtemp()))
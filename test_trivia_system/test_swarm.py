@@ -0,0 +1,66 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from swarm import make_delay, run_swarm
+from ports import wait_for_port
+
+SERVER_CMD = [
+    "python", "server.py",
+    "--config", "test_trivia_system/configs/server_swarm_test.json"
+]
+
+
+def test_swarm_plays_full_game():
+    print("🔧 [TEST] swarm: 50 bots from one process")
+    server = subprocess.Popen(
+        SERVER_CMD,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="ignore"
+    )
+    try:
+        assert wait_for_port("127.0.0.1", 7783, timeout=10)
+        report = run_swarm({
+            "port": 7783, "players": 50, "accuracy": 0.5, "seed": 1,
+            "wire": "binary",
+            "answer_delay": {"distribution": "uniform", "min": 0, "max": 0.2},
+            "timeout_seconds": 30,
+        })
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(report)
+    assert report["finished"] == 50 and report["errors"] == 0
+    assert report["hi_ready_ms"]["n"] == 50
+    assert report["question_skew_ms"]["n"] == 100          # 2 questions
+    assert report["answer_result_ms"]["n"] == 100
+    assert report["answer_result_ms"]["p50"] <= report["answer_result_ms"]["max"]
+    assert report["bytes_per_player"]["received"]["p50"] > 0
+    print("✅ swarm test passed")
+
+
+def test_delay_distributions():
+    import random
+    rng = random.Random(2)
+    assert make_delay({"distribution": "fixed", "seconds": 0.3}, rng)() == 0.3
+    uni = make_delay({"distribution": "uniform", "min": 1, "max": 2}, rng)
+    assert all(1 <= uni() <= 2 for _ in range(100))
+    norm = make_delay({"distribution": "normal", "mean": 0, "stddev": 1}, rng)
+    assert all(norm() >= 0 for _ in range(100))
+    try:
+        make_delay({"distribution": "zipf"}, rng)
+    except ValueError:
+        return
+    raise AssertionError("unknown distribution accepted")
+
+
+if __name__ == "__main__":
+    test_swarm_plays_full_game()
+    test_delay_distributions()